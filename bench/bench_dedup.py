@@ -0,0 +1,75 @@
+"""Memory and speed of activity dedup: plain set vs DedupIndex vs Bloom filter.
+
+    python bench/bench_dedup.py [--ids 2000000] [--hours 24]
+
+Ids arrive evenly over `hours` of history, with the clock following the
+newest id, against a 1h window of 60s buckets. Memory is what the
+structure itself allocates (tracemalloc); the id strings are built first
+and shared by all variants. Rates are timed in a separate untraced run.
+"""
+import argparse
+import time
+import tracemalloc
+import common  # noqa: F401  (import path and credentials)
+from utils.dedup_index import BloomFilter, DedupIndex
+
+START = 1_750_000_000
+
+def traced(build):
+    """Build once under tracemalloc for memory, then again without it for the timing"""
+    tracemalloc.start()
+    result = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    started = time.perf_counter()
+    result = build()
+    return result, memory, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ids', type=int, default=2_000_000)
+    parser.add_argument('--hours', type=float, default=24)
+    args = parser.parse_args()
+
+    ids = [f"0x{i:064x}" for i in range(args.ids)]
+    spacing = args.hours * 3600 / args.ids
+    timestamps = [START + i * spacing for i in range(args.ids)]
+    print(f"{args.ids:,} ids over {args.hours:g}h, 1h window, 60s buckets")
+
+    _, memory, _ = traced(lambda: set(ids))
+    print(f"  plain set                 {memory / 1e6:6.1f} MB")
+
+    now = [START]
+
+    def fill_index():
+        now[0] = START
+        index = DedupIndex(window=3600, bucket_seconds=60, clock=lambda: now[0])
+        for activity_id, timestamp in zip(ids, timestamps):
+            now[0] = timestamp
+            index.add(activity_id, timestamp)
+        return index
+    index, memory, elapsed = traced(fill_index)
+    live = len(index)
+
+    recent = len(ids) - live
+    started = time.perf_counter()
+    for activity_id, timestamp in zip(ids[recent:], timestamps[recent:]):
+        index.seen(activity_id, timestamp)
+    lookup_rate = live / (time.perf_counter() - started)
+    print(f"  DedupIndex                {memory / 1e6:6.1f} MB ({live:,} live ids)  "
+          f"add {args.ids / elapsed / 1e3:.0f}k/s  lookup {lookup_rate / 1e3:.0f}k/s")
+
+    def fill_bloom():
+        bloom = BloomFilter(capacity=args.ids, error_rate=0.001)
+        for activity_id in ids:
+            bloom.add(activity_id)
+        return bloom
+    bloom, memory, elapsed = traced(fill_bloom)
+    probes = 200_000
+    false_positives = sum(f"0y{i:064x}" in bloom for i in range(probes))
+    print(f"  Bloom, {args.ids / 1e6:g}M cap, 0.1% FPR  {memory / 1e6:6.1f} MB  add {args.ids / elapsed / 1e3:.0f}k/s  "
+          f"measured FPR {false_positives / probes:.3%}")
+
+if __name__ == '__main__':
+    main()
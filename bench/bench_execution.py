@@ -0,0 +1,56 @@
+"""Throughput of the per-market execution lanes against a mocked CLOB.
+
+    python bench/bench_execution.py [--trades 200] [--markets 50] [--latency 0.15]
+
+Every order takes `latency` seconds, standing in for the context reads and
+the post to the CLOB. Trades are dispatched the way the execution loop does
+it; with one worker this is the old one-trade-at-a-time behaviour.
+"""
+import argparse
+import contextlib
+import io
+import time
+import common
+from services.trade_coalescer import CoalescedTrade
+from services.trade_executor import TradeExecutor
+
+class MockStorage:
+    def mark_trade_executed(self, wallet_address, activity_id, success):
+        pass
+
+class MockBooks:
+    def watch(self, assets):
+        pass
+
+def run(activities, latency: float, workers: int):
+    executor = TradeExecutor(None, MockStorage(), data_fetcher=None, balance_service=object(),
+                             position_book=object(), book_manager=MockBooks(), max_workers=workers)
+    executor._execute_trade = lambda trade, wallet_address: time.sleep(latency) or True
+    executor.running = True
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # silence the per-trade log lines
+        for activity in activities:
+            executor._dispatch(CoalescedTrade(activity.proxy_wallet, activity, [activity]))
+        while executor._lanes or executor.metrics.in_flight:
+            time.sleep(0.005)
+    elapsed = time.perf_counter() - started
+    executor.running = False
+    executor._workers.shutdown(wait=True)
+    return elapsed, executor.get_metrics()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--trades', type=int, default=200)
+    parser.add_argument('--markets', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.15)
+    args = parser.parse_args()
+
+    activities = common.make_activities(args.trades, markets=args.markets)
+    print(f"{args.trades} trades over {args.markets} markets, {args.latency * 1000:.0f}ms per order")
+    for workers in (1, 4, 8, 16):
+        elapsed, metrics = run(activities, args.latency, workers)
+        print(f"  {workers:>2} workers  {elapsed:6.2f}s  {args.trades / elapsed:6.1f} trades/s  "
+              f"wall time p95 {metrics['wall_time_p95'] * 1000:.0f}ms")
+
+if __name__ == '__main__':
+    main()
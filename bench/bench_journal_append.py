@@ -0,0 +1,48 @@
+"""Cost of appending one activity with 100k already stored, per storage backend.
+
+    python bench/bench_journal_append.py [--stored 100000] [--appends 1000]
+
+The file backend rewrites the whole history on every append, so it is only
+measured for a few appends.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from common import make_activities
+from storage.journal_storage import JournalStorage
+from storage.local_storage import LocalStorage
+
+WALLET = '0xleader'
+
+def measure(storage, stored, new) -> float:
+    storage.append_activities(WALLET, stored)
+    started = time.perf_counter()
+    for activity in new:
+        storage.append_activities(WALLET, [activity])
+    return (time.perf_counter() - started) / len(new)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stored', type=int, default=100_000)
+    parser.add_argument('--appends', type=int, default=1000)
+    args = parser.parse_args()
+
+    activities = make_activities(args.stored + args.appends)
+    stored, new = activities[:args.stored], activities[args.stored:]
+    variants = [
+        ('journal, fsync on (default)', lambda path: JournalStorage(path, compact_every=10 ** 9, fsync=True), new),
+        ('journal, fsync off', lambda path: JournalStorage(path, compact_every=10 ** 9, fsync=False), new),
+        ('file (JSON rewrite)', LocalStorage, new[:5]),
+    ]
+    print(f"{args.stored} activities stored")
+    for name, build, appends in variants:
+        path = tempfile.mkdtemp()
+        try:
+            per_append = measure(build(path), stored, appends)
+        finally:
+            shutil.rmtree(path)
+        print(f"  {name:<28} {per_append * 1e6:>10.0f} us per append")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Memory and decode/encode speed of UserActivity against the pre-slots model.
+
+    python bench/bench_models.py [--count 100000] [--sample 20000]
+
+Activities are decoded from a JSON dump of data API records, like a poll
+response. Memory is what the decoded models keep after the source dicts
+are freed (tracemalloc). Rates are the best of 5 runs over `sample` records.
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+import common
+from models.user_activity import UserActivity
+
+@dataclass
+class BaselineActivity:
+    """UserActivity as it was before slots and interning"""
+    proxy_wallet: str
+    timestamp: int
+    condition_id: str
+    type: str
+    size: float
+    usdc_size: float
+    transaction_hash: str
+    price: float
+    asset: str
+    side: str
+    outcome_index: int
+    title: str
+    slug: str
+    outcome: str
+    bot_executed: bool = False
+    bot_executed_time: int = 0
+    id: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BaselineActivity':
+        return cls(**data)
+
+    @classmethod
+    def from_api_data(cls, data: Dict[str, Any], wallet_address: str) -> 'BaselineActivity':
+        return cls(
+            proxy_wallet=data.get('proxyWallet', wallet_address),
+            timestamp=int(data.get('timestamp', time.time())),
+            condition_id=data.get('conditionId', ''),
+            type=data.get('type', 'TRADE'),
+            size=float(data.get('size', 0)),
+            usdc_size=float(data.get('usdcSize', 0)),
+            transaction_hash=data.get('transactionHash', ''),
+            price=float(data.get('price', 0)),
+            asset=data.get('asset', ''),
+            side=data.get('side', 'BUY'),
+            outcome_index=int(data.get('outcomeIndex', 0)),
+            title=data.get('title', ''),
+            slug=data.get('slug', ''),
+            outcome=data.get('outcome', ''),
+            id=data.get('id', f"{wallet_address}_{data.get('timestamp', time.time())}")
+        )
+
+def api_records(count: int) -> str:
+    return json.dumps([{
+        'proxyWallet': activity.proxy_wallet, 'timestamp': activity.timestamp,
+        'conditionId': activity.condition_id, 'type': activity.type, 'size': activity.size,
+        'usdcSize': activity.usdc_size, 'transactionHash': activity.transaction_hash,
+        'price': activity.price, 'asset': activity.asset, 'side': activity.side,
+        'outcomeIndex': activity.outcome_index, 'title': activity.title, 'slug': activity.slug,
+        'outcome': activity.outcome, 'id': activity.id,
+    } for activity in common.make_activities(count)])
+
+def retained_memory(model, payload: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    records = json.loads(payload)
+    activities = [model.from_api_data(record, record['proxyWallet']) for record in records]
+    del records
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del activities
+    return memory
+
+def rate(sample: int, fn) -> float:
+    return sample / common.best_of(5, fn)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--sample', type=int, default=20_000)
+    args = parser.parse_args()
+
+    payload = api_records(args.count)
+    records = json.loads(payload)[:args.sample]
+    print(f"{args.count:,} activities over 200 markets and 20 wallets")
+    print(f"  {'':<15} {'before':>12} {'after':>12}")
+
+    memory = {model: retained_memory(model, payload) for model in (BaselineActivity, UserActivity)}
+    print(f"  {'memory':<15} {memory[BaselineActivity] / 1e6:>9.1f} MB {memory[UserActivity] / 1e6:>9.1f} MB")
+    print(f"  {'per activity':<15} {memory[BaselineActivity] / args.count:>10.0f} B "
+          f"{memory[UserActivity] / args.count:>10.0f} B")
+
+    rates = {}
+    for model in (BaselineActivity, UserActivity):
+        decoded = [model.from_api_data(record, record['proxyWallet']) for record in records]
+        dicts = [activity.to_dict() for activity in decoded]
+        rates[model] = {
+            'from_api_data': rate(args.sample, lambda: [model.from_api_data(r, r['proxyWallet']) for r in records]),
+            'from_dict': rate(args.sample, lambda: [model.from_dict(d) for d in dicts]),
+            'to_dict': rate(args.sample, lambda: [a.to_dict() for a in decoded]),
+        }
+    for name in ('from_api_data', 'from_dict', 'to_dict'):
+        print(f"  {name:<15} {rates[BaselineActivity][name] / 1e3:>8.0f}k/s {rates[UserActivity][name] / 1e3:>8.0f}k/s")
+
+if __name__ == '__main__':
+    main()
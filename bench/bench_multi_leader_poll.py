@@ -0,0 +1,96 @@
+"""Poll-cycle latency of TradeMonitor's asyncio poller as the number of leaders grows.
+
+    python bench/bench_multi_leader_poll.py [--latency 0.2] [--interval 1] [--duration 8]
+
+Every leader is polled every `interval` seconds through `_monitor_loop`
+against a fetcher that takes `latency` seconds per request and finds
+nothing. The cycle is the time between two polls of the same leader:
+ideally `interval + latency`, longer when requests queue behind the
+MAX_CONCURRENT_POLLS cap. A cap of 1 is the old one-leader-at-a-time loop.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import threading
+import time
+from typing import Dict, List
+import common  # noqa: F401  (import path and credentials)
+from config.env import Config
+from services.poll_scheduler import AdaptivePollScheduler
+from services.trade_monitor import TradeMonitor
+
+class MockStorage:
+    def load_recent_activities(self, wallet_address, since):
+        return []
+
+    def append_activities(self, wallet_address, activities):
+        pass
+
+class MockFetcher:
+    """Activity API with a fixed response time, recording when each leader is polled"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.polled_at: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def fetch_new_activities(self, wallet_address):
+        with self._lock:
+            self.polled_at.setdefault(wallet_address, []).append(time.perf_counter())
+        time.sleep(self.latency)
+        return [], None
+
+    def commit_cursor(self, wallet_address, cursor):
+        pass
+
+def percentile(samples: List[float], fraction: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def run(leaders: int, cap: int, latency: float, interval: float, duration: float) -> List[float]:
+    """Cycle times of every leader over `duration` seconds"""
+    fetcher = MockFetcher(latency)
+    wallets = [f"0x{index:040x}" for index in range(1, leaders + 1)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        monitor = TradeMonitor(MockStorage(), fetcher, target_wallets=wallets, max_concurrent_polls=cap,
+                               enable_stream=False, enable_chain_detector=False)
+    monitor.schedulers = {
+        wallet: AdaptivePollScheduler(min_interval=interval, max_interval=interval, initial_interval=interval)
+        for wallet in wallets
+    }
+    monitor.running = True
+    thread = threading.Thread(target=lambda: asyncio.run(monitor._monitor_loop()), daemon=True)
+    thread.start()
+    time.sleep(duration)
+    monitor.running = False
+    thread.join()
+
+    cycles = []
+    for polls in fetcher.polled_at.values():
+        cycles.extend(later - earlier for earlier, later in zip(polls, polls[1:]))
+    return cycles
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.2, help="seconds per activity request")
+    parser.add_argument('--interval', type=float, default=1.0, help="seconds between polls of one leader")
+    parser.add_argument('--duration', type=float, default=8.0, help="seconds per run")
+    args = parser.parse_args()
+
+    # Leaders are staggered across FETCH_INTERVAL on start; keep that to one cycle
+    Config.FETCH_INTERVAL = args.interval
+    cap = Config.MAX_CONCURRENT_POLLS
+    print(f"{args.latency * 1000:.0f}ms per request, polled every {args.interval:g}s "
+          f"(ideal cycle {args.interval + args.latency:.2f}s)")
+    print(f"  leaders   cap 1 p50 / p95       cap {cap} p50 / p95")
+    for leaders in (1, 5, 10, 25, 50):
+        columns = []
+        for limit in (1, cap):
+            cycles = run(leaders, limit, args.latency, args.interval, args.duration)
+            columns.append(f"{percentile(cycles, 0.5):6.2f}s / {percentile(cycles, 0.95):6.2f}s" if cycles
+                           else "    no full cycle")
+        print(f"  {leaders:>7}   {columns[0]}   {columns[1]}")
+
+if __name__ == '__main__':
+    main()
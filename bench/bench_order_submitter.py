@@ -0,0 +1,114 @@
+"""Orders/s for inline vs pipelined order posting against a local CLOB stand-in.
+
+    python bench/bench_order_submitter.py [--orders 60] [--latency 0.04]
+
+The stand-in answers tick size and neg-risk lookups at once and sleeps
+`latency` per order request, for both POST /order and the batch POST
+/orders. Orders are signed for real by py_clob_client.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import common  # noqa: F401  (import path and credentials)
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import ApiCreds, OrderArgs, OrderType
+from py_clob_client.order_builder.constants import BUY
+from config.env import Config
+from services.order_submitter import OrderSubmitter
+
+def start_clob(latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _reply(self, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.startswith('/tick-size'):
+                self._reply({'minimum_tick_size': 0.01})
+            else:
+                self._reply({'neg_risk': False})
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            time.sleep(latency)
+            answer = {'success': True, 'orderID': '0x1', 'status': 'matched'}
+            self._reply([answer] * len(body) if isinstance(body, list) else answer)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def order(index: int) -> OrderArgs:
+    return OrderArgs(token_id=str(10 ** 70 + index % 20), price=0.5, size=10, side=BUY)
+
+def inline(client: ClobClient, indices):
+    for index in indices:
+        client.post_order(client.create_order(order(index)), OrderType.FOK)
+
+def via_submitter(submitter: OrderSubmitter, indices):
+    for index in indices:
+        submitter.submit(order(index), OrderType.FOK).result()
+
+def in_lanes(work, orders: int, lanes: int):
+    threads = [threading.Thread(target=work, args=(range(lane, orders, lanes),)) for lane in range(lanes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.04)
+    parser.add_argument('--lanes', type=int, default=4)
+    args = parser.parse_args()
+
+    server = start_clob(args.latency)
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    client = ClobClient(host, key=Config.PRIVATE_KEY, chain_id=137,
+                        creds=ApiCreds('key', 'c2VjcmV0', 'passphrase'))
+    for index in range(20):
+        client.create_order(order(index))  # warm the tick size and neg-risk caches
+
+    started = time.perf_counter()
+    client.create_order(order(0))
+    sign_time = time.perf_counter() - started
+    print(f"{args.orders} orders, {args.latency * 1000:.0f}ms per request, {sign_time * 1000:.1f}ms to sign")
+
+    def report(name, run, submitter=None):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        requests = f" in {submitter.requests_sent} requests" if submitter else ""
+        print(f"  {name:<28} {args.orders / elapsed:6.1f} orders/s{requests}")
+
+    report("one at a time, sequential", lambda: inline(client, range(args.orders)))
+    report(f"{args.lanes} lanes, one at a time",
+           lambda: in_lanes(lambda indices: inline(client, indices), args.orders, args.lanes))
+
+    for name, run in (
+        (f"{args.lanes} lanes, pipelined", lambda submitter: in_lanes(
+            lambda indices: via_submitter(submitter, indices), args.orders, args.lanes)),
+        (f"burst of {args.orders}, pipelined", lambda submitter: [
+            result.result() for result in [submitter.submit(order(i), OrderType.FOK) for i in range(args.orders)]
+        ]),
+    ):
+        submitter = OrderSubmitter(client)
+        submitter.start()
+        report(name, lambda: run(submitter), submitter)
+        submitter.stop()
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
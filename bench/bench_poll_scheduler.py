@@ -0,0 +1,73 @@
+"""Requests and detection latency for fixed vs adaptive polling over a simulated hour.
+
+    python bench/bench_poll_scheduler.py [--hours 1] [--seed 3]
+
+The leader trades in bursts (a few fills within a minute) separated by
+quiet stretches. Each poll detects every trade since the previous poll;
+latency is the time from a trade to the poll that sees it.
+"""
+import argparse
+import random
+from typing import Callable, List, Tuple
+import common  # noqa: F401  (import path and credentials)
+from config.env import Config
+from services.poll_scheduler import AdaptivePollScheduler
+
+def burst_timeline(hours: float, seed: int) -> List[float]:
+    rng = random.Random(seed)
+    trades, t = [], 0.0
+    end = hours * 3600
+    while True:
+        t += rng.expovariate(1 / 300)  # a burst every ~5 minutes
+        if t >= end:
+            return trades
+        burst_start = t
+        for _ in range(rng.randint(2, 8)):
+            trades.append(t)
+            t += rng.expovariate(1 / 8)
+        t = max(t, burst_start)
+
+def simulate(trades: List[float], duration: float, next_delay: Callable[[int], float]) -> Tuple[int, float]:
+    """Poll from t=0 until `duration`; returns (requests, mean detection latency)"""
+    t, last_poll, requests, latencies, index = 0.0, float('-inf'), 0, [], 0
+    while t < duration:
+        requests += 1
+        found = 0
+        while index < len(trades) and trades[index] <= t:
+            if trades[index] > last_poll:
+                latencies.append(t - trades[index])
+                found += 1
+            index += 1
+        last_poll = t
+        t += next_delay(found)
+    return requests, sum(latencies) / len(latencies) if latencies else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hours', type=float, default=1)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    trades = burst_timeline(args.hours, args.seed)
+    duration = args.hours * 3600
+    print(f"{len(trades)} leader trades over {args.hours:g}h")
+
+    for interval in (5, Config.MIN_FETCH_INTERVAL):
+        requests, latency = simulate(trades, duration, lambda found: interval)
+        print(f"  fixed {interval:g}s          {requests:>6} requests  {latency:5.2f}s mean latency")
+
+    clock = [0.0]
+    scheduler = AdaptivePollScheduler(min_interval=Config.MIN_FETCH_INTERVAL,
+                                      max_interval=Config.MAX_FETCH_INTERVAL,
+                                      initial_interval=Config.FETCH_INTERVAL, clock=lambda: clock[0])
+
+    def adaptive(found: int) -> float:
+        delay = scheduler.record_poll(found)
+        clock[0] += delay
+        return delay
+    requests, latency = simulate(trades, duration, adaptive)
+    print(f"  adaptive {Config.MIN_FETCH_INTERVAL:g}-{Config.MAX_FETCH_INTERVAL:g}s    "
+          f"{requests:>6} requests  {latency:5.2f}s mean latency")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Shared setup for the benchmark scripts: import path, dummy credentials and synthetic activity.
+
+Run any script from the repository root, e.g. `python bench/bench_journal_append.py`.
+"""
+import os
+import random
+import sys
+import time
+from typing import Callable, List
+
+os.environ.setdefault('USER_ADDRESS', '0x1111111111111111111111111111111111111111')
+os.environ.setdefault('PROXY_WALLET', '0x2222222222222222222222222222222222222222')
+os.environ.setdefault('PK', '0x' + '01' * 32)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from models.user_activity import UserActivity
+
+def make_activities(count: int, markets: int = 200, wallets: int = 20, seed: int = 1) -> List[UserActivity]:
+    """Activities spread over a set of markets and wallets, one per second"""
+    rng = random.Random(seed)
+    activities = []
+    for i in range(count):
+        market = rng.randrange(markets)
+        price = round(rng.uniform(0.02, 0.98), 3)
+        size = round(rng.expovariate(1 / 200), 2)
+        activities.append(UserActivity(
+            proxy_wallet=f"0x{rng.randrange(wallets):040x}",
+            timestamp=1_750_000_000 + i,
+            condition_id=f"0x{market:064x}",
+            type='TRADE',
+            size=size,
+            usdc_size=round(size * price, 4),
+            transaction_hash=f"0x{rng.getrandbits(256):064x}",
+            price=price,
+            asset=str(10 ** 70 + market * 2 + rng.randrange(2)),
+            side=rng.choice(('BUY', 'SELL')),
+            outcome_index=0,
+            title=f"Market {market}",
+            slug=f"market-{market}",
+            outcome=rng.choice(('Yes', 'No')),
+            id=f"activity-{i}",
+        ))
+    return activities
+
+def best_of(runs: int, fn: Callable[[], object]) -> float:
+    """Fastest wall time of `runs` calls, in seconds"""
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
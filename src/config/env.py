@@ -4,10 +4,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 class Config:
-    # Target user to copy
-    USER_ADDRESS = os.getenv('USER_ADDRESS')
-    if not USER_ADDRESS:
+    # Target users to copy (comma-separated wallet addresses)
+    USER_ADDRESSES = [address.strip() for address in os.getenv('USER_ADDRESS', '').split(',') if address.strip()]
+    if not USER_ADDRESSES:
         raise ValueError("USER_ADDRESS is required")
+    USER_ADDRESS = USER_ADDRESSES[0]
     
     # Your wallet details
     PROXY_WALLET = os.getenv('PROXY_WALLET')
@@ -21,15 +22,74 @@ class Config:
     # API URLs
     HOST = os.getenv('HOST', 'https://clob.polymarket.com')
     POLYMARKET_API_URL = 'https://data-api.polymarket.com'
+    TRADE_STREAM_URL = os.getenv('TRADE_STREAM_URL', 'wss://ws-live-data.polymarket.com')
+    GAMMA_API_URL = os.getenv('GAMMA_API_URL', 'https://gamma-api.polymarket.com')
+    MARKET_STREAM_URL = os.getenv('MARKET_STREAM_URL', 'wss://ws-subscriptions-clob.polymarket.com/ws/market')
     
     # Trading parameters
-    FETCH_INTERVAL = int(os.getenv('FETCH_INTERVAL', '5'))  # seconds
+    FETCH_INTERVAL = int(os.getenv('FETCH_INTERVAL', '5'))  # seconds, initial poll interval
+    MIN_FETCH_INTERVAL = float(os.getenv('MIN_FETCH_INTERVAL', '1'))  # right after a detected trade
+    MAX_FETCH_INTERVAL = float(os.getenv('MAX_FETCH_INTERVAL', '15'))  # ceiling while the leader is idle
+    MAX_ERROR_BACKOFF = float(os.getenv('MAX_ERROR_BACKOFF', '120'))  # seconds
+    MAX_CONCURRENT_POLLS = int(os.getenv('MAX_CONCURRENT_POLLS', '10'))  # in-flight activity requests
+    ENABLE_TRADE_STREAM = os.getenv('ENABLE_TRADE_STREAM', 'false').lower() == 'true'  # push detection
+    ENABLE_CHAIN_DETECTOR = os.getenv('ENABLE_CHAIN_DETECTOR', 'false').lower() == 'true'  # OrderFilled logs
+    ENABLE_BOOK_STREAM = os.getenv('ENABLE_BOOK_STREAM', 'false').lower() == 'true'  # local L2 books
+    BOOK_MAX_AGE = float(os.getenv('BOOK_MAX_AGE', '300'))  # seconds before a streamed book is re-checked over REST
+    MARKET_DATA_TICK = float(os.getenv('MARKET_DATA_TICK', '1'))  # seconds bulk prices/books are reused
+    ACTIVITY_PAGE_SIZE = int(os.getenv('ACTIVITY_PAGE_SIZE', '50'))
+    ACTIVITY_MAX_PAGES = int(os.getenv('ACTIVITY_MAX_PAGES', '20'))  # backfill limit per poll
     TOO_OLD_TIMESTAMP = int(os.getenv('TOO_OLD_TIMESTAMP', '3600'))  # 1 hour
+    DEDUP_BUCKET_SECONDS = int(os.getenv('DEDUP_BUCKET_SECONDS', '60'))  # width of each seen-id bucket
+    DEDUP_BLOOM = os.getenv('DEDUP_BLOOM', 'false').lower() == 'true'  # remember expired ids in a Bloom filter
+    DEDUP_BLOOM_CAPACITY = int(os.getenv('DEDUP_BLOOM_CAPACITY', '1000000'))  # ids per leader before reset
+    DEDUP_BLOOM_ERROR_RATE = float(os.getenv('DEDUP_BLOOM_ERROR_RATE', '0.001'))  # false-positive rate
     RETRY_LIMIT = int(os.getenv('RETRY_LIMIT', '3'))
+    POSITION_TTL = int(os.getenv('POSITION_TTL', '30'))  # seconds between position refreshes
+    EXECUTION_CONCURRENCY = int(os.getenv('EXECUTION_CONCURRENCY', '4'))  # trades on different assets at once
+    ORDER_BATCH_SIZE = int(os.getenv('ORDER_BATCH_SIZE', '15'))  # orders per POST /orders (CLOB limit)
+    ORDER_SIGNERS = int(os.getenv('ORDER_SIGNERS', '2'))  # threads signing orders ahead of posting
+    ORDER_BATCH_LINGER = float(os.getenv('ORDER_BATCH_LINGER', '0'))  # seconds to wait for more orders per batch
+    ORDER_MAX_IN_FLIGHT = int(os.getenv('ORDER_MAX_IN_FLIGHT', '4'))  # concurrent order requests
+    ORDER_TIMEOUT = float(os.getenv('ORDER_TIMEOUT', '30'))  # seconds to wait for an order's response
+    COALESCE_WINDOW = float(os.getenv('COALESCE_WINDOW', '0'))  # seconds to gather fills for netting
+    CONTEXT_DEADLINE = float(os.getenv('CONTEXT_DEADLINE', '1.5'))  # seconds to wait for balances/positions/prices
+    CONTEXT_MAX_STALENESS = float(os.getenv('CONTEXT_MAX_STALENESS', '60'))  # oldest cache usable after the deadline
+    ENABLE_WARMUP = os.getenv('ENABLE_WARMUP', 'true').lower() == 'true'  # prefetch trade context at detection
+    WARMUP_MAX_AGE = float(os.getenv('WARMUP_MAX_AGE', '5'))  # seconds a prepared context stays usable
+    MAX_PRICE_DRIFT = float(os.getenv('MAX_PRICE_DRIFT', '0.1'))  # skip buys if the price moved more than 10%
+    MIN_COPY_AMOUNT = float(os.getenv('MIN_COPY_AMOUNT', '0.1'))  # USDC
+    BOOK_RECORD_DIR = os.getenv('BOOK_RECORD_DIR', '')  # record streamed books for replay; empty disables
+    BOOK_RECORD_INTERVAL = float(os.getenv('BOOK_RECORD_INTERVAL', '5'))  # seconds between snapshots per asset
+    COPY_MATCH_WINDOW = float(os.getenv('COPY_MATCH_WINDOW', '300'))  # seconds after a leader trade a fill counts as its copy
+    ENABLE_LEADER_ANALYTICS = os.getenv('ENABLE_LEADER_ANALYTICS', 'false').lower() == 'true'  # track leader PnL and copy slippage
+    
+    # HTTP transport (shared keep-alive pools for the data API)
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))  # hosts kept pooled
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))  # connections per host
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.3'))  # seconds
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))  # seconds
     
     # MongoDB (optional - fallback to local file storage)
     MONGO_URI = os.getenv('MONGO_URI')
     
+    # Storage: 'file' (JSON files), 'journal' (append-only log + snapshot), 'sqlite' or 'mongo'
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'mongo' if MONGO_URI else 'file').lower()
+    DATA_DIR = os.getenv('DATA_DIR', 'data')
+    JOURNAL_COMPACT_EVERY = int(os.getenv('JOURNAL_COMPACT_EVERY', '1000'))  # records
+    JOURNAL_FSYNC = os.getenv('JOURNAL_FSYNC', 'true').lower() == 'true'  # fsync each append; off is faster, less durable
+    SQLITE_PATH = os.getenv('SQLITE_PATH', os.path.join(DATA_DIR, 'copytrading.db'))
+    ENABLE_ARCHIVE = os.getenv('ENABLE_ARCHIVE', 'false').lower() == 'true'  # move settled activities out of the live store
+    ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', os.path.join(DATA_DIR, 'archive'))
+    ARCHIVE_INTERVAL = float(os.getenv('ARCHIVE_INTERVAL', '3600'))  # seconds between rotation passes
+    
     # Web3 config
     RPC_URL = os.getenv('RPC_URL', 'https://polygon-rpc.com')
     USDC_CONTRACT_ADDRESS = os.getenv('USDC_CONTRACT_ADDRESS', '0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174')
+    BLOCK_TIME = float(os.getenv('BLOCK_TIME', '2'))  # Polygon block time, seconds
+    CTF_EXCHANGE_ADDRESSES = [address.strip() for address in os.getenv(
+        'CTF_EXCHANGE_ADDRESSES',
+        '0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E,0xC5d563A36AE78145C45a50134d48A1215220f80a'  # CTF + NegRisk
+    ).split(',') if address.strip()]
+    CHAIN_MAX_BLOCK_RANGE = int(os.getenv('CHAIN_MAX_BLOCK_RANGE', '500'))  # blocks per eth_getLogs call
@@ -1,12 +1,24 @@
+import os
 import time
 import signal
 import sys
+import threading
 from config.env import Config
 from helpers.clob_client import create_clob_client
+from helpers.http_client import get_http_client
+from services.archive_rotator import ArchiveRotator
+from services.balance_service import BalanceService
+from services.book_recorder import BookRecorder
 from services.data_fetcher import DataFetcher
+from services.order_book import OrderBookManager
+from services.position_book import PositionBook
 from services.trade_monitor import TradeMonitor
 from services.trade_executor import TradeExecutor
-from storage.local_storage import LocalStorage
+from services.trade_queue import PendingTradeQueue
+from storage.activity_archive import ActivityArchive
+from storage.factory import create_storage
+from utils.leader_analytics import LeaderAnalytics
+from utils.portfolio_analyzer import PortfolioAnalyzer
 from colorama import Fore, Style, init
 
 # Initialize colorama
@@ -14,18 +26,24 @@ init()
 
 class CopyTradingBot:
     def __init__(self):
-        self.storage = LocalStorage()
-        self.data_fetcher = DataFetcher(self.storage)
+        self.storage = create_storage()
+        self.balance_service = BalanceService()
+        self.data_fetcher = DataFetcher(self.storage, balance_service=self.balance_service)
+        self.trade_queue = PendingTradeQueue()
         self.clob_client = None
         self.trade_monitor = None
+        self.position_book = None
+        self.book_manager = None
         self.trade_executor = None
+        self.archive_rotator = None
+        self.analytics = None
         
     def initialize(self):
         """Initialize the bot components"""
         print(f"{Fore.BLUE}🤖 Initializing Polymarket Copy Trading Bot...{Style.RESET_ALL}")
         
         # Check configuration
-        print(f"🎯 Target trader: {Config.USER_ADDRESS}")
+        print(f"🎯 Target traders: {', '.join(Config.USER_ADDRESSES)}")
         print(f"👤 Your wallet: {Config.PROXY_WALLET}")
         print(f"⏱️ Fetch interval: {Config.FETCH_INTERVAL} seconds")
         
@@ -34,8 +52,26 @@ class CopyTradingBot:
         self.clob_client = create_clob_client()
         
         # Initialize services
-        self.trade_monitor = TradeMonitor(self.storage, self.data_fetcher)
-        self.trade_executor = TradeExecutor(self.clob_client, self.storage, self.data_fetcher)
+        self.position_book = PositionBook(
+            self.data_fetcher, self.storage, [Config.PROXY_WALLET] + Config.USER_ADDRESSES
+        )
+        recorder = BookRecorder() if Config.BOOK_RECORD_DIR else None
+        # Streamed trade prices keep our positions and the portfolio table marked to market
+        self.book_manager = OrderBookManager(self.clob_client, recorder=recorder,
+                                             on_price=self.position_book.mark_price)
+        if Config.ENABLE_LEADER_ANALYTICS:
+            # History is loaded in the background on start; new trades arrive through the monitor
+            archive = ActivityArchive() if os.path.isdir(Config.ARCHIVE_DIR) else None
+            self.analytics = LeaderAnalytics(self.storage, archive)
+        self.trade_executor = TradeExecutor(self.clob_client, self.storage, self.data_fetcher,
+                                            self.trade_queue, self.balance_service, self.position_book,
+                                            self.book_manager, analytics=self.analytics)
+        warmup = self.trade_executor.warmup if Config.ENABLE_WARMUP else None
+        self.trade_monitor = TradeMonitor(self.storage, self.data_fetcher, self.trade_queue, warmup=warmup,
+                                          analytics=self.analytics)
+        
+        if Config.ENABLE_ARCHIVE:
+            self.archive_rotator = ArchiveRotator(self.storage, ActivityArchive(), Config.USER_ADDRESSES)
         
         print(f"{Fore.GREEN}✅ Bot initialized successfully!{Style.RESET_ALL}")
     
@@ -45,11 +81,18 @@ class CopyTradingBot:
             self.initialize()
             
             # Start monitoring and execution
+            self.position_book.start()
+            self.book_manager.start()
             self.trade_monitor.start_monitoring()
             self.trade_executor.start_executing()
+            if self.archive_rotator:
+                self.archive_rotator.start()
+            if self.analytics:
+                threading.Thread(target=self.analytics.load, args=(Config.USER_ADDRESSES,), daemon=True).start()
             
+            PortfolioAnalyzer.print_portfolio_summary(Config.PROXY_WALLET, table=self.position_book.table)
             print(f"{Fore.GREEN}🚀 Copy Trading Bot is now running!{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}📊 Monitoring trades from {Config.USER_ADDRESS}{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}📊 Monitoring trades from {len(Config.USER_ADDRESSES)} trader(s){Style.RESET_ALL}")
             print(f"{Fore.CYAN}💫 Press Ctrl+C to stop{Style.RESET_ALL}")
             
             # Keep the main thread alive
@@ -71,6 +114,24 @@ class CopyTradingBot:
         
         if self.trade_executor:
             self.trade_executor.stop_executing()
+            self.trade_executor.print_latency_report()
+        
+        if self.archive_rotator:
+            self.archive_rotator.stop()
+        
+        if self.analytics:
+            self.analytics.print_leaderboard()
+        
+        if self.position_book:
+            self.position_book.stop()
+            PortfolioAnalyzer.print_portfolio_summary(Config.PROXY_WALLET, table=self.position_book.table)
+        
+        if self.book_manager:
+            self.book_manager.stop()
+        
+        http_stats = get_http_client().get_stats()
+        print(f"🌐 HTTP: {http_stats['requests']} requests over {http_stats['connections']} connections "
+              f"({http_stats['reuse_rate']:.1%} reused)")
         
         print(f"{Fore.GREEN}✅ Bot stopped successfully!{Style.RESET_ALL}")
         sys.exit(0)
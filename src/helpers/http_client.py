@@ -0,0 +1,119 @@
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.env import Config
+
+# Per-endpoint timeouts (seconds), matched on the longest URL path prefix
+DEFAULT_ENDPOINT_TIMEOUTS = {
+    '/activity': 5,
+    '/positions': 10,
+    '/markets': 10,
+}
+
+class HttpClient:
+    """Shared HTTP transport with keep-alive pools, retries and per-endpoint timeouts"""
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20,
+                 max_retries: int = 3, backoff_factor: float = 0.3,
+                 default_timeout: float = 10,
+                 endpoint_timeouts: Optional[Dict[str, float]] = None):
+        self.default_timeout = default_timeout
+        self.endpoint_timeouts = dict(DEFAULT_ENDPOINT_TIMEOUTS if endpoint_timeouts is None else endpoint_timeouts)
+
+        # 429 is returned to the caller: AdaptivePollScheduler owns rate-limit backoff,
+        # and sleeping here as well would double every wait. urllib3 retries any
+        # response carrying Retry-After when the header is respected, so it is not.
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        self._lock = threading.Lock()
+        self._requests_by_host: Dict[str, int] = {}
+
+    def _timeout_for(self, url: str) -> float:
+        path = urlparse(url).path
+        matches = [prefix for prefix in self.endpoint_timeouts if path.startswith(prefix)]
+        if not matches:
+            return self.default_timeout
+        return self.endpoint_timeouts[max(matches, key=len)]
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        host = urlparse(url).netloc
+        with self._lock:
+            self._requests_by_host[host] = self._requests_by_host.get(host, 0) + 1
+
+        return self.session.request(
+            method,
+            url,
+            timeout=timeout if timeout is not None else self._timeout_for(url),
+            **kwargs
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Report requests and opened connections per host, and how often connections were reused"""
+        connections_by_host: Dict[str, int] = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections_by_host[pool.host] = connections_by_host.get(pool.host, 0) + pool.num_connections
+
+        with self._lock:
+            requests_by_host = dict(self._requests_by_host)
+
+        hosts = {}
+        for host, request_count in requests_by_host.items():
+            connections = connections_by_host.get(urlparse(f"//{host}").hostname, 0)
+            hosts[host] = {
+                'requests': request_count,
+                'connections': connections,
+                'reuse_rate': 1 - connections / request_count if request_count else 0.0
+            }
+
+        total_requests = sum(requests_by_host.values())
+        total_connections = sum(connections_by_host.values())
+        return {
+            'requests': total_requests,
+            'connections': total_connections,
+            'reuse_rate': 1 - total_connections / total_requests if total_requests else 0.0,
+            'hosts': hosts
+        }
+
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client, creating it from Config on first use"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient(
+                pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+                max_retries=Config.HTTP_MAX_RETRIES,
+                backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+                default_timeout=Config.HTTP_TIMEOUT
+            )
+        return _shared_client
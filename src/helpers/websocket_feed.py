@@ -0,0 +1,106 @@
+import asyncio
+import json
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from websockets.asyncio.client import connect
+from colorama import Fore, Style
+
+class WebSocketFeed:
+    """Persistent WebSocket subscription running on its own thread.
+
+    Subscription messages are remembered and replayed after every reconnect,
+    which happens automatically with exponential backoff. Each decoded JSON
+    message (or each element of a JSON array) is passed to `on_message`.
+    """
+
+    def __init__(self, url: str, on_message: Callable[[Dict[str, Any]], None], name: str = "feed",
+                 keepalive_message: Optional[str] = None, keepalive_interval: float = 10,
+                 max_backoff: float = 30):
+        self.url = url
+        self.on_message = on_message
+        self.name = name
+        self.keepalive_message = keepalive_message
+        self.keepalive_interval = keepalive_interval
+        self.max_backoff = max_backoff
+        self.running = False
+        self.reconnects = 0
+        self.connected = threading.Event()
+        self._subscriptions: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws = None
+
+    def start(self):
+        """Start the feed in a separate thread"""
+        self.running = True
+        feed_thread = threading.Thread(target=lambda: asyncio.run(self._run()), daemon=True)
+        feed_thread.start()
+
+    def stop(self):
+        """Stop the feed and close the connection"""
+        self.running = False
+        if self._loop and self._ws:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+
+    def subscribe(self, message: Dict[str, Any]):
+        """Send a subscription now (if connected) and again after every reconnect"""
+        with self._lock:
+            self._subscriptions.append(message)
+        if self._loop and self._ws:
+            asyncio.run_coroutine_threadsafe(self._ws.send(json.dumps(message)), self._loop)
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        backoff = 1.0
+
+        while self.running:
+            try:
+                async with connect(self.url) as ws:
+                    self._ws = ws
+                    self.connected.set()
+                    backoff = 1.0
+
+                    with self._lock:
+                        subscriptions = list(self._subscriptions)
+                    for message in subscriptions:
+                        await ws.send(json.dumps(message))
+
+                    keepalive = asyncio.create_task(self._keepalive(ws)) if self.keepalive_message else None
+                    try:
+                        async for raw in ws:
+                            self._dispatch(raw)
+                    finally:
+                        if keepalive:
+                            keepalive.cancel()
+
+            except Exception as e:
+                if self.running:
+                    print(f"{Fore.YELLOW}⚠️ {self.name} connection lost: {e}{Style.RESET_ALL}")
+            finally:
+                self._ws = None
+                self.connected.clear()
+
+            if self.running:
+                self.reconnects += 1
+                await asyncio.sleep(backoff / 2 + random.uniform(0, backoff / 2))
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _keepalive(self, ws):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            await ws.send(self.keepalive_message)
+
+    def _dispatch(self, raw):
+        try:
+            data = json.loads(raw)
+        except (TypeError, ValueError):
+            return  # PONG and other plain-text control frames
+
+        for message in data if isinstance(data, list) else [data]:
+            if not isinstance(message, dict):
+                continue
+            try:
+                self.on_message(message)
+            except Exception as e:
+                print(f"{Fore.RED}❌ Error handling {self.name} message: {e}{Style.RESET_ALL}")
@@ -0,0 +1,104 @@
+"""Local stand-in for Polymarket's WebSocket feeds that replays recorded messages.
+
+Recordings are JSON lines, one message per line, as captured from the live
+feed. Messages are replayed with their original spacing (scaled by `speed`)
+once a client sends its first subscription, with timestamps rewritten to
+the send time so latency can be measured offline.
+
+    python src/helpers/ws_replay_server.py recording.jsonl --port 8765 --speed 10
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from websockets.asyncio.server import serve
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _restamp(message: Dict[str, Any], now: float) -> Dict[str, Any]:
+    """Move a recorded message to the present so it isn't filtered as too old"""
+    message = json.loads(json.dumps(message))
+    if 'timestamp' in message:
+        ms = int(now * 1000)
+        message['timestamp'] = str(ms) if isinstance(message['timestamp'], str) else ms
+    payload = message.get('payload')
+    if isinstance(payload, dict) and 'timestamp' in payload:
+        payload['timestamp'] = int(now)
+    return message
+
+def _recorded_time(message: Dict[str, Any]) -> Optional[float]:
+    try:
+        return float(message['timestamp']) / 1000
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class ReplayServer:
+    """Serve a recording to every client that connects and subscribes"""
+
+    def __init__(self, messages: List[Dict[str, Any]], host: str = '127.0.0.1',
+                 port: int = 0, speed: float = 1.0):
+        self.messages = messages
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.sent = 0
+        self._ready = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Future] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def _handler(self, websocket):
+        # Wait for the first subscription, like the real feeds
+        await websocket.recv()
+
+        previous = None
+        for message in self.messages:
+            recorded = _recorded_time(message)
+            if previous is not None and recorded is not None and recorded > previous:
+                await asyncio.sleep((recorded - previous) / self.speed)
+            previous = recorded if recorded is not None else previous
+
+            await websocket.send(json.dumps(_restamp(message, time.time())))
+            self.sent += 1
+
+        await websocket.wait_closed()
+
+    async def serve_forever(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = self._loop.create_future()
+        async with serve(self._handler, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop
+
+    def start(self) -> 'ReplayServer':
+        """Run the server on a background thread and wait until it is listening"""
+        threading.Thread(target=lambda: asyncio.run(self.serve_forever()), daemon=True).start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop and self._stop:
+            self._loop.call_soon_threadsafe(self._stop.set_result, None)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded WebSocket messages")
+    parser.add_argument('recording', help="JSON-lines file of recorded messages")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--speed', type=float, default=1.0, help="Replay speed multiplier")
+    args = parser.parse_args()
+
+    server = ReplayServer(load_recording(args.recording), args.host, args.port, args.speed)
+    print(f"🔁 Replaying {len(server.messages)} messages on {server.url}")
+    asyncio.run(server.serve_forever())
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from typing import Optional, List, Dict, Any
 import json
 import os
+import sys
+import time
 from datetime import datetime
 
-@dataclass
+def _intern(value: Any) -> Any:
+    """Share one copy of strings that repeat across many records"""
+    return sys.intern(value) if type(value) is str else value
+
+@dataclass(slots=True)
 class UserActivity:
     proxy_wallet: str
     timestamp: int
@@ -25,13 +31,66 @@ class UserActivity:
     id: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Every field is a scalar, so a shallow read replaces asdict's deep copy
+        return {name: getattr(self, name) for name in ACTIVITY_FIELDS}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'UserActivity':
-        return cls(**data)
+        return cls(
+            _intern(data['proxy_wallet']),
+            data['timestamp'],
+            _intern(data['condition_id']),
+            _intern(data['type']),
+            data['size'],
+            data['usdc_size'],
+            data['transaction_hash'],
+            data['price'],
+            _intern(data['asset']),
+            _intern(data['side']),
+            data['outcome_index'],
+            _intern(data['title']),
+            _intern(data['slug']),
+            _intern(data['outcome']),
+            data.get('bot_executed', False),
+            data.get('bot_executed_time', 0),
+            data.get('id')
+        )
+
+    @classmethod
+    def from_row(cls, values: List[Any]) -> 'UserActivity':
+        """Build from values in field order, e.g. a storage row"""
+        values = list(values)
+        for index in ACTIVITY_INTERNED:
+            values[index] = _intern(values[index])
+        return cls(*values)
 
-@dataclass
+    @classmethod
+    def from_api_data(cls, data: Dict[str, Any], wallet_address: str) -> 'UserActivity':
+        get = data.get
+        timestamp = get('timestamp')
+        if timestamp is None:
+            timestamp = time.time()
+        return cls(
+            _intern(get('proxyWallet', wallet_address)),
+            int(timestamp),
+            _intern(get('conditionId', '')),
+            _intern(get('type', 'TRADE')),
+            float(get('size', 0)),
+            float(get('usdcSize', 0)),
+            get('transactionHash', ''),
+            float(get('price', 0)),
+            _intern(get('asset', '')),
+            _intern(get('side', 'BUY')),
+            int(get('outcomeIndex', 0)),
+            _intern(get('title', '')),
+            _intern(get('slug', '')),
+            _intern(get('outcome', '')),
+            False,
+            0,
+            data['id'] if 'id' in data else f"{wallet_address}_{timestamp}"
+        )
+
+@dataclass(slots=True)
 class UserPosition:
     proxy_wallet: str
     asset: str
@@ -52,25 +111,71 @@ class UserPosition:
     end_date: str
     negative_risk: bool
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in POSITION_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UserPosition':
+        return cls(
+            _intern(data['proxy_wallet']),
+            _intern(data['asset']),
+            _intern(data['condition_id']),
+            data['size'],
+            data['avg_price'],
+            data['initial_value'],
+            data['current_value'],
+            data['cash_pnl'],
+            data['percent_pnl'],
+            data['total_bought'],
+            data['realized_pnl'],
+            data['cur_price'],
+            data['redeemable'],
+            _intern(data['title']),
+            _intern(data['outcome']),
+            data['outcome_index'],
+            _intern(data['end_date']),
+            data['negative_risk']
+        )
+
+    @classmethod
+    def from_row(cls, values: List[Any]) -> 'UserPosition':
+        """Build from values in field order, e.g. a storage row"""
+        values = list(values)
+        for index in POSITION_INTERNED:
+            values[index] = _intern(values[index])
+        return cls(*values)
+
     @classmethod
     def from_api_data(cls, data: Dict[str, Any]) -> 'UserPosition':
+        get = data.get
         return cls(
-            proxy_wallet=data.get('proxyWallet', ''),
-            asset=data.get('asset', ''),
-            condition_id=data.get('conditionId', ''),
-            size=float(data.get('size', 0)),
-            avg_price=float(data.get('avgPrice', 0)),
-            initial_value=float(data.get('initialValue', 0)),
-            current_value=float(data.get('currentValue', 0)),
-            cash_pnl=float(data.get('cashPnl', 0)),
-            percent_pnl=float(data.get('percentPnl', 0)),
-            total_bought=float(data.get('totalBought', 0)),
-            realized_pnl=float(data.get('realizedPnl', 0)),
-            cur_price=float(data.get('curPrice', 0)),
-            redeemable=data.get('redeemable', False),
-            title=data.get('title', ''),
-            outcome=data.get('outcome', ''),
-            outcome_index=int(data.get('outcomeIndex', 0)),
-            end_date=data.get('endDate', ''),
-            negative_risk=data.get('negativeRisk', False)
+            _intern(get('proxyWallet', '')),
+            _intern(get('asset', '')),
+            _intern(get('conditionId', '')),
+            float(get('size', 0)),
+            float(get('avgPrice', 0)),
+            float(get('initialValue', 0)),
+            float(get('currentValue', 0)),
+            float(get('cashPnl', 0)),
+            float(get('percentPnl', 0)),
+            float(get('totalBought', 0)),
+            float(get('realizedPnl', 0)),
+            float(get('curPrice', 0)),
+            get('redeemable', False),
+            _intern(get('title', '')),
+            _intern(get('outcome', '')),
+            int(get('outcomeIndex', 0)),
+            _intern(get('endDate', '')),
+            get('negativeRisk', False)
         )
+
+ACTIVITY_FIELDS = tuple(f.name for f in fields(UserActivity))
+POSITION_FIELDS = tuple(f.name for f in fields(UserPosition))
+
+# Fields whose values repeat across records (market, wallet, outcome), by position
+ACTIVITY_INTERNED = tuple(ACTIVITY_FIELDS.index(name) for name in (
+    'proxy_wallet', 'condition_id', 'type', 'asset', 'side', 'title', 'slug', 'outcome'
+))
+POSITION_INTERNED = tuple(POSITION_FIELDS.index(name) for name in (
+    'proxy_wallet', 'asset', 'condition_id', 'title', 'outcome', 'end_date'
+))
@@ -0,0 +1,72 @@
+import threading
+import time
+from typing import List
+from config.env import Config
+from storage.activity_archive import ActivityArchive
+from storage.local_storage import LocalStorage
+from models.user_activity import UserActivity
+from colorama import Fore, Style
+
+class ArchiveRotator:
+    """Move settled activities out of the live store into the columnar archive.
+
+    An activity is settled once it is older than `max_age` (the too-old
+    window, after which it can no longer be copied) and nothing is left to
+    do for it: it was executed, ran out of retries, or is not a trade. Each
+    pass archives those first and only then removes them from storage, so a
+    crash in between leaves a duplicate that the next pass merges away.
+    """
+
+    def __init__(self, storage: LocalStorage, archive: ActivityArchive, wallet_addresses: List[str],
+                 interval: float = Config.ARCHIVE_INTERVAL, max_age: float = Config.TOO_OLD_TIMESTAMP):
+        self.storage = storage
+        self.archive = archive
+        self.wallet_addresses = list(wallet_addresses)
+        self.interval = interval
+        self.max_age = max_age
+        self.running = False
+        self.archived = 0
+
+    def start(self):
+        """Start rotating in a separate thread"""
+        self.running = True
+        rotate_thread = threading.Thread(target=self._rotate_loop, daemon=True)
+        rotate_thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def _rotate_loop(self):
+        while self.running:
+            for wallet in self.wallet_addresses:
+                try:
+                    self.rotate(wallet)
+                except Exception as e:
+                    print(f"{Fore.RED}❌ Error archiving activities for {wallet}: {e}{Style.RESET_ALL}")
+            # Sleep in short steps so stop() takes effect promptly
+            deadline = time.monotonic() + self.interval
+            while self.running and time.monotonic() < deadline:
+                time.sleep(1)
+
+    def _is_settled(self, activity: UserActivity, cutoff: float) -> bool:
+        return activity.timestamp < cutoff and (
+            activity.type != 'TRADE' or
+            activity.bot_executed or
+            activity.bot_executed_time >= Config.RETRY_LIMIT
+        )
+
+    def rotate(self, wallet_address: str) -> int:
+        """Archive and remove settled activities for one wallet; returns how many moved"""
+        cutoff = time.time() - self.max_age
+        settled = [
+            activity for activity in self.storage.load_activities(wallet_address)
+            if self._is_settled(activity, cutoff)
+        ]
+        if not settled:
+            return 0
+
+        self.archive.append(wallet_address, settled)
+        self.storage.remove_activities(wallet_address, [activity.id for activity in settled])
+        self.archived += len(settled)
+        print(f"{Fore.CYAN}🗄️ Archived {len(settled)} settled activities for {wallet_address}{Style.RESET_ALL}")
+        return len(settled)
@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
+from web3 import Web3
+from config.env import Config
+from helpers.http_client import get_http_client
+
+# USDC contract ABI (just the balanceOf function)
+USDC_ABI = [{
+    "constant": True,
+    "inputs": [{"name": "_owner", "type": "address"}],
+    "name": "balanceOf",
+    "outputs": [{"name": "balance", "type": "uint256"}],
+    "type": "function"
+}]
+
+USDC_DECIMALS = 6
+
+class BalanceService:
+    """USDC balances over one persistent Web3 provider.
+
+    All requested balances and the current block number are fetched in a
+    single batched JSON-RPC request. Results are cached for the block they
+    were read at; until a new block can have been produced (`block_time`
+    seconds) repeated reads are served from memory.
+    """
+
+    def __init__(self, rpc_url: str = Config.RPC_URL,
+                 usdc_address: str = Config.USDC_CONTRACT_ADDRESS,
+                 block_time: float = Config.BLOCK_TIME):
+        self.w3 = Web3(Web3.HTTPProvider(rpc_url, session=get_http_client().session))
+        self.usdc_contract = self.w3.eth.contract(
+            address=Web3.to_checksum_address(usdc_address),
+            abi=USDC_ABI
+        )
+        self.block_time = block_time
+        self._lock = threading.Lock()
+        self._cache_block: Optional[int] = None
+        self._cache_time = 0.0
+        self._cache: Dict[str, float] = {}
+
+    def _cache_fresh(self) -> bool:
+        return self._cache_block is not None and time.monotonic() - self._cache_time < self.block_time
+
+    def get_balances(self, wallet_addresses: List[str]) -> Dict[str, float]:
+        """Get USDC balances for several wallets with at most one RPC round-trip"""
+        with self._lock:
+            if self._cache_fresh() and all(wallet in self._cache for wallet in wallet_addresses):
+                return {wallet: self._cache[wallet] for wallet in wallet_addresses}
+
+            try:
+                with self.w3.batch_requests() as batch:
+                    batch.add(self.w3.eth.get_block_number())
+                    for wallet in wallet_addresses:
+                        batch.add(self.usdc_contract.functions.balanceOf(Web3.to_checksum_address(wallet)))
+                    responses = batch.execute()
+
+                block_number = responses[0]
+                if block_number != self._cache_block:
+                    self._cache = {}
+                    self._cache_block = block_number
+                self._cache_time = time.monotonic()
+
+                for wallet, balance_wei in zip(wallet_addresses, responses[1:]):
+                    self._cache[wallet] = balance_wei / (10 ** USDC_DECIMALS)
+
+            except Exception as e:
+                # Fall back to the last known balances rather than reporting zero
+                print(f"❌ Error getting balances: {e}")
+
+            return {wallet: self._cache.get(wallet, 0.0) for wallet in wallet_addresses}
+
+    def get_cached_balances(self, wallet_addresses: List[str]) -> Optional[Tuple[Dict[str, float], float]]:
+        """Last known balances and their age in seconds, without any RPC call"""
+        with self._lock:
+            if self._cache_block is None or not all(wallet in self._cache for wallet in wallet_addresses):
+                return None
+            age = time.monotonic() - self._cache_time
+            return {wallet: self._cache[wallet] for wallet in wallet_addresses}, age
+
+    def get_balance(self, wallet_address: str) -> float:
+        """Get USDC balance for a wallet"""
+        return self.get_balances([wallet_address])[wallet_address]
@@ -0,0 +1,78 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+from config.env import Config
+from services.order_book import LocalOrderBook
+
+class BookRecorder:
+    """Append streamed order books to per-day JSON-lines files for replay.
+
+    A full snapshot of a book is written at most every `interval` seconds
+    per asset, plus every last-trade price, each stamped with unix time.
+    Files are named `<YYYY-MM-DD>.jsonl` (UTC) under `directory` and are
+    read back by `read_book_history`.
+    """
+
+    def __init__(self, directory: str = Config.BOOK_RECORD_DIR,
+                 interval: float = Config.BOOK_RECORD_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last_recorded: Dict[str, float] = {}
+        self._day: Optional[str] = None
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _write(self, record: Dict[str, Any]):
+        day = time.strftime('%Y-%m-%d', time.gmtime(record['timestamp']))
+        with self._lock:
+            if day != self._day:
+                if self._file:
+                    self._file.close()
+                self._file = open(os.path.join(self.directory, f"{day}.jsonl"), 'a')
+                self._day = day
+            self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def record_book(self, book: LocalOrderBook, force: bool = False):
+        now = time.time()
+        if not force and now - self._last_recorded.get(book.asset_id, 0.0) < self.interval:
+            return
+        self._last_recorded[book.asset_id] = now
+        self._write({
+            'timestamp': now,
+            'asset_id': book.asset_id,
+            'bids': book.bids.levels(),
+            'asks': book.asks.levels()
+        })
+
+    def record_price(self, asset_id: str, price: float):
+        self._write({'timestamp': time.time(), 'asset_id': asset_id, 'price': price})
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+                self._day = None
+
+def read_book_history(directory: str, start: Optional[float] = None,
+                      end: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """Recorded book snapshots and prices in time order, limited to [start, end]"""
+    if not os.path.isdir(directory):
+        return
+    first = time.strftime('%Y-%m-%d', time.gmtime(start)) if start is not None else None
+    last = time.strftime('%Y-%m-%d', time.gmtime(end)) if end is not None else None
+    for name in sorted(os.listdir(directory)):
+        day = name[:-len('.jsonl')]
+        if not name.endswith('.jsonl') or (first and day < first) or (last and day > last):
+            continue
+        with open(os.path.join(directory, name), 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash
+                if (start is None or record['timestamp'] >= start) and (end is None or record['timestamp'] <= end):
+                    yield record
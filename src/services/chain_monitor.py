@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from web3 import Web3
+from config.env import Config
+from helpers.http_client import get_http_client
+from models.user_activity import UserActivity
+from colorama import Fore, Style
+
+ORDER_FILLED_TOPIC = Web3.to_hex(Web3.keccak(
+    text="OrderFilled(bytes32,address,address,uint256,uint256,uint256,uint256,uint256)"
+))
+
+TOKEN_DECIMALS = 6  # USDC and conditional tokens both use 6 decimals
+
+class ChainFillDetector:
+    """Detect leader fills from CTF Exchange `OrderFilled` logs on Polygon.
+
+    Polls `eth_getLogs` by block range for logs whose maker is a leader's
+    proxy wallet, which covers both maker and taker orders. Fills are turned
+    into UserActivity records with the same ids as the data API and handed to
+    the monitor's pipeline. The last processed block is checkpointed so a
+    restart resumes instead of rescanning.
+    """
+
+    def __init__(self, target_wallets: List[str],
+                 on_activities: Callable[[str, List[UserActivity]], Any],
+                 checkpoint_dir: str = Config.DATA_DIR,
+                 rpc_url: str = Config.RPC_URL,
+                 exchange_addresses: Optional[List[str]] = None,
+                 poll_interval: float = Config.BLOCK_TIME,
+                 max_block_range: int = Config.CHAIN_MAX_BLOCK_RANGE,
+                 w3: Optional[Web3] = None):
+        self.on_activities = on_activities
+        self.w3 = w3 or Web3(Web3.HTTPProvider(rpc_url, session=get_http_client().session))
+        self.exchange_addresses = [
+            Web3.to_checksum_address(address)
+            for address in (exchange_addresses or Config.CTF_EXCHANGE_ADDRESSES)
+        ]
+        self.poll_interval = poll_interval
+        self.max_block_range = max_block_range
+        self.checkpoint_file = os.path.join(checkpoint_dir, "chain_checkpoint.json")
+        self.running = False
+
+        # Indexed address topics are the address left-padded to 32 bytes
+        self._wallets_by_topic = {
+            '0x' + wallet.lower()[2:].rjust(64, '0'): wallet for wallet in target_wallets
+        }
+        self._block_times: Dict[int, int] = {}
+        self._market_cache: Dict[str, Dict[str, Any]] = {}
+        self.last_block = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> Optional[int]:
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                return int(json.load(f)['block'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_checkpoint(self, block_number: int):
+        tmp_file = self.checkpoint_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump({'block': block_number}, f)
+        os.replace(tmp_file, self.checkpoint_file)
+
+    def start(self):
+        """Start log polling in a separate thread"""
+        self.running = True
+        detector_thread = threading.Thread(target=self._poll_loop, daemon=True)
+        detector_thread.start()
+        print(f"{Fore.GREEN}✅ On-chain fill detection started{Style.RESET_ALL}")
+
+    def stop(self):
+        self.running = False
+
+    def _poll_loop(self):
+        while self.running:
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"{Fore.RED}❌ Error polling chain logs: {e}{Style.RESET_ALL}")
+            time.sleep(self.poll_interval)
+
+    def poll(self) -> int:
+        """Process all new blocks up to the chain head; returns the number of fills found"""
+        head = self.w3.eth.block_number
+        if self.last_block is None:
+            # First run: start at the head; the data API covers older history
+            self.last_block = head
+            self._save_checkpoint(head)
+            return 0
+
+        found = 0
+        while self.last_block < head:
+            from_block = self.last_block + 1
+            to_block = min(head, from_block + self.max_block_range - 1)
+
+            logs = self.w3.eth.get_logs({
+                'fromBlock': from_block,
+                'toBlock': to_block,
+                'address': self.exchange_addresses,
+                'topics': [ORDER_FILLED_TOPIC, None, list(self._wallets_by_topic)]
+            })
+            found += self._emit(logs)
+
+            self.last_block = to_block
+            self._save_checkpoint(to_block)
+        return found
+
+    def _emit(self, logs: List[Dict[str, Any]]) -> int:
+        by_wallet: Dict[str, List[UserActivity]] = {}
+        for log in logs:
+            maker_topic = Web3.to_hex(log['topics'][2])
+            wallet = self._wallets_by_topic.get(maker_topic.lower())
+            if wallet:
+                by_wallet.setdefault(wallet, []).append(self._to_activity(log, wallet))
+
+        for wallet, activities in by_wallet.items():
+            self.on_activities(wallet, activities)
+        return sum(len(activities) for activities in by_wallet.values())
+
+    def _to_activity(self, log: Dict[str, Any], wallet_address: str) -> UserActivity:
+        data = bytes(log['data'])
+        maker_asset_id, taker_asset_id, maker_amount, taker_amount = (
+            int.from_bytes(data[i * 32:(i + 1) * 32], 'big') for i in range(4)
+        )
+
+        # Asset id 0 is USDC: a maker paying USDC is buying outcome tokens
+        if maker_asset_id == 0:
+            side, asset, usdc_amount, token_amount = 'BUY', taker_asset_id, maker_amount, taker_amount
+        else:
+            side, asset, usdc_amount, token_amount = 'SELL', maker_asset_id, taker_amount, maker_amount
+
+        size = token_amount / (10 ** TOKEN_DECIMALS)
+        usdc_size = usdc_amount / (10 ** TOKEN_DECIMALS)
+        market = self._market_info(str(asset))
+
+        return UserActivity.from_api_data({
+            'proxyWallet': wallet_address,
+            'timestamp': self._block_time(log['blockNumber']),
+            'type': 'TRADE',
+            'size': size,
+            'usdcSize': usdc_size,
+            'price': usdc_size / size if size else 0,
+            'asset': str(asset),
+            'side': side,
+            'transactionHash': Web3.to_hex(log['transactionHash']),
+            **market
+        }, wallet_address)
+
+    def _block_time(self, block_number: int) -> int:
+        if block_number not in self._block_times:
+            self._block_times[block_number] = int(self.w3.eth.get_block(block_number)['timestamp'])
+            if len(self._block_times) > 1000:
+                self._block_times.pop(next(iter(self._block_times)))
+        return self._block_times[block_number]
+
+    def _market_info(self, asset: str) -> Dict[str, Any]:
+        """Resolve condition id, title and outcome for a token through the Gamma API"""
+        if asset in self._market_cache:
+            return self._market_cache[asset]
+
+        info: Dict[str, Any] = {}
+        try:
+            response = get_http_client().get(f"{Config.GAMMA_API_URL}/markets",
+                                             params={'clob_token_ids': asset})
+            response.raise_for_status()
+            markets = response.json()
+            if markets:
+                market = markets[0]
+                token_ids = json.loads(market.get('clobTokenIds') or '[]')
+                outcomes = json.loads(market.get('outcomes') or '[]')
+                outcome_index = token_ids.index(asset) if asset in token_ids else 0
+                info = {
+                    'conditionId': market.get('conditionId', ''),
+                    'title': market.get('question', ''),
+                    'slug': market.get('slug', ''),
+                    'outcomeIndex': outcome_index,
+                    'outcome': outcomes[outcome_index] if outcome_index < len(outcomes) else ''
+                }
+                self._market_cache[asset] = info
+        except Exception as e:
+            # Missing metadata only affects display; the executor trades by asset
+            print(f"{Fore.YELLOW}⚠️ Could not resolve market for token {asset[:12]}...: {e}{Style.RESET_ALL}")
+        return info
@@ -1,14 +1,26 @@
-import requests
 import time
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Set, Tuple
 from config.env import Config
+from helpers.http_client import HttpClient, get_http_client
 from models.user_activity import UserActivity, UserPosition
+from services.balance_service import BalanceService
 from storage.local_storage import LocalStorage
 
+@dataclass
+class ActivityCursor:
+    """High-water mark of the newest activity seen for a wallet"""
+    timestamp: int
+    ids: Set[str] = field(default_factory=set)  # ids seen at exactly `timestamp`
+
 class DataFetcher:
-    def __init__(self, storage: LocalStorage):
+    def __init__(self, storage: LocalStorage, http_client: Optional[HttpClient] = None,
+                 balance_service: Optional[BalanceService] = None):
         self.storage = storage
         self.base_url = Config.POLYMARKET_API_URL
+        self.http = http_client or get_http_client()
+        self.balance_service = balance_service or BalanceService()
+        self.cursors: Dict[str, ActivityCursor] = {}
         
     def fetch_user_activities(self, wallet_address: str) -> List[UserActivity]:
         """Fetch recent trading activities for a user"""
@@ -20,44 +32,80 @@ class DataFetcher:
                 'offset': 0
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             
-            activities = []
-            for item in response.json():
-                # Convert API response to our UserActivity model
-                activity = UserActivity(
-                    proxy_wallet=item.get('proxyWallet', wallet_address),
-                    timestamp=int(item.get('timestamp', time.time())),
-                    condition_id=item.get('conditionId', ''),
-                    type=item.get('type', 'TRADE'),
-                    size=float(item.get('size', 0)),
-                    usdc_size=float(item.get('usdcSize', 0)),
-                    transaction_hash=item.get('transactionHash', ''),
-                    price=float(item.get('price', 0)),
-                    asset=item.get('asset', ''),
-                    side=item.get('side', 'BUY'),
-                    outcome_index=int(item.get('outcomeIndex', 0)),
-                    title=item.get('title', ''),
-                    slug=item.get('slug', ''),
-                    outcome=item.get('outcome', ''),
-                    id=item.get('id', f"{wallet_address}_{item.get('timestamp', time.time())}")
-                )
-                activities.append(activity)
-                
-            return activities
+            # Convert API response to our UserActivity model
+            return [UserActivity.from_api_data(item, wallet_address) for item in response.json()]
             
         except Exception as e:
             print(f"❌ Error fetching user activities: {e}")
             return []
     
-    def fetch_user_positions(self, wallet_address: str) -> List[UserPosition]:
+    def fetch_new_activities(self, wallet_address: str) -> Tuple[List[UserActivity], ActivityCursor]:
+        """Fetch only activity newer than the wallet's high-water mark, oldest first.
+
+        Pages are requested newest-first from the cursor timestamp; a full page
+        means there may be more, so we keep paging back until the gap since
+        the last poll is covered. HTTP errors are raised to the caller.
+        Returns the activities and the cursor that would follow them; the
+        caller passes it to `commit_cursor` once they are stored, so a failed
+        write fetches the same activities again next poll.
+        """
+        cursor = self.cursors.get(wallet_address)
+        start = cursor.timestamp if cursor else int(time.time()) - Config.TOO_OLD_TIMESTAMP
+        page_size = Config.ACTIVITY_PAGE_SIZE
+        
+        items = []
+        for page in range(Config.ACTIVITY_MAX_PAGES):
+            params = {
+                'user': wallet_address,
+                'limit': page_size,
+                'offset': page * page_size,
+                'start': start,
+                'sortBy': 'TIMESTAMP',
+                'sortDirection': 'DESC'
+            }
+            response = self.http.get(f"{self.base_url}/activity", params=params)
+            response.raise_for_status()
+            
+            page_items = response.json()
+            items.extend(page_items)
+            if len(page_items) < page_size:
+                break
+        else:
+            print(f"⚠️ Activity backfill for {wallet_address} stopped after {Config.ACTIVITY_MAX_PAGES} pages")
+        
+        seen_ids = cursor.ids if cursor else set()
+        activities = {}
+        for item in items:
+            activity = UserActivity.from_api_data(item, wallet_address)
+            # Rows at the cursor timestamp may already have been returned last poll
+            if activity.id not in seen_ids:
+                activities[activity.id] = activity  # offsets can shift mid-backfill, dedupe pages
+        
+        new_activities = sorted(activities.values(), key=lambda activity: activity.timestamp)
+        next_cursor = cursor or ActivityCursor(start)
+        if new_activities:
+            newest = new_activities[-1].timestamp
+            newest_ids = {activity.id for activity in new_activities if activity.timestamp == newest}
+            if cursor and cursor.timestamp == newest:
+                newest_ids |= cursor.ids
+            next_cursor = ActivityCursor(newest, newest_ids)
+        
+        return new_activities, next_cursor
+    
+    def commit_cursor(self, wallet_address: str, cursor: ActivityCursor):
+        """Advance a wallet's high-water mark after its activities were stored"""
+        self.cursors[wallet_address] = cursor
+    
+    def fetch_user_positions(self, wallet_address: str, raise_errors: bool = False) -> List[UserPosition]:
         """Fetch current positions for a user"""
         try:
             url = f"{self.base_url}/positions"
             params = {'user': wallet_address}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             
             positions = []
@@ -68,35 +116,12 @@ class DataFetcher:
             return positions
             
         except Exception as e:
+            # Callers that cache positions need to tell "no positions" from a failed fetch
+            if raise_errors:
+                raise
             print(f"❌ Error fetching user positions: {e}")
             return []
     
     def get_balance(self, wallet_address: str) -> float:
         """Get USDC balance for a wallet"""
-        try:
-            from web3 import Web3
-            
-            w3 = Web3(Web3.HTTPProvider(Config.RPC_URL))
-            
-            # USDC contract ABI (just the balanceOf function)
-            usdc_abi = [{
-                "constant": True,
-                "inputs": [{"name": "_owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "balance", "type": "uint256"}],
-                "type": "function"
-            }]
-            
-            usdc_contract = w3.eth.contract(
-                address=Config.USDC_CONTRACT_ADDRESS,
-                abi=usdc_abi
-            )
-            
-            balance_wei = usdc_contract.functions.balanceOf(wallet_address).call()
-            balance_usdc = balance_wei / (10 ** 6)  # USDC has 6 decimals
-            
-            return balance_usdc
-            
-        except Exception as e:
-            print(f"❌ Error getting balance: {e}")
-            return 0.0
\ No newline at end of file
+        return self.balance_service.get_balance(wallet_address)
\ No newline at end of file
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import BookParams
+from config.env import Config
+from services.order_book import LocalOrderBook, OrderBookManager
+from models.user_activity import UserActivity
+from colorama import Fore, Style
+
+class MarketDataService:
+    """Prices and order books for the executor, fetched in bulk per batch.
+
+    Before a batch of pending trades is dispatched, `prefetch` collects the
+    assets it needs and loads all last-trade prices and books with one
+    request each through the CLOB's multi-token endpoints. Results are
+    cached for `tick` seconds, so every trade in the batch (and any asset
+    repeated across trades) reads its slice from memory. Streamed books from
+    the OrderBookManager are preferred when live and never re-fetched.
+    """
+
+    def __init__(self, clob_client: ClobClient, book_manager: Optional[OrderBookManager] = None,
+                 tick: float = Config.MARKET_DATA_TICK):
+        self.clob_client = clob_client
+        self.book_manager = book_manager or OrderBookManager(clob_client, enable_stream=False)
+        self.tick = tick
+        self._lock = threading.Lock()
+        self._bulk_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='market-data')
+        self._books: Dict[str, Tuple[float, LocalOrderBook]] = {}
+        self._prices: Dict[str, Tuple[float, float]] = {}
+        self.bulk_requests = 0
+        self.single_requests = 0
+        self.cache_hits = 0
+
+    def _cached(self, cache: Dict[str, Tuple[float, Any]], asset_id: str) -> Optional[Any]:
+        with self._lock:
+            entry = cache.get(asset_id)
+            if entry and time.monotonic() - entry[0] < self.tick:
+                self.cache_hits += 1
+                return entry[1]
+            return None
+
+    def _store(self, cache: Dict[str, Tuple[float, Any]], values: Dict[str, Any]):
+        now = time.monotonic()
+        with self._lock:
+            for asset_id, value in values.items():
+                cache[asset_id] = (now, value)
+
+    def prefetch(self, trades: Iterable[UserActivity]):
+        """Load last-trade prices for buys and books for every trade of a batch in bulk"""
+        price_assets, book_assets = set(), set()
+        for trade in trades:
+            if not trade.asset:
+                continue
+            if trade.type == 'TRADE' and trade.side == 'BUY':
+                if (self.book_manager.get_last_trade_price(trade.asset) is None and
+                        self._cached(self._prices, trade.asset) is None):
+                    price_assets.add(trade.asset)
+            # Buys need the asks to price the market order, sells and merges need the bids
+            if not self.book_manager.has_live_book(trade.asset) and self._cached(self._books, trade.asset) is None:
+                book_assets.add(trade.asset)
+
+        # Subscribe now so later trades on these assets are served from the stream
+        self.book_manager.watch(price_assets | book_assets)
+
+        # Prices and books are independent requests, so run them side by side
+        requests = []
+        if price_assets:
+            requests.append(self._bulk_pool.submit(self._fetch_prices, sorted(price_assets)))
+        if book_assets:
+            requests.append(self._bulk_pool.submit(self._fetch_books, sorted(book_assets)))
+        for request in requests:
+            try:
+                request.result()
+            except Exception as e:
+                # Trades fall back to fetching their own asset
+                print(f"{Fore.YELLOW}⚠️ Bulk market data request failed: {e}{Style.RESET_ALL}")
+
+    def _fetch_prices(self, asset_ids: List[str]):
+        self.bulk_requests += 1
+        response = self.clob_client.get_last_trades_prices([BookParams(token_id=asset) for asset in asset_ids])
+        self._store(self._prices, {
+            item['token_id']: float(item['price']) for item in response or [] if item.get('price')
+        })
+
+    def _fetch_books(self, asset_ids: List[str]):
+        self.bulk_requests += 1
+        summaries = self.clob_client.get_order_books([BookParams(token_id=asset) for asset in asset_ids])
+        self._store(self._books, {
+            summary.asset_id: LocalOrderBook.from_summary(summary.asset_id, summary)
+            for summary in summaries or []
+        })
+
+    def warm_order_options(self, asset_id: str):
+        """Resolve tick size and neg-risk flag, which the client caches for order signing"""
+        self.clob_client.get_tick_size(asset_id)
+        self.clob_client.get_neg_risk(asset_id)
+
+    def get_book(self, asset_id: str) -> LocalOrderBook:
+        if self.book_manager.has_live_book(asset_id):
+            return self.book_manager.get_book(asset_id)
+
+        book = self._cached(self._books, asset_id)
+        if book is None:
+            self.single_requests += 1
+            book = self.book_manager.get_book(asset_id)
+            self._store(self._books, {asset_id: book})
+        return book
+
+    def get_last_trade_price(self, asset_id: str) -> float:
+        streamed = self.book_manager.get_last_trade_price(asset_id)
+        if streamed is not None:
+            return streamed
+
+        price = self._cached(self._prices, asset_id)
+        if price is None:
+            self.single_requests += 1
+            price = float(self.clob_client.get_last_trade_price(asset_id)['price'])
+            self._store(self._prices, {asset_id: price})
+        return price
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'bulk_requests': self.bulk_requests,
+            'single_requests': self.single_requests,
+            'cache_hits': self.cache_hits
+        }
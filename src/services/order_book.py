@@ -0,0 +1,272 @@
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from py_clob_client.client import ClobClient
+from config.env import Config
+from helpers.websocket_feed import WebSocketFeed
+from colorama import Fore, Style
+
+class BookLadder:
+    """One side of an order book: price levels kept sorted for O(1) best price"""
+
+    def __init__(self, descending: bool):
+        self.descending = descending  # bids are best-first when highest
+        self._prices: List[float] = []  # always ascending
+        self._sizes: Dict[float, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def clear(self):
+        self._prices = []
+        self._sizes = {}
+
+    def copy(self) -> 'BookLadder':
+        ladder = BookLadder(self.descending)
+        ladder._prices = list(self._prices)
+        ladder._sizes = dict(self._sizes)
+        return ladder
+
+    def set_level(self, price: float, size: float):
+        """Set the size at a price; a size of zero removes the level"""
+        if size <= 0:
+            if self._sizes.pop(price, None) is not None:
+                del self._prices[bisect.bisect_left(self._prices, price)]
+            return
+        if price not in self._sizes:
+            bisect.insort(self._prices, price)
+        self._sizes[price] = size
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self._prices:
+            return None
+        price = self._prices[-1] if self.descending else self._prices[0]
+        return price, self._sizes[price]
+
+    def levels(self, limit: Optional[int] = None) -> List[Tuple[float, float]]:
+        """Price levels from best to worst"""
+        prices = reversed(self._prices) if self.descending else iter(self._prices)
+        result = []
+        for price in prices:
+            if limit is not None and len(result) >= limit:
+                break
+            result.append((price, self._sizes[price]))
+        return result
+
+    def size_at_or_better(self, limit_price: float) -> float:
+        """Shares available at limit_price or better"""
+        if self.descending:
+            start = bisect.bisect_left(self._prices, limit_price)
+            prices = self._prices[start:]
+        else:
+            prices = self._prices[:bisect.bisect_right(self._prices, limit_price)]
+        return sum(self._sizes[price] for price in prices)
+
+    def notional(self) -> float:
+        return sum(price * size for price, size in self._sizes.items())
+
+class LocalOrderBook:
+    """L2 book for one asset, built from a snapshot and kept current by deltas"""
+
+    def __init__(self, asset_id: str):
+        self.asset_id = asset_id
+        self.bids = BookLadder(descending=True)
+        self.asks = BookLadder(descending=False)
+        self.hash: Optional[str] = None
+        self.updated_at = 0.0  # monotonic time of the last snapshot or delta
+        self.generation = -1  # feed connection the book was synced on; -1 for REST
+
+    def copy(self) -> 'LocalOrderBook':
+        """Independent snapshot; the streamed book keeps changing under the feed thread"""
+        book = LocalOrderBook(self.asset_id)
+        book.bids = self.bids.copy()
+        book.asks = self.asks.copy()
+        book.hash = self.hash
+        book.updated_at = self.updated_at
+        book.generation = self.generation
+        return book
+
+    @classmethod
+    def from_summary(cls, asset_id: str, summary: Any) -> 'LocalOrderBook':
+        """Build a book from a REST OrderBookSummary"""
+        book = cls(asset_id)
+        book.apply_snapshot(
+            [(level.price, level.size) for level in summary.bids or []],
+            [(level.price, level.size) for level in summary.asks or []],
+            getattr(summary, 'hash', None)
+        )
+        return book
+
+    def apply_snapshot(self, bids: Iterable[Tuple[Any, Any]], asks: Iterable[Tuple[Any, Any]],
+                       book_hash: Optional[str] = None):
+        self.bids.clear()
+        self.asks.clear()
+        for price, size in bids:
+            self.bids.set_level(float(price), float(size))
+        for price, size in asks:
+            self.asks.set_level(float(price), float(size))
+        self.hash = book_hash
+        self.updated_at = time.monotonic()
+
+    def apply_change(self, side: str, price: Any, size: Any, book_hash: Optional[str] = None):
+        ladder = self.bids if side.upper() == 'BUY' else self.asks
+        ladder.set_level(float(price), float(size))
+        self.hash = book_hash or self.hash
+        self.updated_at = time.monotonic()
+
+    def best_bid(self) -> Optional[float]:
+        best = self.bids.best()
+        return best[0] if best else None
+
+    def best_ask(self) -> Optional[float]:
+        best = self.asks.best()
+        return best[0] if best else None
+
+    def market_buy_price(self, amount: float) -> Optional[float]:
+        """Worst ask a market buy of `amount` USDC would reach, or None if the book is too thin"""
+        notional = 0.0
+        for price, size in self.asks.levels():
+            notional += price * size
+            if notional >= amount:
+                return price
+        return None
+
+    def spread(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        return ask - bid if bid is not None and ask is not None else None
+
+class OrderBookManager:
+    """Local L2 books for the assets we hold or copy, fed by the CLOB market channel.
+
+    Each watched asset gets a book from the channel's `book` snapshot that is
+    then updated in place from `price_change` deltas, so best bid/ask are
+    read without a request. A book is trusted only while the connection it
+    was synced on is still up and it is younger than `max_age`; otherwise
+    `get_book` falls back to a REST snapshot. With the stream disabled every
+    read goes to REST. An optional BookRecorder keeps streamed books on disk
+    for the backtest replay.
+    """
+
+    def __init__(self, clob_client: ClobClient, url: str = Config.MARKET_STREAM_URL,
+                 enable_stream: bool = Config.ENABLE_BOOK_STREAM,
+                 max_age: float = Config.BOOK_MAX_AGE, recorder: Optional[Any] = None,
+                 on_price: Optional[Callable[[str, float], Any]] = None):
+        self.clob_client = clob_client
+        self.max_age = max_age
+        self.recorder = recorder
+        self.on_price = on_price  # called with (asset, price) for every last trade price
+        self._books: Dict[str, LocalOrderBook] = {}
+        self._last_trade_prices: Dict[str, float] = {}
+        self._assets = set()
+        self._lock = threading.Lock()
+        self.stream_hits = 0
+        self.rest_fallbacks = 0
+        self.feed = WebSocketFeed(url, self._handle_message, name="Market channel",
+                                  keepalive_message="PING") if enable_stream else None
+
+    def start(self):
+        if self.feed:
+            self.feed.start()
+
+    def stop(self):
+        if self.feed:
+            self.feed.stop()
+        if self.recorder:
+            self.recorder.close()
+
+    def watch(self, asset_ids: Iterable[str]):
+        """Subscribe to books for any assets we are not watching yet"""
+        if not self.feed:
+            return
+        with self._lock:
+            new_assets = sorted(set(asset for asset in asset_ids if asset) - self._assets)
+            first = not self._assets
+            self._assets.update(new_assets)
+
+        if new_assets:
+            # The first message opens the market channel; later ones extend it
+            if first:
+                self.feed.subscribe({'assets_ids': new_assets, 'type': 'market'})
+            else:
+                self.feed.subscribe({'assets_ids': new_assets, 'operation': 'subscribe'})
+
+    def _is_live(self, book: LocalOrderBook) -> bool:
+        return (self.feed is not None and self.feed.connected.is_set() and
+                book.generation == self.feed.reconnects and
+                time.monotonic() - book.updated_at < self.max_age)
+
+    def has_live_book(self, asset_id: str) -> bool:
+        with self._lock:
+            book = self._books.get(asset_id)
+            return book is not None and self._is_live(book)
+
+    def get_book(self, asset_id: str) -> LocalOrderBook:
+        """Current book for an asset: a copy of the streamed book if live, else a REST snapshot"""
+        with self._lock:
+            book = self._books.get(asset_id)
+            if book is not None and self._is_live(book):
+                self.stream_hits += 1
+                return book.copy()
+
+        self.watch([asset_id])
+        self.rest_fallbacks += 1
+        return LocalOrderBook.from_summary(asset_id, self.clob_client.get_order_book(asset_id))
+
+    def get_last_trade_price(self, asset_id: str) -> Optional[float]:
+        """Last trade price seen on the channel, if the asset is being streamed"""
+        with self._lock:
+            book = self._books.get(asset_id)
+            if book is not None and self._is_live(book):
+                return self._last_trade_prices.get(asset_id)
+        return None
+
+    def _handle_message(self, message: Dict[str, Any]):
+        event_type = message.get('event_type')
+        with self._lock:
+            if event_type == 'book':
+                book = self._books.setdefault(message['asset_id'], LocalOrderBook(message['asset_id']))
+                book.apply_snapshot(
+                    [(level['price'], level['size']) for level in message.get('bids') or message.get('buys') or []],
+                    [(level['price'], level['size']) for level in message.get('asks') or message.get('sells') or []],
+                    message.get('hash')
+                )
+                book.generation = self.feed.reconnects
+                if self.recorder:
+                    self.recorder.record_book(book, force=True)
+
+            elif event_type == 'price_change':
+                # Newer messages carry per-asset changes; older ones one asset with `changes`
+                changes = message.get('price_changes') or [
+                    dict(change, asset_id=message.get('asset_id')) for change in message.get('changes', [])
+                ]
+                for change in changes:
+                    book = self._books.get(change.get('asset_id'))
+                    if book is None:
+                        continue  # no snapshot yet; deltas alone cannot build a book
+                    book.apply_change(change['side'], change['price'], change['size'], change.get('hash'))
+                    if self.recorder:
+                        self.recorder.record_book(book)
+
+            elif event_type == 'last_trade_price':
+                self._last_trade_prices[message['asset_id']] = float(message['price'])
+                if self.recorder:
+                    self.recorder.record_price(message['asset_id'], float(message['price']))
+
+            elif event_type == 'tick_size_change':
+                print(f"{Fore.CYAN}📏 Tick size for {message.get('asset_id', '')[:12]}... "
+                      f"changed to {message.get('new_tick_size')}{Style.RESET_ALL}")
+        
+        # Outside the lock, so listeners can take their own
+        if event_type == 'last_trade_price' and self.on_price:
+            self.on_price(message['asset_id'], float(message['price']))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            live = sum(1 for book in self._books.values() if self._is_live(book))
+        return {
+            'watched': len(self._assets),
+            'live_books': live,
+            'stream_hits': self.stream_hits,
+            'rest_fallbacks': self.rest_fallbacks
+        }
@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple, Union
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import MarketOrderArgs, OrderArgs, OrderType, RequestArgs
+from py_clob_client.headers.headers import create_level_2_headers
+from py_clob_client.http_helpers.helpers import post
+from py_clob_client.utilities import order_to_json
+from config.env import Config
+from colorama import Fore, Style
+
+POST_ORDERS = "/orders"
+
+class OrderSubmitter:
+    """Pipelined signing and batched posting of CLOB orders.
+
+    Orders are signed on a small worker pool while earlier orders are still
+    in flight. Whenever one of `max_in_flight` request slots is free, the
+    poster takes every signed order that is ready (up to `max_batch`, the
+    CLOB's batch limit) and sends them in one `POST /orders` request, or
+    through `post_order` when only one is ready. Under load orders queue up
+    behind busy slots, so batches grow exactly when round-trips are scarce.
+    Each caller gets a Future resolving to its own order's response, so
+    outcomes still map back to the activity that produced them.
+    """
+
+    def __init__(self, clob_client: ClobClient, max_batch: int = Config.ORDER_BATCH_SIZE,
+                 signers: int = Config.ORDER_SIGNERS, linger: float = Config.ORDER_BATCH_LINGER,
+                 max_in_flight: int = Config.ORDER_MAX_IN_FLIGHT):
+        self.clob_client = clob_client
+        self.max_batch = max_batch
+        self.linger = linger
+        self.running = False
+        self.orders_posted = 0
+        self.requests_sent = 0
+        self._signers = ThreadPoolExecutor(max_workers=signers, thread_name_prefix='signer')
+        self._posters = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='poster')
+        self._slots = threading.Semaphore(max_in_flight)
+        self._ready: 'queue.Queue[Tuple[Any, OrderType, Future]]' = queue.Queue()
+
+    def start(self):
+        """Start the poster thread"""
+        self.running = True
+        poster_thread = threading.Thread(target=self._post_loop, daemon=True)
+        poster_thread.start()
+
+    def stop(self):
+        self.running = False
+        self._signers.shutdown(wait=False)
+        self._posters.shutdown(wait=False)
+
+    def submit(self, order_args: Union[OrderArgs, MarketOrderArgs],
+               order_type: OrderType = OrderType.FOK) -> Future:
+        """Sign and post an order in the background; the Future holds the post response"""
+        result: Future = Future()
+        self._signers.submit(self._sign, order_args, order_type, result)
+        return result
+
+    def _sign(self, order_args: Union[OrderArgs, MarketOrderArgs], order_type: OrderType, result: Future):
+        try:
+            if isinstance(order_args, MarketOrderArgs):
+                signed_order = self.clob_client.create_market_order(order_args)
+            else:
+                signed_order = self.clob_client.create_order(order_args)
+        except Exception as e:
+            if not result.cancelled():
+                result.set_exception(e)
+            return
+        self._ready.put((signed_order, order_type, result))
+
+    def _next_batch(self) -> List[Tuple[Any, OrderType, Future]]:
+        try:
+            batch = [self._ready.get(timeout=1.0)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                batch.append(self._ready.get(timeout=remaining) if remaining > 0 else self._ready.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _post_loop(self):
+        while self.running:
+            # Only collect a batch once a request slot is free, so waiting orders accumulate
+            self._slots.acquire()
+            # Orders whose caller gave up are dropped before they reach the CLOB
+            batch = [item for item in self._next_batch() if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                self._slots.release()
+                continue
+            self._posters.submit(self._post_batch, batch)
+
+    def _post_batch(self, batch: List[Tuple[Any, OrderType, Future]]):
+        try:
+            responses = self._post(batch)
+        except Exception as e:
+            print(f"{Fore.RED}❌ Error posting {len(batch)} orders: {e}{Style.RESET_ALL}")
+            for _, _, result in batch:
+                result.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+
+        for (_, _, result), response in zip(batch, responses):
+            result.set_result(response)
+
+    def _post(self, batch: List[Tuple[Any, OrderType, Future]]) -> List[Dict[str, Any]]:
+        self.requests_sent += 1
+        self.orders_posted += len(batch)
+
+        if len(batch) == 1:
+            signed_order, order_type, _ = batch[0]
+            return [self.clob_client.post_order(signed_order, order_type)]
+
+        self.clob_client.assert_level_2_auth()
+        body = [
+            order_to_json(signed_order, self.clob_client.creds.api_key, order_type)
+            for signed_order, order_type, _ in batch
+        ]
+        headers = create_level_2_headers(
+            self.clob_client.signer,
+            self.clob_client.creds,
+            RequestArgs(method="POST", request_path=POST_ORDERS, body=body),
+        )
+        responses = post(f"{self.clob_client.host}{POST_ORDERS}", headers=headers, data=body)
+
+        # Responses come back in request order, one per order
+        if not isinstance(responses, list) or len(responses) != len(batch):
+            raise ValueError(f"unexpected batch response: {responses}")
+        return responses
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'orders_posted': self.orders_posted,
+            'requests_sent': self.requests_sent,
+            'orders_per_request': self.orders_posted / self.requests_sent if self.requests_sent else 0.0
+        }
@@ -0,0 +1,71 @@
+import random
+import time
+from collections import deque
+from typing import Callable, Optional
+from config.env import Config
+
+class AdaptivePollScheduler:
+    """Polling cadence for one leader, driven by how active the leader is.
+
+    The interval drops to `min_interval` right after a trade is detected and
+    decays by `decay` per quiet poll up to `max_interval`. Errors back off
+    exponentially with jitter, and HTTP 429 honours Retry-After when given.
+    The clock and RNG are injectable so recorded timelines can be replayed.
+    """
+
+    def __init__(self, min_interval: float = Config.MIN_FETCH_INTERVAL,
+                 max_interval: float = Config.MAX_FETCH_INTERVAL,
+                 initial_interval: float = Config.FETCH_INTERVAL,
+                 decay: float = 1.5, max_backoff: float = Config.MAX_ERROR_BACKOFF,
+                 rate_window: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 rng: Optional[random.Random] = None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.decay = decay
+        self.max_backoff = max_backoff
+        self.rate_window = rate_window
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.interval = min(max(initial_interval, min_interval), max_interval)
+        self.consecutive_errors = 0
+        self._request_times = deque()
+
+    def _record_request(self):
+        now = self.clock()
+        self._request_times.append(now)
+        while self._request_times and now - self._request_times[0] > self.rate_window:
+            self._request_times.popleft()
+
+    def record_poll(self, new_trades: int) -> float:
+        """Record a successful poll and return the delay before the next one"""
+        self._record_request()
+        self.consecutive_errors = 0
+        if new_trades:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.decay, self.max_interval)
+        return self.interval
+
+    def record_error(self, rate_limited: bool = False, retry_after: Optional[float] = None) -> float:
+        """Record a failed poll and return the backoff delay before retrying"""
+        self._record_request()
+        self.consecutive_errors += 1
+
+        backoff = min(self.max_backoff, self.interval * (2 ** self.consecutive_errors))
+        # Equal jitter: keep at least half the backoff so retries stay spread out
+        delay = backoff / 2 + self.rng.uniform(0, backoff / 2)
+        if rate_limited and retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    @property
+    def current_interval(self) -> float:
+        return self.interval
+
+    def request_rate(self) -> float:
+        """Requests per second over the rolling window"""
+        now = self.clock()
+        while self._request_times and now - self._request_times[0] > self.rate_window:
+            self._request_times.popleft()
+        return len(self._request_times) / self.rate_window
@@ -0,0 +1,193 @@
+import threading
+import time
+from typing import List, Dict, Optional
+from config.env import Config
+from services.data_fetcher import DataFetcher
+from storage.local_storage import LocalStorage
+from models.user_activity import UserActivity, UserPosition
+from utils.position_table import PositionTable
+from colorama import Fore, Style
+
+class PositionBook:
+    """In-memory positions for tracked wallets, indexed by asset and condition_id.
+
+    Positions are refreshed from the data API in the background every `ttl`
+    seconds and persisted through storage, so the book is warm on restart.
+    Our own fills are applied immediately so the next trade sees them
+    without waiting for the API to catch up. Every change, including
+    streamed prices through `mark_price`, is mirrored into a PositionTable
+    that the portfolio summary and risk checks read.
+    """
+
+    def __init__(self, data_fetcher: DataFetcher, storage: LocalStorage,
+                 wallet_addresses: List[str], ttl: float = Config.POSITION_TTL):
+        self.data_fetcher = data_fetcher
+        self.storage = storage
+        self.wallet_addresses = list(wallet_addresses)
+        self.ttl = ttl
+        self.running = False
+        self._lock = threading.RLock()
+        self._by_asset: Dict[str, Dict[str, UserPosition]] = {}
+        self._by_condition: Dict[str, Dict[str, List[str]]] = {}
+        self._refreshed_at: Dict[str, float] = {}
+        self.table = PositionTable()
+
+        # Warm start from the last persisted snapshot; it is refreshed on first use
+        for wallet in self.wallet_addresses:
+            self._index(wallet, self.storage.load_positions(wallet))
+            self._refreshed_at[wallet] = 0.0
+
+    def start(self):
+        """Start background refreshes in a separate thread"""
+        self.running = True
+        refresh_thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        refresh_thread.start()
+
+    def stop(self):
+        """Stop background refreshes and persist the current book"""
+        self.running = False
+        with self._lock:
+            for wallet in self.wallet_addresses:
+                self.storage.save_positions(wallet, list(self._by_asset.get(wallet, {}).values()))
+
+    def _refresh_loop(self):
+        while self.running:
+            for wallet in list(self.wallet_addresses):
+                if self._is_stale(wallet):
+                    self.refresh(wallet)
+            time.sleep(1)
+
+    def _is_stale(self, wallet_address: str, ttl: Optional[float] = None) -> bool:
+        age = time.monotonic() - self._refreshed_at.get(wallet_address, 0.0)
+        return age >= (ttl if ttl is not None else self.ttl)
+
+    def track(self, wallet_address: str):
+        """Add a wallet to the book; it is loaded on the next refresh"""
+        with self._lock:
+            if wallet_address not in self.wallet_addresses:
+                self.wallet_addresses.append(wallet_address)
+                self._index(wallet_address, self.storage.load_positions(wallet_address))
+                self._refreshed_at[wallet_address] = 0.0
+
+    def refresh(self, wallet_address: str) -> bool:
+        """Reload a wallet's positions from the API and persist them"""
+        try:
+            positions = self.data_fetcher.fetch_user_positions(wallet_address, raise_errors=True)
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Keeping cached positions for {wallet_address}: {e}{Style.RESET_ALL}")
+            return False
+
+        with self._lock:
+            self._index(wallet_address, positions)
+            self._refreshed_at[wallet_address] = time.monotonic()
+        self.storage.save_positions(wallet_address, positions)
+        return True
+
+    def _index(self, wallet_address: str, positions: List[UserPosition]):
+        by_asset = {}
+        by_condition: Dict[str, List[str]] = {}
+        for position in positions:
+            by_asset[position.asset] = position
+            by_condition.setdefault(position.condition_id, []).append(position.asset)
+        self._by_asset[wallet_address] = by_asset
+        self._by_condition[wallet_address] = by_condition
+        self.table.replace_wallet(wallet_address, by_asset.values())
+
+    def get_position(self, wallet_address: str, asset: Optional[str] = None,
+                     condition_id: Optional[str] = None, refresh: bool = True) -> Optional[UserPosition]:
+        """Look up a position by asset, falling back to the first one in condition_id"""
+        # If the background refresh is not running or lagging badly, refresh inline
+        if refresh and self._is_stale(wallet_address, self.ttl * 2):
+            self.refresh(wallet_address)
+
+        with self._lock:
+            by_asset = self._by_asset.get(wallet_address, {})
+            if asset and asset in by_asset:
+                return by_asset[asset]
+            if condition_id:
+                assets = self._by_condition.get(wallet_address, {}).get(condition_id)
+                if assets:
+                    return by_asset.get(assets[0])
+            return None
+
+    def get_age(self, wallet_address: str) -> float:
+        """Seconds since the wallet's positions were last loaded from the API"""
+        refreshed_at = self._refreshed_at.get(wallet_address, 0.0)
+        return time.monotonic() - refreshed_at if refreshed_at else float('inf')
+
+    def get_positions(self, wallet_address: str) -> List[UserPosition]:
+        with self._lock:
+            return list(self._by_asset.get(wallet_address, {}).values())
+
+    def mark_price(self, asset: str, price: float):
+        """Revalue every tracked wallet's position in an asset, e.g. from a streamed trade price"""
+        with self._lock:
+            for by_asset in self._by_asset.values():
+                position = by_asset.get(asset)
+                if position is not None:
+                    position.cur_price = price
+                    position.current_value = position.size * price
+                    position.cash_pnl = position.current_value - position.initial_value
+                    position.percent_pnl = (position.cash_pnl / position.initial_value * 100) if position.initial_value else 0.0
+            self.table.mark_price(asset, price)
+
+    def apply_fill(self, wallet_address: str, trade: UserActivity, side: str, shares: float, price: float):
+        """Apply one of our own fills to the book right away"""
+        if shares <= 0:
+            return
+
+        with self._lock:
+            by_asset = self._by_asset.setdefault(wallet_address, {})
+            position = by_asset.get(trade.asset)
+
+            if side == 'BUY':
+                if position is None:
+                    position = UserPosition(
+                        proxy_wallet=wallet_address,
+                        asset=trade.asset,
+                        condition_id=trade.condition_id,
+                        size=0.0,
+                        avg_price=0.0,
+                        initial_value=0.0,
+                        current_value=0.0,
+                        cash_pnl=0.0,
+                        percent_pnl=0.0,
+                        total_bought=0.0,
+                        realized_pnl=0.0,
+                        cur_price=price,
+                        redeemable=False,
+                        title=trade.title,
+                        outcome=trade.outcome,
+                        outcome_index=trade.outcome_index,
+                        end_date='',
+                        negative_risk=False
+                    )
+                    by_asset[trade.asset] = position
+                    self._by_condition.setdefault(wallet_address, {}).setdefault(trade.condition_id, []).append(trade.asset)
+
+                cost = position.avg_price * position.size + price * shares
+                position.size += shares
+                position.avg_price = cost / position.size
+                position.initial_value = cost
+                position.total_bought += shares
+            else:
+                sold = min(shares, position.size) if position else 0.0
+                if not position or sold <= 0:
+                    return
+                position.realized_pnl += (price - position.avg_price) * sold
+                position.size -= sold
+                position.initial_value = position.avg_price * position.size
+
+                if position.size <= 1e-9:
+                    del by_asset[trade.asset]
+                    assets = self._by_condition.get(wallet_address, {}).get(position.condition_id, [])
+                    if trade.asset in assets:
+                        assets.remove(trade.asset)
+                    self.table.remove(wallet_address, trade.asset)
+                    return
+
+            position.cur_price = price
+            position.current_value = position.size * price
+            position.cash_pnl = position.current_value - position.initial_value
+            position.percent_pnl = (position.cash_pnl / position.initial_value * 100) if position.initial_value else 0.0
+            self.table.upsert(wallet_address, position)
@@ -0,0 +1,578 @@
+"""Backtest the copy strategies against recorded leader activity and books.
+
+Leader trades are replayed in time order through the executor's real buy,
+sell and merge strategies, with orders filled by a simulated CLOB against
+the book recorded (by BookRecorder) at the moment the copy would have been
+placed. `sweep` evaluates thousands of parameter sets at once: the market
+state each copy sees is precomputed and the strategy rules are applied to
+all parameter sets as NumPy arrays, spread over a process pool.
+
+    cd src && python -m services.replay_engine 0xabc... --days 30 --drift 0.05,0.1,0.2 --min-copy 0.1,1,5
+"""
+import argparse
+import contextlib
+import heapq
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from py_clob_client.clob_types import OrderArgs, MarketOrderArgs
+from py_clob_client.order_builder.constants import SELL
+from config.env import Config
+from services.book_recorder import read_book_history
+from services.order_book import LocalOrderBook, OrderBookManager
+from services.position_book import PositionBook
+from services.trade_context import TradeContext
+from services.trade_executor import TradeExecutor
+from models.user_activity import UserActivity
+from colorama import Fore, Style
+
+REPLAY_WALLET = 'replay'
+# Activity types the executor acts on
+REPLAY_TYPES = ('TRADE', 'MERGE')
+# Trade kinds in the precomputed features
+SKIP, BUY_KIND, SELL_KIND, MERGE_KIND = 0, 1, 2, 3
+KINDS = {'skip': SKIP, 'buy': BUY_KIND, 'sell': SELL_KIND, 'merge': MERGE_KIND}
+
+Levels = List[Tuple[float, float]]
+
+@dataclass
+class ReplayParams:
+    """One parameter set for a replay"""
+    max_price_drift: float = Config.MAX_PRICE_DRIFT
+    min_copy_amount: float = Config.MIN_COPY_AMOUNT
+    starting_balance: float = 1000.0  # USDC
+    leader_balance: float = 10000.0  # leader balances are not recorded, so one figure is used throughout
+    copy_delay: float = 2.0  # seconds from the leader's trade to our order
+
+@dataclass
+class ReplayResult:
+    params: ReplayParams
+    fills: int = 0
+    skipped: int = 0  # the strategy decided not to copy
+    failed: int = 0  # an order was attempted (or could not be) and did not fill
+    notional: float = 0.0  # USDC bought plus sold
+    slippage_bps: float = 0.0  # notional-weighted, against the leader's price
+    final_cash: float = 0.0
+    final_equity: float = 0.0  # cash plus holdings at the last known price
+    pnl: float = 0.0
+    synthetic_books: int = 0  # copies priced from a synthetic book because none was recorded
+
+def ask_ladder(asks: Levels) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Ask prices with cumulative notional and shares, best first"""
+    prices = np.array([price for price, _ in asks], dtype=np.float64)
+    sizes = np.array([size for _, size in asks], dtype=np.float64)
+    return prices, np.cumsum(prices * sizes), np.cumsum(sizes)
+
+def fill_market_buy(prices: np.ndarray, notional: np.ndarray, shares: np.ndarray,
+                    amounts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Shares a market buy of each USDC amount gets walking the asks, and whether it filled completely"""
+    # First level whose cumulative notional covers the amount, as in LocalOrderBook.market_buy_price
+    level = np.searchsorted(notional, amounts, side='left')
+    filled = level < len(prices)
+    if not len(prices):
+        return np.zeros(len(amounts)), filled
+    level = np.minimum(level, len(prices) - 1)
+    notional_before = np.where(level > 0, notional[level - 1], 0.0)
+    shares_before = np.where(level > 0, shares[level - 1], 0.0)
+    return shares_before + (amounts - notional_before) / prices[level], filled
+
+def round_cents(values: np.ndarray) -> np.ndarray:
+    """`round(value, 2)` for an array; np.round differs from it on values that print as half cents"""
+    rounded = np.round(values, 2)
+    ties = np.flatnonzero(np.abs(values * 100 % 1 - 0.5) < 1e-6)
+    if len(ties):
+        rounded[ties] = [round(value, 2) for value in values[ties].tolist()]
+    return rounded
+
+class SimulatedClob:
+    """Just enough of the CLOB for the strategies, filled against a recorded book.
+
+    Market buys walk the asks up to their price limit and fill completely or
+    not at all. Sells are fill-or-kill at their limit price and are refused
+    with the exchange's balance error when they exceed our holdings, which
+    exercises the sell strategy's retry path. The engine points `book` at
+    the book recorded for each copy before running its strategy.
+    """
+
+    def __init__(self, cash: float):
+        self.cash = cash
+        self.holdings: Dict[str, float] = {}
+        self.book: Optional[LocalOrderBook] = None
+        self.fills: List[Dict[str, Any]] = []
+
+    def execute(self, order_args: Any) -> Dict[str, Any]:
+        if self.book is None or self.book.asset_id != order_args.token_id:
+            return {'success': False, 'error': 'no book for asset'}
+        if isinstance(order_args, MarketOrderArgs):
+            return self._market_buy(order_args)
+        if isinstance(order_args, OrderArgs) and order_args.side == SELL:
+            return self._limit_sell(order_args)
+        return {'success': False, 'error': f'unsupported order {order_args}'}
+
+    def _market_buy(self, order_args: MarketOrderArgs) -> Dict[str, Any]:
+        amount = order_args.amount
+        if amount > self.cash:
+            return {'success': False, 'error': 'not enough balance / allowance'}
+        asks = self.book.asks.levels()
+        if order_args.price:
+            asks = [(price, size) for price, size in asks if price <= order_args.price]
+        shares, filled = fill_market_buy(*ask_ladder(asks), np.array([amount]))
+        if not filled[0]:
+            return {'success': False, 'error': 'no match'}
+        shares = float(shares[0])
+        self.cash -= amount
+        self.holdings[order_args.token_id] = self.holdings.get(order_args.token_id, 0.0) + shares
+        self.fills.append({'side': 'BUY', 'shares': shares, 'notional': amount})
+        return {'success': True, 'makingAmount': amount, 'takingAmount': shares}
+
+    def _limit_sell(self, order_args: OrderArgs) -> Dict[str, Any]:
+        size, asset = order_args.size, order_args.token_id
+        if size <= 0:
+            return {'success': False, 'error': 'invalid order size'}
+        if size > self.holdings.get(asset, 0.0):
+            return {'success': False, 'error': 'not enough balance / allowance'}
+        bids = [(price, level_size) for price, level_size in self.book.bids.levels() if price >= order_args.price]
+        if sum(level_size for _, level_size in bids) < size:
+            return {'success': False, 'error': 'FOK order could not be fully filled'}
+
+        proceeds, remaining = 0.0, size
+        for price, level_size in bids:
+            take = min(remaining, level_size)
+            proceeds += take * price
+            remaining -= take
+            if remaining <= 0:
+                break
+        self.cash += proceeds
+        self.holdings[asset] -= size
+        if self.holdings[asset] <= 1e-9:
+            del self.holdings[asset]
+        self.fills.append({'side': 'SELL', 'shares': size, 'notional': proceeds})
+        return {'success': True, 'makingAmount': size, 'takingAmount': proceeds}
+
+class ReplayExecutor(TradeExecutor):
+    """TradeExecutor whose orders go to a SimulatedClob, with no threads, network or storage"""
+
+    def __init__(self, clob: SimulatedClob, params: ReplayParams):
+        # Built through the real constructor; its pools start no threads until used
+        # and the book manager has no stream, so nothing runs in the background.
+        # Balances come from the contexts the engine builds, never the balance service
+        super().__init__(clob, storage=None, data_fetcher=None, balance_service=clob,
+                         position_book=PositionBook(None, None, []),
+                         book_manager=OrderBookManager(clob, enable_stream=False), max_workers=1)
+        self.my_wallet = self.context_loader.my_wallet = REPLAY_WALLET
+        self.target_wallets = []
+        self.max_price_drift = params.max_price_drift
+        self.min_copy_amount = params.min_copy_amount
+
+    def _post_order(self, trade: UserActivity, order_args) -> dict:
+        return self.clob_client.execute(order_args)
+
+@dataclass
+class CopyMarket:
+    """Market state a copy of one leader trade would have seen"""
+    bids: Levels
+    asks: Levels
+    last_trade_price: float
+    synthetic: bool
+
+@dataclass
+class ReplayFeatures:
+    """Per-trade market data for one copy delay, independent of the strategy parameters"""
+    kind: np.ndarray  # int8, see KINDS
+    asset: np.ndarray  # int32 code
+    sibling: np.ndarray  # int32 code of the other asset in the market, -1 if none seen
+    usdc_size: np.ndarray
+    price: np.ndarray
+    size: np.ndarray
+    current_price: np.ndarray
+    ladder_offsets: np.ndarray  # asks of trade i are [offsets[i], offsets[i + 1])
+    ask_prices: np.ndarray
+    ask_notional: np.ndarray
+    ask_shares: np.ndarray
+    bid_price: np.ndarray  # NaN without bids
+    bid_size: np.ndarray
+    final_price: np.ndarray  # per asset code
+    synthetic_books: int
+
+class ReplayEngine:
+    """Replay leader activity through the copy strategies against recorded books.
+
+    For each leader trade the engine looks up the latest recorded book and
+    last trade price at trade time plus `copy_delay`. Leader trades count as
+    price prints too, so a replay without recorded books still has prices;
+    the book is then synthesized as `synthetic_depth` shares either side of
+    the last price, `synthetic_spread` apart, and counted in the result.
+
+    `run` is the reference: it drives the real strategies one trade at a
+    time. `sweep` applies the same rules to many parameter sets at once and
+    agrees with `run` up to float rounding. Both copy every trade on its own
+    (no coalescing or retries) with a constant leader balance.
+    """
+
+    def __init__(self, activities: Iterable[UserActivity], book_dir: Optional[str] = Config.BOOK_RECORD_DIR,
+                 synthetic_depth: float = 1000.0, synthetic_spread: float = 0.02):
+        self.trades = sorted((activity for activity in activities if activity.type in REPLAY_TYPES),
+                             key=lambda activity: activity.timestamp)
+        self.book_dir = book_dir
+        self.synthetic_depth = synthetic_depth
+        self.synthetic_spread = synthetic_spread
+        self._markets: Dict[float, Tuple[List[CopyMarket], Dict[str, float]]] = {}
+
+    @classmethod
+    def from_history(cls, wallet_addresses: Iterable[str], storage: Optional[Any] = None,
+                     archive: Optional[Any] = None, start: Optional[int] = None, end: Optional[int] = None,
+                     **kwargs) -> 'ReplayEngine':
+        """Engine over archived and stored activity of the given wallets"""
+        activities: Dict[str, UserActivity] = {}
+        for wallet in wallet_addresses:
+            if archive is not None:
+                activities.update((activity.id, activity) for activity in archive.load_activities(wallet, start, end))
+            if storage is not None:
+                activities.update(
+                    (activity.id, activity) for activity in storage.load_activities(wallet)
+                    if (start is None or activity.timestamp >= start) and (end is None or activity.timestamp <= end)
+                )
+        return cls(activities.values(), **kwargs)
+
+    def _price_prints(self) -> Iterator[Dict[str, Any]]:
+        for trade in self.trades:
+            if trade.type == 'TRADE' and trade.price > 0:
+                yield {'timestamp': trade.timestamp, 'asset_id': trade.asset, 'price': trade.price}
+
+    def _synthetic_book(self, price: float) -> Tuple[Levels, Levels]:
+        half = self.synthetic_spread / 2
+        bid, ask = round(max(price - half, 0.001), 3), round(min(price + half, 0.999), 3)
+        return [(bid, self.synthetic_depth)], [(ask, self.synthetic_depth)]
+
+    def markets(self, copy_delay: float) -> Tuple[List[CopyMarket], Dict[str, float]]:
+        """Market state at each copy, and the last known price of every asset"""
+        if copy_delay in self._markets:
+            return self._markets[copy_delay]
+
+        assets = {trade.asset for trade in self.trades}
+        recorded: Iterable[Dict[str, Any]] = ()
+        if self.book_dir and self.trades:
+            recorded = (
+                # From a day early, so quiet books recorded before the first trade are known
+                record for record in read_book_history(self.book_dir, self.trades[0].timestamp - 86400)
+                if record['asset_id'] in assets
+            )
+        # Recorded books and prices merged with the leaders' own fills, in time order
+        events = heapq.merge(recorded, self._price_prints(), key=lambda record: record['timestamp'])
+
+        books: Dict[str, Tuple[Levels, Levels]] = {}
+        prices: Dict[str, float] = {}
+
+        def apply(record: Dict[str, Any]):
+            if 'price' in record:
+                prices[record['asset_id']] = float(record['price'])
+            else:
+                books[record['asset_id']] = (
+                    [(float(price), float(size)) for price, size in record['bids']],
+                    [(float(price), float(size)) for price, size in record['asks']]
+                )
+
+        markets = []
+        pending = next(events, None)
+        for trade in self.trades:
+            copied_at = trade.timestamp + copy_delay
+            while pending is not None and pending['timestamp'] <= copied_at:
+                apply(pending)
+                pending = next(events, None)
+            price = prices.get(trade.asset, trade.price)
+            if trade.asset in books:
+                markets.append(CopyMarket(*books[trade.asset], price, False))
+            else:
+                markets.append(CopyMarket(*self._synthetic_book(price), price, True))
+        while pending is not None:
+            apply(pending)
+            pending = next(events, None)
+
+        # Without a price print, value what is left at the last book's mid
+        for asset, (bids, asks) in books.items():
+            if asset not in prices and bids and asks:
+                prices[asset] = (bids[0][0] + asks[0][0]) / 2
+
+        self._markets[copy_delay] = (markets, prices)
+        return markets, prices
+
+    def run(self, params: ReplayParams = ReplayParams()) -> ReplayResult:
+        """Replay every trade through the executor's strategies"""
+        markets, final_prices = self.markets(params.copy_delay)
+        clob = SimulatedClob(params.starting_balance)
+        executor = ReplayExecutor(clob, params)
+        result = ReplayResult(params)
+        slippage = 0.0
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for trade, market in zip(self.trades, markets):
+                strategy = executor._determine_strategy(trade)
+                if strategy == 'skip':
+                    result.skipped += 1
+                    continue
+
+                book = LocalOrderBook(trade.asset)
+                book.apply_snapshot(market.bids, market.asks)
+                clob.book = book
+                context = TradeContext(
+                    my_balance=clob.cash,
+                    target_balance=params.leader_balance,
+                    my_position=executor.position_book.get_position(
+                        REPLAY_WALLET, trade.asset, trade.condition_id, refresh=False),
+                    last_trade_price=market.last_trade_price if strategy == 'buy' else None,
+                    order_book=book
+                )
+                result.synthetic_books += market.synthetic
+
+                fills_before = len(clob.fills)
+                if strategy == 'buy':
+                    success = executor._execute_buy_strategy(trade, context)
+                elif strategy == 'sell':
+                    success = executor._execute_sell_strategy(trade, context)
+                else:
+                    success = executor._execute_merge_strategy(trade, context)
+
+                if len(clob.fills) > fills_before:
+                    result.fills += 1
+                    fill = clob.fills[-1]
+                    average_price = fill['notional'] / fill['shares']
+                    gap = average_price - trade.price if fill['side'] == 'BUY' else trade.price - average_price
+                    slippage += gap / trade.price * 10000 * fill['notional']
+                    result.notional += fill['notional']
+                elif success:
+                    result.skipped += 1
+                else:
+                    result.failed += 1
+
+        result.slippage_bps = slippage / result.notional if result.notional else 0.0
+        result.final_cash = clob.cash
+        result.final_equity = clob.cash + sum(
+            shares * final_prices.get(asset, 0.0) for asset, shares in clob.holdings.items()
+        )
+        result.pnl = result.final_equity - params.starting_balance
+        return result
+
+    def features(self, copy_delay: float) -> ReplayFeatures:
+        """Precompute what every copy sees, for evaluating parameter sets as arrays"""
+        markets, final_prices = self.markets(copy_delay)
+        asset_codes: Dict[str, int] = {}
+        condition_assets: Dict[str, List[int]] = {}
+        for trade in self.trades:
+            if trade.asset not in asset_codes:
+                asset_codes[trade.asset] = len(asset_codes)
+                condition_assets.setdefault(trade.condition_id, []).append(asset_codes[trade.asset])
+
+        # Markets are binary, so a position lookup by condition falls back to the other outcome
+        def sibling(trade: UserActivity) -> int:
+            others = [code for code in condition_assets[trade.condition_id] if code != asset_codes[trade.asset]]
+            return others[0] if others else -1
+
+        ladders = [ask_ladder(market.asks) for market in markets]
+        executor = ReplayExecutor(SimulatedClob(0.0), ReplayParams())
+        kinds = np.array([KINDS[executor._determine_strategy(trade)] for trade in self.trades], dtype=np.int8)
+        return ReplayFeatures(
+            kind=kinds,
+            asset=np.array([asset_codes[trade.asset] for trade in self.trades], dtype=np.int32),
+            sibling=np.array([sibling(trade) for trade in self.trades], dtype=np.int32),
+            usdc_size=np.array([trade.usdc_size for trade in self.trades], dtype=np.float64),
+            price=np.array([trade.price for trade in self.trades], dtype=np.float64),
+            size=np.array([trade.size for trade in self.trades], dtype=np.float64),
+            current_price=np.array([market.last_trade_price for market in markets], dtype=np.float64),
+            ladder_offsets=np.concatenate([[0], np.cumsum([len(ladder[0]) for ladder in ladders])]).astype(np.int64),
+            ask_prices=np.concatenate([ladder[0] for ladder in ladders] or [np.zeros(0)]),
+            ask_notional=np.concatenate([ladder[1] for ladder in ladders] or [np.zeros(0)]),
+            ask_shares=np.concatenate([ladder[2] for ladder in ladders] or [np.zeros(0)]),
+            bid_price=np.array([market.bids[0][0] if market.bids else np.nan for market in markets]),
+            bid_size=np.array([market.bids[0][1] if market.bids else np.nan for market in markets]),
+            final_price=np.array([final_prices.get(asset, 0.0) for asset in asset_codes], dtype=np.float64),
+            synthetic_books=sum(market.synthetic for market, kind in zip(markets, kinds) if kind != SKIP)
+        )
+
+    def sweep(self, grid: Dict[str, Sequence[float]], base: ReplayParams = ReplayParams(),
+              workers: Optional[int] = None, chunk_size: int = 256) -> List[ReplayResult]:
+        """Evaluate every combination of the grid's values (ReplayParams fields), in grid order"""
+        names = [field.name for field in fields(ReplayParams)]
+        unknown = set(grid) - set(names)
+        if unknown:
+            raise ValueError(f"Unknown replay parameters: {', '.join(sorted(unknown))}")
+        combos = [replace(base, **dict(zip(grid, values))) for values in itertools.product(*grid.values())]
+
+        results: List[Optional[ReplayResult]] = [None] * len(combos)
+        for copy_delay in sorted({params.copy_delay for params in combos}):
+            indexes = [i for i, params in enumerate(combos) if params.copy_delay == copy_delay]
+            features = self.features(copy_delay)
+            chunks = [
+                {name: np.array([getattr(combos[i], name) for i in indexes[start:start + chunk_size]])
+                 for name in names}
+                for start in range(0, len(indexes), chunk_size)
+            ]
+            # Each worker receives the features once, then only parameter arrays
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(features,)) as pool:
+                outputs = list(pool.map(_evaluate_chunk, chunks))
+
+            position = 0
+            for output in outputs:
+                for row in range(len(output['fills'])):
+                    i = indexes[position]
+                    results[i] = ReplayResult(
+                        combos[i],
+                        **{key: values[row].item() for key, values in output.items()},
+                        synthetic_books=features.synthetic_books
+                    )
+                    position += 1
+        return results
+
+def evaluate(features: ReplayFeatures, params: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Apply the buy, sell and merge rules to every parameter set at once.
+
+    Mirrors TradeExecutor's strategies and SimulatedClob's fills line for
+    line; `params` holds one array per ReplayParams field. Positions are an
+    (assets x parameter sets) matrix so each trade touches one row.
+    """
+    drift, min_copy = params['max_price_drift'], params['min_copy_amount']
+    leader_balance = params['leader_balance']
+    count = len(drift)
+    cash = params['starting_balance'].astype(np.float64).copy()
+    positions = np.zeros((len(features.final_price), count))
+    fills = np.zeros(count, dtype=np.int64)
+    failed = np.zeros(count, dtype=np.int64)
+    notional = np.zeros(count)
+    slippage = np.zeros(count)
+    no_position = np.zeros(count)
+
+    for t in range(len(features.kind)):
+        kind = features.kind[t]
+        if kind == SKIP:
+            continue
+        asset = features.asset[t]
+        price = features.price[t]
+
+        if kind == BUY_KIND:
+            attempt = cash >= 1.0
+            copy_amount = features.usdc_size[t] * np.minimum(cash / (leader_balance + features.usdc_size[t]), 1.0)
+            attempt &= ~(copy_amount < min_copy)
+            if price == 0:
+                failed += attempt  # the drift check divides by the leader's price
+                continue
+            attempt &= ~(abs(features.current_price[t] - price) / price > drift)
+            if not attempt.any():
+                continue
+            start, end = features.ladder_offsets[t], features.ladder_offsets[t + 1]
+            shares, complete = fill_market_buy(features.ask_prices[start:end], features.ask_notional[start:end],
+                                               features.ask_shares[start:end], copy_amount)
+            done = attempt & complete
+            failed += attempt & ~complete
+            cash[done] -= copy_amount[done]
+            positions[asset, done] += shares[done]
+            fills += done
+            notional[done] += copy_amount[done]
+            slippage[done] += ((copy_amount[done] / shares[done] - price) / price * 10000) * copy_amount[done]
+            continue
+
+        # Sells and merges: our position, or the other outcome's when we hold none in this asset
+        held = positions[asset]
+        other = positions[features.sibling[t]] if features.sibling[t] >= 0 else no_position
+        has_position = (held > 0) | (other > 0)
+        my_size = np.where(held > 0, held, other)
+        bid_price, bid_size = features.bid_price[t], features.bid_size[t]
+
+        if kind == SELL_KIND:
+            sell_amount = np.minimum(features.size[t], my_size) * 0.999
+            attempt = has_position & ~(sell_amount < 0.01)
+            size = round_cents(sell_amount)
+        else:
+            attempt = has_position
+            size = round_cents(my_size * 0.999)
+        if np.isnan(bid_price):
+            failed += attempt
+            continue
+
+        done = attempt & (size > 0) & (held >= size) & (bid_size >= size)
+        if kind == SELL_KIND:
+            # A balance error is retried once at 95%
+            retry = attempt & (size > 0) & (held < size)
+            retry_size = round_cents(size * 0.95)
+            retried = retry & (retry_size > 0) & (held >= retry_size) & (bid_size >= retry_size)
+            size = np.where(retried, retry_size, size)
+            done |= retried
+        failed += attempt & ~done
+
+        proceeds = size[done] * bid_price
+        cash[done] += proceeds
+        remaining = held[done] - size[done]
+        positions[asset, done] = np.where(remaining <= 1e-9, 0.0, remaining)
+        fills += done
+        notional[done] += proceeds
+        slippage[done] += ((price - proceeds / size[done]) / price * 10000) * proceeds
+
+    trades = int((features.kind != SKIP).sum())
+    equity = cash + features.final_price @ positions
+    return {
+        'fills': fills,
+        'skipped': trades - fills - failed,
+        'failed': failed,
+        'notional': notional,
+        'slippage_bps': np.divide(slippage, notional, out=np.zeros(count), where=notional > 0),
+        'final_cash': cash,
+        'final_equity': equity,
+        'pnl': equity - params['starting_balance'],
+    }
+
+_worker_features: Optional[ReplayFeatures] = None
+
+def _init_worker(features: ReplayFeatures):
+    global _worker_features
+    _worker_features = features
+
+def _evaluate_chunk(params: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return evaluate(_worker_features, params)
+
+def print_results(results: List[ReplayResult], top: int = 10):
+    """Print the best parameter sets by PnL"""
+    ranked = sorted(results, key=lambda result: result.pnl, reverse=True)[:top]
+    print(f"{Fore.BLUE}🧪 Top {len(ranked)} of {len(results)} parameter sets{Style.RESET_ALL}")
+    for result in ranked:
+        params = result.params
+        pnl_color = Fore.GREEN if result.pnl >= 0 else Fore.RED
+        print(f"  drift {params.max_price_drift:.3f} | min ${params.min_copy_amount:.2f} | "
+              f"delay {params.copy_delay:.0f}s | {pnl_color}${result.pnl:.2f}{Style.RESET_ALL} | "
+              f"{result.fills} fills, {result.skipped} skipped, {result.failed} failed | "
+              f"slippage {result.slippage_bps:.0f}bps")
+
+def _floats(value: str) -> List[float]:
+    return [float(part) for part in value.split(',') if part]
+
+def main():
+    from storage.activity_archive import ActivityArchive
+    from storage.factory import create_storage
+
+    parser = argparse.ArgumentParser(description="Backtest copy parameters against recorded history")
+    parser.add_argument('wallets', nargs='*', default=Config.USER_ADDRESSES, help="Leader wallets to replay")
+    parser.add_argument('--days', type=float, default=30, help="How far back to replay")
+    parser.add_argument('--drift', type=_floats, default=[Config.MAX_PRICE_DRIFT], help="Comma-separated values")
+    parser.add_argument('--min-copy', type=_floats, default=[Config.MIN_COPY_AMOUNT], help="Comma-separated values")
+    parser.add_argument('--delay', type=_floats, default=[2.0], help="Comma-separated copy delays in seconds")
+    parser.add_argument('--balance', type=float, default=1000.0, help="Starting USDC")
+    parser.add_argument('--leader-balance', type=float, default=10000.0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    start = int(time.time() - args.days * 86400)
+    archive = ActivityArchive() if os.path.isdir(Config.ARCHIVE_DIR) else None
+    engine = ReplayEngine.from_history(args.wallets, create_storage(), archive, start=start)
+    print(f"🔁 Replaying {len(engine.trades)} trades from {len(args.wallets)} wallets")
+
+    base = ReplayParams(starting_balance=args.balance, leader_balance=args.leader_balance)
+    started = time.perf_counter()
+    results = engine.sweep({'max_price_drift': args.drift, 'min_copy_amount': args.min_copy,
+                            'copy_delay': args.delay}, base, workers=args.workers)
+    print(f"⏱️ Evaluated {len(results)} parameter sets in {time.perf_counter() - started:.1f}s")
+    print_results(results, args.top)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+from models.user_activity import UserActivity
+
+NETTABLE_SIDES = ('BUY', 'SELL')
+
+@dataclass
+class CoalescedTrade:
+    """One order's worth of work standing in for one or more leader activities"""
+    wallet_address: str
+    trade: Optional[UserActivity]  # None when buys and sells cancelled out
+    members: List[UserActivity] = field(default_factory=list)
+
+def _is_nettable(activity: UserActivity) -> bool:
+    return activity.type == 'TRADE' and activity.side in NETTABLE_SIDES
+
+def _net(wallet_address: str, members: List[UserActivity]) -> CoalescedTrade:
+    """Collapse a run of BUY/SELL fills on one asset into a single net trade"""
+    if len(members) == 1:
+        return CoalescedTrade(wallet_address, members[0], members)
+
+    buys = [m for m in members if m.side == 'BUY']
+    sells = [m for m in members if m.side == 'SELL']
+    net_shares = sum(m.size for m in buys) - sum(m.size for m in sells)
+    if abs(net_shares) < 1e-9:
+        return CoalescedTrade(wallet_address, None, members)
+
+    # Price the net exposure at the volume-weighted price of the dominant side
+    side, legs = ('BUY', buys) if net_shares > 0 else ('SELL', sells)
+    leg_shares = sum(m.size for m in legs)
+    price = sum(m.usdc_size for m in legs) / leg_shares if leg_shares else legs[-1].price
+    shares = abs(net_shares)
+
+    # Keep the latest fill's id and metadata so logs and fills point at a real activity
+    trade = replace(members[-1], side=side, size=shares, usdc_size=shares * price, price=price)
+    return CoalescedTrade(wallet_address, trade, members)
+
+def coalesce_trades(batch: List[Tuple[str, UserActivity]]) -> List[CoalescedTrade]:
+    """Net consecutive BUY/SELL fills per leader and asset, preserving per-asset order.
+
+    Other activity types (e.g. MERGE) pass through unchanged and end the runs
+    for every asset of their market, so nothing is netted across them.
+    """
+    results: List[Optional[CoalescedTrade]] = []
+    open_runs: Dict[Tuple[str, str], Tuple[int, List[UserActivity]]] = {}
+
+    def close(key: Tuple[str, str]):
+        slot, members = open_runs.pop(key)
+        results[slot] = _net(key[0], members)
+
+    for wallet_address, activity in batch:
+        key = (wallet_address, activity.asset or activity.condition_id)
+        if not _is_nettable(activity):
+            for open_key, (_, members) in list(open_runs.items()):
+                if open_key[0] == wallet_address and members[0].condition_id == activity.condition_id:
+                    close(open_key)
+            results.append(CoalescedTrade(wallet_address, activity, [activity]))
+            continue
+
+        if key not in open_runs:
+            # Reserve the slot of the run's first fill so lanes see assets in arrival order
+            open_runs[key] = (len(results), [])
+            results.append(None)
+        open_runs[key][1].append(activity)
+
+    for key in list(open_runs):
+        close(key)
+    return results
@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from py_clob_client.client import ClobClient
+from config.env import Config
+from services.balance_service import BalanceService
+from services.market_data import MarketDataService
+from services.order_book import LocalOrderBook
+from services.position_book import PositionBook
+from models.user_activity import UserActivity, UserPosition
+from colorama import Fore, Style
+
+@dataclass
+class TradeContext:
+    """Everything the executor reads before deciding how to copy one trade"""
+    my_balance: float = 0.0
+    target_balance: float = 0.0
+    my_position: Optional[UserPosition] = None
+    target_position: Optional[UserPosition] = None
+    last_trade_price: Optional[float] = None  # buys only
+    order_book: Optional[LocalOrderBook] = None
+    timings: Dict[str, float] = field(default_factory=dict)  # seconds per read
+    stale: List[str] = field(default_factory=list)  # reads served from cache after the deadline
+
+    def describe_timings(self) -> str:
+        parts = [
+            f"{name} {seconds * 1000:.0f}ms" + (" (stale)" if name in self.stale else "")
+            for name, seconds in self.timings.items()
+        ]
+        return " | ".join(parts)
+
+class TradeContextLoader:
+    """Fetch balances, positions and market data for a trade concurrently.
+
+    All reads are started at once and joined with a shared deadline, so the
+    decision waits roughly as long as the slowest read. Reads that miss the
+    deadline or raise follow a fixed policy:
+
+    - balances and positions fall back to their cached values if those were
+      fetched within `max_staleness` seconds; otherwise the trade is not
+      executed now and is retried later
+    - market data is left empty and the strategy uses its existing fallback
+      (the leader's fill price, or a retry for merges)
+    """
+
+    def __init__(self, clob_client: ClobClient, balance_service: BalanceService,
+                 position_book: PositionBook, my_wallet: str,
+                 market_data: Optional[MarketDataService] = None,
+                 deadline: float = Config.CONTEXT_DEADLINE,
+                 max_staleness: float = Config.CONTEXT_MAX_STALENESS,
+                 max_workers: int = Config.EXECUTION_CONCURRENCY * 4):
+        self.clob_client = clob_client
+        self.balance_service = balance_service
+        self.position_book = position_book
+        self.market_data = market_data or MarketDataService(clob_client)
+        self.my_wallet = my_wallet
+        self.deadline = deadline
+        self.max_staleness = max_staleness
+        # Reads that miss the deadline keep running here and warm the caches for the next trade
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='context')
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+    def _timed(self, timings: Dict[str, float], name: str, read: Callable[[], Any]) -> Future:
+        def run():
+            started = time.perf_counter()
+            try:
+                return read()
+            finally:
+                timings[name] = time.perf_counter() - started
+        return self._pool.submit(run)
+
+    def load(self, trade: UserActivity, target_wallet: str, strategy: str) -> Optional[TradeContext]:
+        """Read the trade's context in parallel; returns None if it is too stale to act on"""
+        context = TradeContext()
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        futures = {
+            'balances': self._timed(timings, 'balances', lambda: self.balance_service.get_balances(
+                [self.my_wallet, target_wallet])),
+            'my_position': self._timed(timings, 'my_position', lambda: self.position_book.get_position(
+                self.my_wallet, trade.asset, trade.condition_id)),
+            'target_position': self._timed(timings, 'target_position', lambda: self.position_book.get_position(
+                target_wallet, trade.asset, trade.condition_id)),
+        }
+        if strategy == 'buy':
+            futures['last_trade_price'] = self._timed(timings, 'last_trade_price',
+                                                      lambda: self.market_data.get_last_trade_price(trade.asset))
+        if strategy in ('buy', 'sell', 'merge'):
+            futures['order_book'] = self._timed(timings, 'order_book',
+                                                lambda: self.market_data.get_book(trade.asset))
+
+        wait(futures.values(), timeout=self.deadline)
+
+        for name, future in futures.items():
+            if not future.done():
+                context.stale.append(name)
+                timings[name] = self.deadline
+                continue
+            try:
+                self._apply(context, name, future.result(), trade, target_wallet)
+            except Exception as e:
+                # A failed read is no better than a late one; its default would read as "none held"
+                print(f"{Fore.YELLOW}⚠️ Could not read {name}: {e}{Style.RESET_ALL}")
+                context.stale.append(name)
+
+        if not self._apply_stale(context, trade, target_wallet):
+            return None
+
+        context.timings = {name: timings[name] for name in futures if name in timings}
+        context.timings['total'] = time.perf_counter() - started
+        return context
+
+    def _apply(self, context: TradeContext, name: str, value: Any, trade: UserActivity, target_wallet: str):
+        if name == 'balances':
+            context.my_balance = value[self.my_wallet]
+            context.target_balance = value[target_wallet]
+        elif name == 'my_position':
+            context.my_position = value
+        elif name == 'target_position':
+            context.target_position = value
+        elif name == 'last_trade_price':
+            context.last_trade_price = value
+        elif name == 'order_book':
+            context.order_book = value
+
+    def _apply_stale(self, context: TradeContext, trade: UserActivity, target_wallet: str) -> bool:
+        """Fill reads that missed the deadline from cache, or refuse if the cache is too old"""
+        if 'balances' in context.stale:
+            cached = self.balance_service.get_cached_balances([self.my_wallet, target_wallet])
+            if cached is None or cached[1] > self.max_staleness:
+                print(f"{Fore.YELLOW}⚠️ Balances too slow and no recent cache, deferring trade{Style.RESET_ALL}")
+                return False
+            context.my_balance, context.target_balance = cached[0][self.my_wallet], cached[0][target_wallet]
+
+        for name, wallet in (('my_position', self.my_wallet), ('target_position', target_wallet)):
+            if name not in context.stale:
+                continue
+            if self.position_book.get_age(wallet) > self.max_staleness:
+                print(f"{Fore.YELLOW}⚠️ Positions for {wallet} too slow and stale, deferring trade{Style.RESET_ALL}")
+                return False
+            position = self.position_book.get_position(wallet, trade.asset, trade.condition_id, refresh=False)
+            setattr(context, name, position)
+
+        return True
@@ -1,27 +1,86 @@
 import time
 import threading
-from typing import List, Optional, Tuple
+from collections import deque
+from dataclasses import replace
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Deque, Dict, List, Optional, Tuple
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, MarketOrderArgs, OrderType
 from py_clob_client.order_builder.constants import BUY, SELL
 from config.env import Config
+from services.balance_service import BalanceService
 from services.data_fetcher import DataFetcher
+from services.market_data import MarketDataService
+from services.order_book import OrderBookManager
+from services.order_submitter import OrderSubmitter
+from services.position_book import PositionBook
+from services.trade_coalescer import CoalescedTrade, coalesce_trades
+from services.trade_context import TradeContext, TradeContextLoader
+from services.trade_warmup import TradeWarmup
+from services.trade_queue import PendingTradeQueue
 from storage.local_storage import LocalStorage
-from models.user_activity import UserActivity, UserPosition
+from models.user_activity import UserActivity
+from utils.leader_analytics import LeaderAnalytics
+from utils.metrics import ExecutionMetrics
 from colorama import Fore, Style
 
 class TradeExecutor:
-    def __init__(self, clob_client: ClobClient, storage: LocalStorage, data_fetcher: DataFetcher):
+    retry_delay = 2  # seconds before a failed trade is retried
+    max_price_drift = Config.MAX_PRICE_DRIFT  # skip buys whose price moved more than this fraction
+    min_copy_amount = Config.MIN_COPY_AMOUNT  # USDC
+    order_timeout = Config.ORDER_TIMEOUT  # seconds to wait for a posted order's response
+    
+    def __init__(self, clob_client: ClobClient, storage: LocalStorage, data_fetcher: DataFetcher,
+                 trade_queue: Optional[PendingTradeQueue] = None,
+                 balance_service: Optional[BalanceService] = None,
+                 position_book: Optional[PositionBook] = None,
+                 book_manager: Optional[OrderBookManager] = None,
+                 max_workers: int = Config.EXECUTION_CONCURRENCY,
+                 coalesce_window: float = Config.COALESCE_WINDOW,
+                 analytics: Optional[LeaderAnalytics] = None):
         self.clob_client = clob_client
         self.storage = storage
         self.data_fetcher = data_fetcher
-        self.target_wallet = Config.USER_ADDRESS
+        self.balance_service = balance_service or data_fetcher.balance_service
+        self.trade_queue = trade_queue if trade_queue is not None else PendingTradeQueue()
+        self.target_wallets = list(Config.USER_ADDRESSES)
         self.my_wallet = Config.PROXY_WALLET
+        self.position_book = position_book or PositionBook(
+            data_fetcher, storage, [self.my_wallet] + self.target_wallets
+        )
+        self.book_manager = book_manager or OrderBookManager(clob_client, enable_stream=False)
+        self.market_data = MarketDataService(clob_client, self.book_manager)
+        self.order_submitter = OrderSubmitter(clob_client)
+        self.context_loader = TradeContextLoader(
+            clob_client, self.balance_service, self.position_book, self.my_wallet, self.market_data
+        )
+        self.warmup = TradeWarmup(self.market_data, self.context_loader, self._determine_strategy)
         self.running = False
+        self.coalesce_window = coalesce_window
+        self.analytics = analytics  # our fills are matched against leader trades for slippage
+        
+        # Trades on different markets run in parallel; each market is a strictly ordered lane
+        self.max_workers = max_workers
+        self._workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='trade')
+        self._lanes: Dict[str, Deque[CoalescedTrade]] = {}
+        self._lanes_lock = threading.Lock()
+        self.metrics = ExecutionMetrics(queue_depth=lambda: len(self.trade_queue))
         
     def start_executing(self):
         """Start trade execution in a separate thread"""
         self.running = True
+        self.order_submitter.start()
+        
+        # Rebuild the in-memory queue from trades that were never executed
+        for wallet_address in self.target_wallets:
+            pending_trades = self.storage.get_pending_trades(wallet_address)
+            if pending_trades:
+                self.trade_queue.put_many(wallet_address, pending_trades)
+                print(f"{Fore.CYAN}📥 Restored {len(pending_trades)} pending trades for {wallet_address}{Style.RESET_ALL}")
+        
+        # Stream books for everything we may have to sell
+        self.book_manager.watch(position.asset for position in self.position_book.get_positions(self.my_wallet))
+        
         executor_thread = threading.Thread(target=self._execution_loop, daemon=True)
         executor_thread.start()
         print(f"{Fore.GREEN}✅ Trade executor started{Style.RESET_ALL}")
@@ -29,74 +88,183 @@ class TradeExecutor:
     def stop_executing(self):
         """Stop trade execution"""
         self.running = False
+        self._workers.shutdown(wait=False)
+        self.context_loader.shutdown()
+        self.warmup.shutdown()
+        self.order_submitter.stop()
         print(f"{Fore.YELLOW}⏹ Trade executor stopped{Style.RESET_ALL}")
     
     def _execution_loop(self):
-        """Main execution loop"""
+        """Main execution loop, woken as soon as the monitor queues a trade"""
         while self.running:
             try:
-                pending_trades = self.storage.get_pending_trades(self.target_wallet)
+                # Timeout only lets the loop notice stop_executing()
+                pending_trades = self.trade_queue.get_batch(timeout=1.0)
                 
                 if pending_trades:
-                    print(f"{Fore.CYAN}⚡ Processing {len(pending_trades)} pending trades{Style.RESET_ALL}")
+                    pending_trades += self._collect_window()
+                    orders = coalesce_trades(pending_trades)
+                    print(f"{Fore.CYAN}⚡ Processing {len(pending_trades)} pending trades as {len(orders)} orders{Style.RESET_ALL}")
                     
-                    for trade in pending_trades:
-                        try:
-                            success = self._execute_trade(trade)
-                            self.storage.mark_trade_executed(
-                                self.target_wallet, 
-                                trade.id, 
-                                success
-                            )
-                        except Exception as e:
-                            print(f"{Fore.RED}❌ Error executing trade {trade.id}: {e}{Style.RESET_ALL}")
-                            self.storage.mark_trade_executed(
-                                self.target_wallet, 
-                                trade.id, 
-                                False
-                            )
-                
-                time.sleep(2)  # Check every 2 seconds for pending trades
+                    # One bulk request for every price and book the batch needs, unless already warming
+                    self.market_data.prefetch(
+                        order.trade for order in orders
+                        if order.trade and not self.warmup.is_warming(order.wallet_address, order.trade)
+                    )
+                    
+                    for order in orders:
+                        self._dispatch(order)
                 
             except Exception as e:
                 print(f"{Fore.RED}❌ Error in execution loop: {e}{Style.RESET_ALL}")
                 time.sleep(5)
     
-    def _execute_trade(self, trade: UserActivity) -> bool:
-        """Execute a single trade with sophisticated copy logic"""
+    def _collect_window(self) -> List[Tuple[str, UserActivity]]:
+        """Keep gathering trades for the coalescing window so split fills can be netted"""
+        collected = []
+        deadline = time.monotonic() + self.coalesce_window
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            collected += self.trade_queue.get_batch(timeout=remaining)
+        return collected
+    
+    def _dispatch(self, order: CoalescedTrade):
+        """Hand an order to the worker pool, behind any earlier order on the same market"""
+        first = order.members[0]
+        # Keyed by market rather than asset so a MERGE (which has no asset) stays
+        # ordered with buys and sells of the shares it merges
+        lane_key = first.condition_id or first.asset
+        self.book_manager.watch([first.asset])
+        self.metrics.trade_waiting(1)
+        with self._lanes_lock:
+            lane = self._lanes.get(lane_key)
+            if lane is not None:
+                # A worker is already draining this market and will pick it up in order
+                lane.append(order)
+                return
+            self._lanes[lane_key] = deque([order])
+        self._workers.submit(self._drain_lane, lane_key)
+    
+    def _drain_lane(self, lane_key: str):
+        """Run one market's trades one after another until its lane is empty"""
+        while True:
+            with self._lanes_lock:
+                lane = self._lanes[lane_key]
+                if not lane:
+                    del self._lanes[lane_key]
+                    return
+                order = lane.popleft()
+            
+            self.metrics.trade_waiting(-1)
+            self.metrics.trade_started()
+            started = time.perf_counter()
+            success, retries = False, []
+            try:
+                success, retries = self._process_trade(order)
+            except Exception as e:
+                # Storage still lists the trade as pending, so a restart picks it up again
+                print(f"{Fore.RED}❌ Error processing trade {order.members[-1].id}: {e}{Style.RESET_ALL}")
+            finally:
+                wall_time = time.perf_counter() - started
+                self.metrics.trade_finished(wall_time, success)
+            print(f"⏱️ Trade {order.members[-1].id} finished in {wall_time:.2f}s "
+                  f"(queue depth {self.metrics.snapshot()['queue_depth']})")
+            
+            if retries:
+                # Keep the lane held so later orders on this market wait behind the retry
+                self.metrics.trade_waiting(len(retries))
+                timer = threading.Timer(self.retry_delay, self._resume_lane, (lane_key, retries))
+                timer.daemon = True
+                timer.start()
+                return
+    
+    def _resume_lane(self, lane_key: str, retries: List[CoalescedTrade]):
+        """Put retried orders back at the head of their lane and start draining it again"""
+        with self._lanes_lock:
+            self._lanes[lane_key].extendleft(reversed(retries))
+        if self.running:
+            self._workers.submit(self._drain_lane, lane_key)
+    
+    def get_metrics(self) -> Dict[str, float]:
+        """Queue depth, in-flight trades and per-trade wall time percentiles"""
+        return self.metrics.snapshot()
+    
+    def print_latency_report(self):
+        """Print detection-to-post latency histograms"""
+        for name in ('detection_to_start', 'detection_to_post'):
+            print(f"⏱️ {name.replace('_', ' ')}: {self.metrics.format_histogram(name)}")
+        print(f"🔥 Warm-up hits: {self.warmup.hits} | misses: {self.warmup.misses}")
+    
+    def _process_trade(self, order: CoalescedTrade) -> Tuple[bool, List[CoalescedTrade]]:
+        """Execute one order and record the outcome for every activity in it.
+        
+        Returns whether it succeeded and the orders to retry, which the lane
+        runs again before anything queued behind them.
+        """
+        wallet_address = order.wallet_address
+        detected_at = self.warmup.detected_at(order.members[-1].id)
+        if detected_at is not None:
+            self.metrics.record_latency('detection_to_start', time.monotonic() - detected_at)
+        
+        if order.trade is None:
+            print(f"{Fore.CYAN}⚖️ {len(order.members)} trades on {order.members[0].title} netted out, nothing to copy{Style.RESET_ALL}")
+            success = True
+        else:
+            if len(order.members) > 1:
+                print(f"{Fore.CYAN}🧮 Netted {len(order.members)} trades into one {order.trade.side} of {order.trade.size:.2f} shares{Style.RESET_ALL}")
+            try:
+                success = self._execute_trade(order.trade, wallet_address)
+            except Exception as e:
+                print(f"{Fore.RED}❌ Error executing trade {order.trade.id}: {e}{Style.RESET_ALL}")
+                success = False
+        
+        for trade in order.members:
+            self.storage.mark_trade_executed(wallet_address, trade.id, success)
+        
+        retries = []
+        if not success:
+            # Retry the original fills, netted again among themselves
+            for trade in order.members:
+                trade.bot_executed_time += 1
+                if trade.bot_executed_time < Config.RETRY_LIMIT:
+                    retries.append(trade)
+        self.warmup.forget(wallet_address, [trade for trade in order.members if trade not in retries])
+        
+        return success, coalesce_trades([(wallet_address, trade) for trade in retries])
+    
+    def _execute_trade(self, trade: UserActivity, target_wallet: str) -> bool:
+        """Execute a single trade from target_wallet with sophisticated copy logic"""
         try:
             print(f"{Fore.BLUE}🔄 Executing copy trade for {trade.title}...{Style.RESET_ALL}")
             
-            # Get current positions
-            my_positions = self.data_fetcher.fetch_user_positions(self.my_wallet)
-            target_positions = self.data_fetcher.fetch_user_positions(self.target_wallet)
-            
-            # Get current balances
-            my_balance = self.data_fetcher.get_balance(self.my_wallet)
-            target_balance = self.data_fetcher.get_balance(self.target_wallet)
+            # Strategy depends only on the trade, so it decides which market data to read
+            strategy = self._determine_strategy(trade)
             
-            print(f"💰 My balance: ${my_balance:.2f} | Target balance: ${target_balance:.2f}")
-            
-            # Find relevant positions
-            my_position = next(
-                (pos for pos in my_positions if pos.condition_id == trade.condition_id), 
-                None
-            )
-            target_position = next(
-                (pos for pos in target_positions if pos.condition_id == trade.condition_id), 
-                None
-            )
+            # Use the context prepared at detection time, re-checking the price and our position
+            context = self.warmup.take(target_wallet, trade)
+            if context is not None:
+                # Fills since the warm-up (e.g. an earlier trade on this lane) are already in the book
+                context.my_position = self.position_book.get_position(
+                    self.my_wallet, trade.asset, trade.condition_id, refresh=False)
+                self._refresh_price(trade, strategy, context)
+            else:
+                # Balances, positions and market data are read concurrently under one deadline
+                context = self.context_loader.load(trade, target_wallet, strategy)
+                if context is None:
+                    return False
             
-            # Determine trading strategy
-            strategy = self._determine_strategy(trade, my_position, target_position)
+            print(f"💰 My balance: ${context.my_balance:.2f} | Target balance: ${context.target_balance:.2f}")
+            print(f"⏱️ Context for {trade.id}: {context.describe_timings()}")
             
             # Execute based on strategy
             if strategy == 'buy':
-                return self._execute_buy_strategy(trade, my_balance, target_balance)
+                return self._execute_buy_strategy(trade, context)
             elif strategy == 'sell':
-                return self._execute_sell_strategy(trade, my_position, target_position)
+                return self._execute_sell_strategy(trade, context)
             elif strategy == 'merge':
-                return self._execute_merge_strategy(trade, my_position)
+                return self._execute_merge_strategy(trade, context)
             else:
                 print(f"{Fore.YELLOW}⚠️ No strategy determined for trade{Style.RESET_ALL}")
                 return True  # Mark as handled
@@ -105,8 +273,53 @@ class TradeExecutor:
             print(f"{Fore.RED}❌ Error in _execute_trade: {e}{Style.RESET_ALL}")
             return False
     
-    def _determine_strategy(self, trade: UserActivity, my_position: Optional[UserPosition], 
-                          target_position: Optional[UserPosition]) -> str:
+    def _refresh_price(self, trade: UserActivity, strategy: str, context: TradeContext):
+        """Final price check for a warmed trade; only hits the network once the tick cache expired"""
+        started = time.perf_counter()
+        try:
+            if strategy == 'buy':
+                context.last_trade_price = self.market_data.get_last_trade_price(trade.asset)
+            elif strategy in ('sell', 'merge'):
+                context.order_book = self.market_data.get_book(trade.asset)
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Final price check failed, using warm-up data: {e}{Style.RESET_ALL}")
+        context.timings = {'warm': 0.0, 'price_check': time.perf_counter() - started}
+    
+    def _post_order(self, trade: UserActivity, order_args) -> dict:
+        """Sign and post through the pipeline, recording detection-to-post latency"""
+        # Signed in the background and posted together with other ready orders
+        result = self.order_submitter.submit(order_args, OrderType.FOK)
+        try:
+            response = result.result(timeout=self.order_timeout)
+        except (FutureTimeoutError, CancelledError):
+            # Cancelling only succeeds while the order is still unsent
+            sent = not result.cancel()
+            error = f"no response within {self.order_timeout:.0f}s" + (" (order was sent and may still fill)" if sent else "")
+            print(f"{Fore.RED}❌ Order for {trade.id}: {error}{Style.RESET_ALL}")
+            return {'success': False, 'error': error}
+        detected_at = self.warmup.detected_at(trade.id)
+        if detected_at is not None:
+            self.metrics.record_latency('detection_to_post', time.monotonic() - detected_at)
+        return response
+    
+    def _record_fill(self, trade: UserActivity, side: str, shares: float, price: float):
+        """Apply one of our fills to the position book and the copy-slippage analytics"""
+        self.position_book.apply_fill(self.my_wallet, trade, side, shares, price)
+        if self.analytics is not None:
+            self.analytics.ingest_copies([replace(
+                trade, proxy_wallet=self.my_wallet, timestamp=int(time.time()), type='TRADE',
+                side=side, size=shares, usdc_size=shares * price, price=price
+            )])
+    
+    @staticmethod
+    def _filled_amount(response: dict, key: str, default: float) -> float:
+        """Read a filled amount from an order response, falling back to our estimate"""
+        try:
+            return float(response.get(key) or default)
+        except (TypeError, ValueError):
+            return default
+    
+    def _determine_strategy(self, trade: UserActivity) -> str:
         """Determine the appropriate trading strategy"""
         
         if trade.type == 'MERGE':
@@ -119,10 +332,11 @@ class TradeExecutor:
         
         return 'skip'
     
-    def _execute_buy_strategy(self, trade: UserActivity, my_balance: float, 
-                            target_balance: float) -> bool:
+    def _execute_buy_strategy(self, trade: UserActivity, context: TradeContext) -> bool:
         """Execute buy strategy with proportional sizing"""
         try:
+            my_balance, target_balance = context.my_balance, context.target_balance
+
             if my_balance < 1.0:  # Minimum balance check
                 print(f"{Fore.YELLOW}⚠️ Insufficient balance to copy buy trade{Style.RESET_ALL}")
                 return True
@@ -132,35 +346,36 @@ class TradeExecutor:
             copy_amount = trade.usdc_size * balance_ratio
             
             # Minimum copy amount
-            if copy_amount < 0.1:
+            if copy_amount < self.min_copy_amount:
                 print(f"{Fore.YELLOW}⚠️ Copy amount too small: ${copy_amount:.2f}{Style.RESET_ALL}")
                 return True
             
             print(f"📈 Buying ${copy_amount:.2f} worth of {trade.outcome}")
             
-            # Get current market price
-            try:
-                current_price_data = self.clob_client.get_last_trade_price(trade.asset)
-                current_price = float(current_price_data.get('price', trade.price))
-            except:
-                current_price = trade.price
+            # Current market price, or the leader's price if the read failed or was late
+            current_price = context.last_trade_price if context.last_trade_price is not None else trade.price
             
-            # Check if price is reasonable (within 10% of original trade)
-            if abs(current_price - trade.price) / trade.price > 0.1:
+            # Check if price is reasonable (within max_price_drift of original trade)
+            if abs(current_price - trade.price) / trade.price > self.max_price_drift:
                 print(f"{Fore.YELLOW}⚠️ Price moved too much. Original: ${trade.price:.3f}, Current: ${current_price:.3f}{Style.RESET_ALL}")
                 return True
             
+            # Price the market order from the book we already hold so signing needs no book request
+            market_price = context.order_book.market_buy_price(copy_amount) if context.order_book else None
+            
             # Create market buy order
             market_order_args = MarketOrderArgs(
                 token_id=trade.asset,
                 amount=copy_amount,
+                price=market_price or 0
             )
             
-            signed_order = self.clob_client.create_market_order(market_order_args)
-            response = self.clob_client.post_order(signed_order, OrderType.FOK)
+            response = self._post_order(trade, market_order_args)
             
             if response.get('success', False):
                 print(f"{Fore.GREEN}✅ Successfully bought ${copy_amount:.2f} worth{Style.RESET_ALL}")
+                shares = self._filled_amount(response, 'takingAmount', copy_amount / current_price)
+                self._record_fill(trade, 'BUY', shares, current_price)
                 return True
             else:
                 print(f"{Fore.RED}❌ Buy order failed: {response}{Style.RESET_ALL}")
@@ -170,10 +385,11 @@ class TradeExecutor:
             print(f"{Fore.RED}❌ Error in buy strategy: {e}{Style.RESET_ALL}")
             return False
     
-    def _execute_sell_strategy(self, trade: UserActivity, my_position: Optional[UserPosition], 
-                         target_position: Optional[UserPosition]) -> bool:
+    def _execute_sell_strategy(self, trade: UserActivity, context: TradeContext) -> bool:
         """Execute sell strategy using limit orders at market price"""
         try:
+            my_position = context.my_position
+
             # Check if we have a position to sell
             if not my_position or my_position.size <= 0:
                 print(f"{Fore.YELLOW}⚠️ No position to sell for {trade.outcome}{Style.RESET_ALL}")
@@ -198,16 +414,19 @@ class TradeExecutor:
             
             print(f"💰 Attempting to sell {sell_amount:.2f} shares of {trade.outcome}")
             
-            # Get orderbook to find best bid price
+            # Without a book the bid is unknown; fail so the sell is retried with a fresh read
+            orderbook = context.order_book
+            if orderbook is None:
+                print(f"{Fore.YELLOW}⚠️ Order book read failed or missed the deadline, retrying later{Style.RESET_ALL}")
+                return False
+            
+            # Use the prefetched orderbook to find best bid price
             try:
-                orderbook = self.clob_client.get_order_book(trade.asset)
-                
-                if not orderbook.bids or len(orderbook.bids) == 0:
+                # Best bid (highest price someone is willing to pay)
+                best_bid_price = orderbook.best_bid()
+                if best_bid_price is None:
                     print(f"{Fore.RED}❌ No bids available in orderbook{Style.RESET_ALL}")
                     return False
-                
-                # Find best bid (highest price someone is willing to pay)
-                best_bid_price = max(float(bid.price) for bid in orderbook.bids)
                 print(f"💵 Best bid price: ${best_bid_price:.3f}")
                 
             except Exception as e:
@@ -230,14 +449,13 @@ class TradeExecutor:
                 side=SELL
             )
             
-            # Create and sign the order
-            signed_order = self.clob_client.create_order(order_args)
-            
-            # Post as FOK (Fill Or Kill) - executes immediately or fails
-            response = self.clob_client.post_order(signed_order, OrderType.FOK)
+            # Sign and post as FOK (Fill Or Kill) - executes immediately or fails
+            response = self._post_order(trade, order_args)
             
             if response.get('success', False):
                 print(f"{Fore.GREEN}✅ Successfully sold {sell_amount_rounded:.2f} shares at ${best_bid_price:.3f}{Style.RESET_ALL}")
+                shares = self._filled_amount(response, 'makingAmount', sell_amount_rounded)
+                self._record_fill(trade, 'SELL', shares, best_bid_price)
                 return True
             else:
                 error_msg = response.get('error', response)
@@ -255,11 +473,12 @@ class TradeExecutor:
                         side=SELL
                     )
                     
-                    signed_order_retry = self.clob_client.create_order(order_args_retry)
-                    response_retry = self.clob_client.post_order(signed_order_retry, OrderType.FOK)
+                    response_retry = self._post_order(trade, order_args_retry)
                     
                     if response_retry.get('success', False):
                         print(f"{Fore.GREEN}✅ Successfully sold {retry_amount:.2f} shares on retry{Style.RESET_ALL}")
+                        shares = self._filled_amount(response_retry, 'makingAmount', retry_amount)
+                        self._record_fill(trade, 'SELL', shares, best_bid_price)
                         return True
                 
                 return False
@@ -270,42 +489,45 @@ class TradeExecutor:
             traceback.print_exc()
             return False
     
-    def _execute_merge_strategy(self, trade: UserActivity, my_position: Optional[UserPosition]) -> bool:
+    def _execute_merge_strategy(self, trade: UserActivity, context: TradeContext) -> bool:
         """Execute merge strategy (close position at best available price)"""
         try:
+            my_position = context.my_position
+
             if not my_position or my_position.size <= 0:
                 print(f"{Fore.YELLOW}⚠️ No position to merge{Style.RESET_ALL}")
                 return True
             
             print(f"🔄 Merging position: {my_position.size:.2f} shares")
             
-            # Get orderbook to find best price
-            orderbook = self.clob_client.get_order_book(trade.asset)
+            # Use the prefetched orderbook to find best price
+            orderbook = context.order_book
+            best_bid_price = orderbook.best_bid() if orderbook is not None else None
             
-            if not orderbook.bids or len(orderbook.bids) == 0:
+            if best_bid_price is None:
                 print(f"{Fore.RED}❌ No bids available for merge{Style.RESET_ALL}")
                 return False
-            
-            # Find best bid price
-            best_bid_price = max(float(bid.price) for bid in orderbook.bids)
+
             print(f"💰 Best bid price: ${best_bid_price:.3f}")
             
             # Import SELL constant
             from py_clob_client.order_builder.constants import SELL
             
             # Create limit sell order at best bid price
+            merge_size = round(my_position.size * 0.999, 2)  # 99.9% to avoid rounding
             order_args = OrderArgs(
                 token_id=trade.asset,
                 price=best_bid_price,
-                size=round(my_position.size * 0.999, 2),  # 99.9% to avoid rounding
+                size=merge_size,
                 side=SELL
             )
             
-            signed_order = self.clob_client.create_order(order_args)
-            response = self.clob_client.post_order(signed_order, OrderType.FOK)
+            response = self._post_order(trade, order_args)
             
             if response.get('success', False):
                 print(f"{Fore.GREEN}✅ Successfully merged position{Style.RESET_ALL}")
+                shares = self._filled_amount(response, 'makingAmount', merge_size)
+                self._record_fill(trade, 'SELL', shares, best_bid_price)
                 return True
             else:
                 print(f"{Fore.RED}❌ Merge failed: {response}{Style.RESET_ALL}")
@@ -1,9 +1,20 @@
+import asyncio
+import os
 import time
 import threading
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+import requests
 from config.env import Config
 from services.data_fetcher import DataFetcher
+from services.poll_scheduler import AdaptivePollScheduler
+from services.trade_queue import PendingTradeQueue
+from services.trade_stream import TradeStream
+from services.trade_warmup import TradeWarmup
+from services.chain_monitor import ChainFillDetector
 from storage.local_storage import LocalStorage
+from utils.dedup_index import BloomFilter, DedupIndex
+from utils.leader_analytics import LeaderAnalytics
 from models.user_activity import UserActivity
 from colorama import Fore, Style, init
 
@@ -11,73 +22,194 @@ from colorama import Fore, Style, init
 init()
 
 class TradeMonitor:
-    def __init__(self, storage: LocalStorage, data_fetcher: DataFetcher):
+    def __init__(self, storage: LocalStorage, data_fetcher: DataFetcher,
+                 trade_queue: Optional[PendingTradeQueue] = None,
+                 target_wallets: Optional[List[str]] = None,
+                 max_concurrent_polls: int = Config.MAX_CONCURRENT_POLLS,
+                 enable_stream: bool = Config.ENABLE_TRADE_STREAM,
+                 enable_chain_detector: bool = Config.ENABLE_CHAIN_DETECTOR,
+                 warmup: Optional[TradeWarmup] = None,
+                 analytics: Optional[LeaderAnalytics] = None):
         self.storage = storage
         self.data_fetcher = data_fetcher
-        self.target_wallet = Config.USER_ADDRESS
+        self.trade_queue = trade_queue
+        self.warmup = warmup
+        self.analytics = analytics
+        self.target_wallets = list(target_wallets or Config.USER_ADDRESSES)
+        self.max_concurrent_polls = max_concurrent_polls
         self.running = False
-        self.known_activities = set()
+        self.schedulers = {wallet: AdaptivePollScheduler() for wallet in self.target_wallets}
+        self._lock = threading.Lock()
         
-        # Load existing activities to avoid duplicates
-        existing_activities = self.storage.load_activities(self.target_wallet)
-        self.known_activities = {activity.id for activity in existing_activities}
+        # Only activities inside the too-old window can still be copied, so only
+        # those are loaded to avoid duplicates, one bounded index per leader
+        self.known_activities: Dict[str, DedupIndex] = {}
+        market_slugs = set()
+        since = int(time.time()) - Config.TOO_OLD_TIMESTAMP
+        for wallet in self.target_wallets:
+            recent_activities = self.storage.load_recent_activities(wallet, since)
+            self.known_activities[wallet] = DedupIndex(bloom=self._load_bloom(wallet))
+            self.known_activities[wallet].update((activity.id, activity.timestamp) for activity in recent_activities)
+            market_slugs.update(activity.slug for activity in recent_activities)
+        
+        # Streaming detection runs next to polling, which stays on as fallback
+        self.trade_stream = TradeStream(self.target_wallets, self._record_new_activities) if enable_stream else None
+        if self.trade_stream:
+            self.trade_stream.watch_markets(market_slugs)
+        
+        # On-chain OrderFilled logs usually land before the data API indexes them
+        self.chain_detector = (
+            ChainFillDetector(self.target_wallets, self._record_new_activities, storage.data_dir)
+            if enable_chain_detector else None
+        )
+    
+    def _load_bloom(self, wallet_address: str) -> Optional[BloomFilter]:
+        """Persisted filter of ids that aged out of the window, if enabled"""
+        if not Config.DEDUP_BLOOM:
+            return None
+        bloom_file = os.path.join(self.storage.data_dir, f"dedup_{wallet_address}.bloom")
+        return BloomFilter(Config.DEDUP_BLOOM_CAPACITY, Config.DEDUP_BLOOM_ERROR_RATE, bloom_file)
     
     def start_monitoring(self):
-        """Start monitoring in a separate thread"""
+        """Start monitoring in a separate thread running an asyncio event loop"""
         self.running = True
-        monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        if self.trade_stream:
+            self.trade_stream.start()
+        if self.chain_detector:
+            self.chain_detector.start()
+        monitor_thread = threading.Thread(target=lambda: asyncio.run(self._monitor_loop()), daemon=True)
         monitor_thread.start()
-        print(f"{Fore.GREEN}✅ Trade monitoring started for {self.target_wallet}{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}✅ Trade monitoring started for {len(self.target_wallets)} trader(s): "
+              f"{', '.join(self.target_wallets)}{Style.RESET_ALL}")
         
     def stop_monitoring(self):
         """Stop monitoring"""
         self.running = False
+        if self.trade_stream:
+            self.trade_stream.stop()
+        if self.chain_detector:
+            self.chain_detector.stop()
+        for known_activities in self.known_activities.values():
+            known_activities.save()
         print(f"{Fore.YELLOW}⏹ Trade monitoring stopped{Style.RESET_ALL}")
     
-    def _monitor_loop(self):
-        """Main monitoring loop"""
+    async def _monitor_loop(self):
+        """Poll every leader concurrently with a cap on in-flight requests"""
+        # Blocking HTTP calls run on a pool sized to the in-flight cap
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.max_concurrent_polls,
+                                                     thread_name_prefix='poll'))
+        self._poll_semaphore = asyncio.Semaphore(self.max_concurrent_polls)
+        
+        await asyncio.gather(*(
+            self._poll_leader(wallet, index * Config.FETCH_INTERVAL / len(self.target_wallets))
+            for index, wallet in enumerate(self.target_wallets)
+        ))
+    
+    async def _poll_leader(self, wallet_address: str, start_delay: float):
+        """Monitoring loop for a single leader on an adaptive cadence"""
+        scheduler = self.schedulers[wallet_address]
+        
+        # Stagger leaders across the interval so requests don't arrive in bursts
+        await asyncio.sleep(start_delay)
+        
         while self.running:
             try:
-                self._check_for_new_trades()
-                time.sleep(Config.FETCH_INTERVAL)
+                new_trades = await self._check_for_new_trades(wallet_address)
+                delay = scheduler.record_poll(new_trades)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                retry_after = self._retry_after(e.response) if status == 429 else None
+                delay = scheduler.record_error(rate_limited=status == 429, retry_after=retry_after)
+                print(f"{Fore.RED}❌ HTTP {status} polling {wallet_address}, retrying in {delay:.1f}s{Style.RESET_ALL}")
             except Exception as e:
-                print(f"{Fore.RED}❌ Error in monitoring loop: {e}{Style.RESET_ALL}")
-                time.sleep(Config.FETCH_INTERVAL * 2)  # Wait longer on error
+                delay = scheduler.record_error()
+                print(f"{Fore.RED}❌ Error in monitoring loop for {wallet_address}: {e}{Style.RESET_ALL}")
+            await asyncio.sleep(delay)
     
-    def _check_for_new_trades(self):
-        """Check for new trading activities"""
+    @staticmethod
+    def _retry_after(response: Optional[requests.Response]) -> Optional[float]:
         try:
-            # Fetch latest activities
-            activities = self.data_fetcher.fetch_user_activities(self.target_wallet)
-            
-            # Filter for new trades only
+            return float(response.headers.get('Retry-After'))
+        except (AttributeError, TypeError, ValueError):
+            return None
+    
+    def get_polling_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Current polling interval and request rate per leader"""
+        return {
+            wallet: {
+                'interval': scheduler.current_interval,
+                'request_rate': scheduler.request_rate(),
+                'consecutive_errors': scheduler.consecutive_errors
+            }
+            for wallet, scheduler in self.schedulers.items()
+        }
+    
+    async def _check_for_new_trades(self, wallet_address: str) -> int:
+        """Check a leader for new trading activities; returns how many were found"""
+        # Fetch errors propagate so the scheduler can back off
+        async with self._poll_semaphore:
+            activities, cursor = await asyncio.to_thread(self.data_fetcher.fetch_new_activities, wallet_address)
+        
+        # A failed write raises before the cursor moves, so the next poll fetches these again
+        new_trades = await asyncio.to_thread(self._store_new_activities, wallet_address, activities)
+        self.data_fetcher.commit_cursor(wallet_address, cursor)
+        return new_trades
+    
+    def _record_new_activities(self, wallet_address: str, activities: List[UserActivity]) -> int:
+        """Dedupe, persist and queue activities from the stream or chain; returns how many were new"""
+        try:
+            return self._store_new_activities(wallet_address, activities)
+        except Exception as e:
+            print(f"{Fore.RED}❌ Error checking for trades from {wallet_address}: {e}{Style.RESET_ALL}")
+            return 0
+    
+    def _store_new_activities(self, wallet_address: str, activities: List[UserActivity]) -> int:
+        """Dedupe, persist and queue activities; storage errors are raised"""
+        # Claim ids under the lock so a trade seen by both sources is handled once
+        with self._lock:
+            known_activities = self.known_activities[wallet_address]
             new_activities = [
                 activity for activity in activities
-                if (activity.id not in self.known_activities and
-                    activity.type == 'TRADE' and
-                    time.time() - activity.timestamp < Config.TOO_OLD_TIMESTAMP)
+                if (activity.type == 'TRADE' and
+                    time.time() - activity.timestamp < Config.TOO_OLD_TIMESTAMP and
+                    known_activities.add(activity.id, activity.timestamp))
             ]
+        
+        if new_activities:
+            print(f"{Fore.CYAN}🔍 Found {len(new_activities)} new trades to copy from {wallet_address}{Style.RESET_ALL}")
             
-            if new_activities:
-                print(f"{Fore.CYAN}🔍 Found {len(new_activities)} new trades to copy{Style.RESET_ALL}")
+            try:
+                # Persist only the new activities
+                self.storage.append_activities(wallet_address, new_activities)
                 
-                # Load existing activities and add new ones
-                all_activities = self.storage.load_activities(self.target_wallet)
-                all_activities.extend(new_activities)
+                # Start prefetching books, balances and positions while the trade waits in the queue
+                if self.warmup is not None:
+                    self.warmup.warm(wallet_address, new_activities)
                 
-                # Save updated activities
-                self.storage.save_activities(self.target_wallet, all_activities)
+                # Hand off to the executor right away; storage is the durable copy
+                if self.trade_queue is not None:
+                    self.trade_queue.put_many(wallet_address, new_activities)
+            except Exception:
+                # Release the claims so the next poll or stream event picks these up again
+                with self._lock:
+                    for activity in new_activities:
+                        known_activities.discard(activity.id, activity.timestamp)
+                raise
+            
+            # Keep leader performance current with what was just stored
+            if self.analytics is not None:
+                self.analytics.ingest(wallet_address, new_activities)
+            
+            # Start streaming any market the leader just traded in
+            if self.trade_stream:
+                self.trade_stream.watch_markets(activity.slug for activity in new_activities)
                 
-                # Update known activities
-                for activity in new_activities:
-                    self.known_activities.add(activity.id)
-                    
-                # Print trade details
-                for activity in new_activities:
-                    self._print_trade_info(activity)
-                    
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error checking for trades: {e}{Style.RESET_ALL}")
+            # Print trade details
+            for activity in new_activities:
+                self._print_trade_info(activity)
+        
+        return len(new_activities)
     
     def _print_trade_info(self, activity: UserActivity):
         """Print formatted trade information"""
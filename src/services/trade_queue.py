@@ -0,0 +1,68 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import List, Tuple, Optional
+from models.user_activity import UserActivity
+
+class PendingTradeQueue:
+    """Thread-safe hand-off of detected trades from TradeMonitor to TradeExecutor.
+
+    Storage stays the durable record; this queue only wakes the executor as
+    soon as a trade is detected. Items can be delayed, which is how failed
+    trades are retried without polling storage.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[float, int, str, UserActivity]] = []
+        self._queued_ids = set()
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._heap)
+
+    def put(self, wallet_address: str, activity: UserActivity, delay: float = 0.0) -> bool:
+        """Queue a trade; returns False if it is already waiting"""
+        return self.put_many(wallet_address, [activity], delay) == 1
+
+    def put_many(self, wallet_address: str, activities: List[UserActivity], delay: float = 0.0) -> int:
+        """Queue several trades at once and wake the executor"""
+        ready_at = time.monotonic() + delay
+        added = 0
+        with self._condition:
+            for activity in activities:
+                key = (wallet_address, activity.id)
+                if key in self._queued_ids:
+                    continue
+                self._queued_ids.add(key)
+                heapq.heappush(self._heap, (ready_at, next(self._sequence), wallet_address, activity))
+                added += 1
+            if added:
+                self._condition.notify_all()
+        return added
+
+    def get_batch(self, timeout: Optional[float] = None) -> List[Tuple[str, UserActivity]]:
+        """Wait for ready trades and return all of them in detection order"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._heap and self._heap[0][0] <= now:
+                    break
+
+                # Sleep until the next delayed item is due, a new item arrives or we time out
+                wait_until = self._heap[0][0] if self._heap else None
+                if deadline is not None:
+                    if now >= deadline:
+                        return []
+                    wait_until = deadline if wait_until is None else min(wait_until, deadline)
+                self._condition.wait(None if wait_until is None else wait_until - now)
+
+            batch = []
+            while self._heap and self._heap[0][0] <= now:
+                _, _, wallet_address, activity = heapq.heappop(self._heap)
+                self._queued_ids.discard((wallet_address, activity.id))
+                batch.append((wallet_address, activity))
+            return batch
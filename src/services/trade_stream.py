@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from config.env import Config
+from helpers.websocket_feed import WebSocketFeed
+from models.user_activity import UserActivity
+
+class TradeStream:
+    """Push-based trade detection from Polymarket's real-time activity feed.
+
+    Subscribes to the `activity/trades` topic for the markets our leaders
+    trade and turns messages from a leader's proxy wallet into UserActivity
+    records. Polling stays on as fallback and reconciliation: it discovers
+    trades in markets we are not subscribed to yet, which then get added.
+    """
+
+    def __init__(self, target_wallets: List[str],
+                 on_activities: Callable[[str, List[UserActivity]], Any],
+                 url: str = Config.TRADE_STREAM_URL):
+        self.on_activities = on_activities
+        self._wallets = {wallet.lower(): wallet for wallet in target_wallets}
+        self._market_slugs = set()
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=1000)  # seconds from publish to detection
+        self.feed = WebSocketFeed(url, self._handle_message, name="Trade stream")
+
+    def start(self):
+        self.feed.start()
+
+    def stop(self):
+        self.feed.stop()
+
+    def watch_markets(self, market_slugs: Iterable[str]):
+        """Subscribe to trades in any markets we are not watching yet"""
+        with self._lock:
+            new_slugs = sorted(set(slug for slug in market_slugs if slug) - self._market_slugs)
+            self._market_slugs.update(new_slugs)
+
+        if new_slugs:
+            self.feed.subscribe({
+                'action': 'subscribe',
+                'subscriptions': [
+                    {
+                        'topic': 'activity',
+                        'type': 'trades',
+                        'filters': json.dumps({'market_slug': slug})
+                    }
+                    for slug in new_slugs
+                ]
+            })
+
+    def _handle_message(self, message: Dict[str, Any]):
+        if message.get('topic') != 'activity' or not isinstance(message.get('payload'), dict):
+            return
+
+        payload = message['payload']
+        wallet = self._wallets.get(str(payload.get('proxyWallet', '')).lower())
+        if not wallet:
+            return
+
+        activity = self._to_activity(payload, wallet)
+
+        published_ms = message.get('timestamp')
+        if published_ms:
+            self.latencies.append(time.time() - float(published_ms) / 1000)
+
+        self.on_activities(wallet, [activity])
+
+    @staticmethod
+    def _to_activity(payload: Dict[str, Any], wallet_address: str) -> UserActivity:
+        data = dict(payload)
+        timestamp = float(data.get('timestamp', time.time()))
+        # Stream timestamps may be in milliseconds; the data API uses seconds
+        data['timestamp'] = int(timestamp / 1000) if timestamp > 1e12 else int(timestamp)
+        data.setdefault('type', 'TRADE')
+        data.setdefault('usdcSize', float(data.get('size', 0)) * float(data.get('price', 0)))
+        return UserActivity.from_api_data(data, wallet_address)
+
+    def get_latency_stats(self) -> Optional[Dict[str, float]]:
+        """Publish-to-detection latency over the most recent messages"""
+        samples = sorted(self.latencies)
+        if not samples:
+            return None
+        return {
+            'count': len(samples),
+            'p50': samples[len(samples) // 2],
+            'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'max': samples[-1]
+        }
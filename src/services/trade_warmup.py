@@ -0,0 +1,108 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+from config.env import Config
+from services.market_data import MarketDataService
+from services.trade_context import TradeContext, TradeContextLoader
+from models.user_activity import UserActivity
+from colorama import Fore, Style
+
+class TradeWarmup:
+    """Prepare detected trades in the background while they wait for the executor.
+
+    Called by the monitor at detection time, right before a trade is queued.
+    For every new trade it loads the full context (balances, positions, book
+    and price, in bulk where possible) and resolves the tick size and
+    neg-risk flag that order signing would otherwise fetch. The executor
+    takes the prepared context, waiting for it if the warm-up is still in
+    flight rather than fetching the same data twice, so the only network
+    work left is a final price check and the post. Detection times are kept
+    per trade id for latency metrics.
+    """
+
+    def __init__(self, market_data: MarketDataService, context_loader: TradeContextLoader,
+                 strategy_for: Callable[[UserActivity], str],
+                 max_age: float = Config.WARMUP_MAX_AGE, deadline: float = Config.CONTEXT_DEADLINE,
+                 max_workers: int = Config.EXECUTION_CONCURRENCY):
+        self.market_data = market_data
+        self.context_loader = context_loader
+        self.strategy_for = strategy_for
+        self.max_age = max_age
+        self.deadline = deadline
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='warmup')
+        self._options_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='warmup-options')
+        self._lock = threading.Lock()
+        self._prepared: Dict[Tuple[str, str], Future] = {}  # resolves to (prepared_at, context) or None
+        self._detected_at: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+        self._options_pool.shutdown(wait=False)
+
+    def warm(self, wallet_address: str, activities: List[UserActivity]):
+        """Start preparing newly detected trades; returns without waiting"""
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            for activity in activities:
+                self._detected_at.setdefault(activity.id, now)
+                result: Future = Future()
+                self._prepared[(wallet_address, activity.id)] = result
+                results.append(result)
+        self._pool.submit(self._warm_batch, wallet_address, activities, results)
+
+    def _warm_batch(self, wallet_address: str, activities: List[UserActivity], results: List[Future]):
+        # Tick size and neg-risk lookups run alongside the market data requests
+        for asset in {activity.asset for activity in activities if activity.asset}:
+            self._options_pool.submit(self._warm_options, asset)
+
+        # One bulk request for the books and prices of the whole detection batch
+        self.market_data.prefetch(activities)
+
+        for activity, result in zip(activities, results):
+            context = None
+            try:
+                context = self.context_loader.load(activity, wallet_address, self.strategy_for(activity))
+            except Exception as e:
+                print(f"{Fore.YELLOW}⚠️ Warm-up failed for trade {activity.id}: {e}{Style.RESET_ALL}")
+            result.set_result((time.monotonic(), context) if context is not None else None)
+
+    def _warm_options(self, asset_id: str):
+        try:
+            self.market_data.warm_order_options(asset_id)
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Could not resolve order options for {asset_id[:12]}...: {e}{Style.RESET_ALL}")
+
+    def take(self, wallet_address: str, trade: UserActivity) -> Optional[TradeContext]:
+        """Hand over the prepared context for a trade, waiting if it is still being built"""
+        with self._lock:
+            result = self._prepared.pop((wallet_address, trade.id), None)
+        entry = None
+        if result is not None:
+            try:
+                entry = result.result(timeout=self.deadline)
+            except TimeoutError:
+                pass
+        if entry and time.monotonic() - entry[0] < self.max_age:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def is_warming(self, wallet_address: str, trade: UserActivity) -> bool:
+        with self._lock:
+            return (wallet_address, trade.id) in self._prepared
+
+    def detected_at(self, trade_id: str) -> Optional[float]:
+        with self._lock:
+            return self._detected_at.get(trade_id)
+
+    def forget(self, wallet_address: str, trades: List[UserActivity]):
+        """Drop state for trades that are finished"""
+        with self._lock:
+            for trade in trades:
+                self._prepared.pop((wallet_address, trade.id), None)
+                self._detected_at.pop(trade.id, None)
@@ -0,0 +1,203 @@
+import json
+import os
+import shutil
+import time
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+from config.env import Config
+from models.user_activity import UserActivity, ACTIVITY_FIELDS
+
+# Fixed-width numeric columns
+NUMERIC_COLUMNS = {
+    'timestamp': np.int64,
+    'size': np.float64,
+    'usdc_size': np.float64,
+    'price': np.float64,
+    'outcome_index': np.int16,
+    'bot_executed': np.bool_,
+    'bot_executed_time': np.int32,
+}
+# Repeating strings, stored as int32 codes into a per-day dictionary
+DICTIONARY_COLUMNS = ('proxy_wallet', 'condition_id', 'type', 'asset', 'side', 'title', 'slug', 'outcome')
+# Unique per activity, stored as fixed-width ASCII bytes
+BYTES_COLUMNS = ('transaction_hash', 'id')
+
+DICTIONARY_FILE = 'dictionary.json'
+
+def _day_of(timestamp: int) -> str:
+    return time.strftime('%Y-%m-%d', time.gmtime(timestamp))
+
+class ArchiveDay:
+    """One wallet's archived activities for one UTC day, as memory-mapped columns.
+
+    Columns are opened lazily with `np.load(mmap_mode='r')`, so reading a
+    column maps the file instead of parsing it and only the pages touched
+    are loaded. Dictionary columns come back as codes; `strings` decodes
+    them against the day's dictionary.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.day = os.path.basename(path)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._dictionary: Optional[Dict[str, List[Optional[str]]]] = None
+
+    def __len__(self) -> int:
+        return len(self.column('timestamp'))
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column: values, dictionary codes, or bytes"""
+        if name not in self._columns:
+            self._columns[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+        return self._columns[name]
+
+    def dictionary(self, name: str) -> List[Optional[str]]:
+        if self._dictionary is None:
+            with open(os.path.join(self.path, DICTIONARY_FILE), 'r') as f:
+                self._dictionary = json.load(f)
+        return self._dictionary[name]
+
+    def strings(self, name: str) -> np.ndarray:
+        """Decoded values of a dictionary or bytes column"""
+        if name in DICTIONARY_COLUMNS:
+            return np.asarray(self.dictionary(name), dtype=object)[self.column(name)]
+        return self.column(name).astype(str)
+
+    def to_activities(self) -> List[UserActivity]:
+        columns = [
+            self.strings(name).tolist() if name in DICTIONARY_COLUMNS or name in BYTES_COLUMNS
+            else self.column(name).tolist()
+            for name in ACTIVITY_FIELDS
+        ]
+        return [UserActivity.from_row(values) for values in zip(*columns)]
+
+class ActivityArchive:
+    """Columnar archive of settled activities, one directory per wallet and UTC day.
+
+    Every day holds one `.npy` file per field: numbers as fixed-width arrays,
+    repeating strings (market, wallet, outcome) as int32 codes into a small
+    JSON dictionary, and ids/hashes as fixed-width bytes. Days are rewritten
+    whole through a temporary directory, so readers never see a partial day.
+    Reads go through ArchiveDay and are memory-mapped, so months of history
+    can be scanned column by column without building activity objects.
+    """
+
+    def __init__(self, root: str = Config.ARCHIVE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _wallet_dir(self, wallet_address: str) -> str:
+        return os.path.join(self.root, wallet_address)
+
+    def days(self, wallet_address: str, start: Optional[int] = None, end: Optional[int] = None) -> List[str]:
+        """Archived days for a wallet, optionally limited to [start, end] unix seconds"""
+        wallet_dir = self._wallet_dir(wallet_address)
+        if not os.path.isdir(wallet_dir):
+            return []
+        first = _day_of(start) if start is not None else None
+        last = _day_of(end) if end is not None else None
+        return sorted(
+            day for day in os.listdir(wallet_dir)
+            if '.' not in day and (first is None or day >= first) and (last is None or day <= last)
+        )
+
+    def load_day(self, wallet_address: str, day: str) -> ArchiveDay:
+        return ArchiveDay(os.path.join(self._wallet_dir(wallet_address), day))
+
+    def scan(self, wallet_address: str, start: Optional[int] = None,
+             end: Optional[int] = None) -> Iterator[ArchiveDay]:
+        for day in self.days(wallet_address, start, end):
+            yield self.load_day(wallet_address, day)
+
+    def column(self, wallet_address: str, name: str, start: Optional[int] = None,
+               end: Optional[int] = None) -> np.ndarray:
+        """One field across days, decoded for string columns and limited to [start, end]"""
+        parts = []
+        for archive_day in self.scan(wallet_address, start, end):
+            values = archive_day.column(name) if name in NUMERIC_COLUMNS else archive_day.strings(name)
+            if start is not None or end is not None:
+                timestamps = archive_day.column('timestamp')
+                mask = np.ones(len(timestamps), dtype=bool)
+                if start is not None:
+                    mask &= timestamps >= start
+                if end is not None:
+                    mask &= timestamps <= end
+                values = values[mask]
+            parts.append(values)
+        if not parts:
+            return np.empty(0, dtype=NUMERIC_COLUMNS.get(name, object))
+        return np.concatenate(parts)
+
+    def load_activities(self, wallet_address: str, start: Optional[int] = None,
+                        end: Optional[int] = None) -> List[UserActivity]:
+        """Archived activities as objects, for replay tools"""
+        activities = []
+        for archive_day in self.scan(wallet_address, start, end):
+            activities.extend(
+                activity for activity in archive_day.to_activities()
+                if (start is None or activity.timestamp >= start) and (end is None or activity.timestamp <= end)
+            )
+        return activities
+
+    def append(self, wallet_address: str, activities: List[UserActivity]):
+        """Add activities, merging with days already archived; ids already present are replaced"""
+        by_day: Dict[str, List[UserActivity]] = {}
+        for activity in activities:
+            by_day.setdefault(_day_of(activity.timestamp), []).append(activity)
+
+        for day, day_activities in by_day.items():
+            day_dir = os.path.join(self._wallet_dir(wallet_address), day)
+            self._recover(day_dir)
+            merged: Dict[str, UserActivity] = {}
+            if os.path.isdir(day_dir):
+                merged = {activity.id: activity for activity in ArchiveDay(day_dir).to_activities()}
+            merged.update((activity.id, activity) for activity in day_activities)
+            self._write_day(day_dir, sorted(merged.values(), key=lambda activity: activity.timestamp))
+
+    @staticmethod
+    def _recover(day_dir: str):
+        """Finish a swap interrupted between renames"""
+        old_dir = day_dir + '.old'
+        if os.path.isdir(old_dir):
+            if not os.path.isdir(day_dir):
+                os.rename(old_dir, day_dir)
+            else:
+                shutil.rmtree(old_dir)
+
+    @staticmethod
+    def _write_day(day_dir: str, activities: List[UserActivity]):
+        tmp_dir = day_dir + '.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        for name, dtype in NUMERIC_COLUMNS.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"),
+                    np.array([getattr(activity, name) for activity in activities], dtype=dtype))
+
+        dictionary = {}
+        for name in DICTIONARY_COLUMNS:
+            codes: Dict[Optional[str], int] = {}
+            column = np.array([codes.setdefault(getattr(activity, name), len(codes)) for activity in activities],
+                              dtype=np.int32)
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), column)
+            dictionary[name] = list(codes)
+        with open(os.path.join(tmp_dir, DICTIONARY_FILE), 'w') as f:
+            json.dump(dictionary, f)
+
+        for name in BYTES_COLUMNS:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"),
+                    np.array([(getattr(activity, name) or '').encode() for activity in activities], dtype=np.bytes_))
+
+        # A directory can't be replaced atomically, so swap through `.old`
+        old_dir = day_dir + '.old'
+        if os.path.isdir(day_dir):
+            os.rename(day_dir, old_dir)
+        os.rename(tmp_dir, day_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def get_stats(self, wallet_address: str) -> Dict[str, int]:
+        days = self.days(wallet_address)
+        return {
+            'days': len(days),
+            'activities': sum(len(self.load_day(wallet_address, day)) for day in days)
+        }
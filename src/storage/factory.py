@@ -0,0 +1,24 @@
+from config.env import Config
+from storage.local_storage import LocalStorage
+from storage.journal_storage import JournalStorage
+from storage.sqlite_storage import SqliteStorage
+
+def create_storage() -> LocalStorage:
+    """Create the storage backend selected by Config.STORAGE_BACKEND"""
+    backend = Config.STORAGE_BACKEND
+    
+    if backend == 'file':
+        return LocalStorage(Config.DATA_DIR)
+    if backend == 'journal':
+        return JournalStorage(Config.DATA_DIR, compact_every=Config.JOURNAL_COMPACT_EVERY,
+                              fsync=Config.JOURNAL_FSYNC)
+    if backend == 'sqlite':
+        return SqliteStorage(Config.SQLITE_PATH)
+    if backend == 'mongo':
+        if not Config.MONGO_URI:
+            raise ValueError("MONGO_URI is required for STORAGE_BACKEND=mongo")
+        # Imported lazily so pymongo is only needed when Mongo is used
+        from storage.mongo_storage import MongoStorage
+        return MongoStorage(Config.MONGO_URI, data_dir=Config.DATA_DIR)
+    
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
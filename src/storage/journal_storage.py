@@ -0,0 +1,206 @@
+import copy
+import json
+import os
+from typing import List, Dict, Any
+from config.env import Config
+from models.user_activity import UserActivity
+from storage.local_storage import LocalStorage
+
+class JournalStorage(LocalStorage):
+    """Activity storage backed by an append-only journal plus a compacted snapshot.
+
+    New activities and status changes are appended as single JSON lines, so a
+    write costs the same no matter how much history is stored. Every
+    `compact_every` records the in-memory state is written to a snapshot and
+    the journal is truncated. Positions keep using the plain JSON files.
+    """
+
+    def __init__(self, data_dir: str = "data", compact_every: int = 1000, fsync: bool = True):
+        super().__init__(data_dir)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._activities: Dict[str, Dict[str, UserActivity]] = {}
+        self._journal_records: Dict[str, int] = {}
+
+    def _get_snapshot_file(self, wallet_address: str) -> str:
+        return os.path.join(self.data_dir, f"activities_{wallet_address}.snapshot.json")
+
+    def _get_journal_file(self, wallet_address: str) -> str:
+        return os.path.join(self.data_dir, f"activities_{wallet_address}.journal")
+
+    def _load_wallet(self, wallet_address: str) -> Dict[str, UserActivity]:
+        """Load snapshot and replay the journal once, then serve from memory"""
+        if wallet_address in self._activities:
+            return self._activities[wallet_address]
+
+        activities: Dict[str, UserActivity] = {}
+
+        # Fall back to the legacy JSON file so switching backends keeps history
+        snapshot_file = self._get_snapshot_file(wallet_address)
+        if not os.path.exists(snapshot_file):
+            snapshot_file = self._get_activities_file(wallet_address)
+
+        if os.path.exists(snapshot_file):
+            try:
+                with open(snapshot_file, 'r') as f:
+                    for item in json.load(f):
+                        activity = UserActivity.from_dict(item)
+                        activities[activity.id] = activity
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                print(f"❌ Error reading activity snapshot {snapshot_file}: {e}")
+
+        self._journal_records[wallet_address] = self._replay_journal(wallet_address, activities)
+        self._activities[wallet_address] = activities
+        return activities
+
+    def _replay_journal(self, wallet_address: str, activities: Dict[str, UserActivity]) -> int:
+        """Apply journal records on top of the snapshot, dropping a torn tail"""
+        journal_file = self._get_journal_file(wallet_address)
+        if not os.path.exists(journal_file):
+            return 0
+
+        records = 0
+        valid_bytes = 0
+        with open(journal_file, 'rb') as f:
+            for line in f:
+                # A crash mid-append leaves a final line without newline or with broken JSON
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    self._apply_record(activities, json.loads(line))
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    break
+                valid_bytes += len(line)
+                records += 1
+
+        if valid_bytes < os.path.getsize(journal_file):
+            print(f"⚠️ Truncating corrupt journal tail in {journal_file}")
+            with open(journal_file, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+        return records
+
+    @staticmethod
+    def _apply_record(activities: Dict[str, UserActivity], record: Dict[str, Any]):
+        if record['op'] == 'add':
+            activity = UserActivity.from_dict(record['activity'])
+            activities[activity.id] = activity
+        elif record['op'] == 'remove':
+            for activity_id in record['ids']:
+                activities.pop(activity_id, None)
+        elif record['op'] == 'status':
+            activity = activities.get(record['id'])
+            if activity:
+                activity.bot_executed = record['bot_executed']
+                activity.bot_executed_time = record['bot_executed_time']
+
+    def _append_records(self, wallet_address: str, records: List[Dict[str, Any]]):
+        if not records:
+            return
+
+        lines = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        with open(self._get_journal_file(wallet_address), 'a') as f:
+            f.write(lines)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+        self._journal_records[wallet_address] += len(records)
+        if self._journal_records[wallet_address] >= self.compact_every:
+            self.compact(wallet_address)
+
+    @staticmethod
+    def _status_record(activity: UserActivity) -> Dict[str, Any]:
+        # Absolute values keep replay idempotent if a crash interrupts compaction
+        return {
+            'op': 'status',
+            'id': activity.id,
+            'bot_executed': activity.bot_executed,
+            'bot_executed_time': activity.bot_executed_time
+        }
+
+    def compact(self, wallet_address: str):
+        """Write current state to the snapshot and start an empty journal"""
+        with self._lock:
+            activities = self._load_wallet(wallet_address)
+            snapshot_file = self._get_snapshot_file(wallet_address)
+            tmp_file = snapshot_file + '.tmp'
+
+            with open(tmp_file, 'w') as f:
+                json.dump([activity.to_dict() for activity in activities.values()], f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, snapshot_file)
+
+            # Journal records already in the snapshot are safe to drop now
+            open(self._get_journal_file(wallet_address), 'w').close()
+            self._journal_records[wallet_address] = 0
+
+    def save_activities(self, wallet_address: str, activities: List[UserActivity]):
+        with self._lock:
+            current = self._load_wallet(wallet_address)
+            new_ids = {activity.id for activity in activities}
+
+            # Dropping activities cannot be expressed as appends, so rewrite the snapshot
+            if any(activity_id not in new_ids for activity_id in current):
+                self._activities[wallet_address] = {
+                    activity.id: copy.copy(activity) for activity in activities
+                }
+                self.compact(wallet_address)
+                return
+
+            records = []
+            for activity in activities:
+                existing = current.get(activity.id)
+                if existing is None or existing.to_dict() != activity.to_dict():
+                    current[activity.id] = copy.copy(activity)
+                    records.append({'op': 'add', 'activity': activity.to_dict()})
+            self._append_records(wallet_address, records)
+
+    def append_activities(self, wallet_address: str, activities: List[UserActivity]):
+        with self._lock:
+            current = self._load_wallet(wallet_address)
+            records = []
+            for activity in activities:
+                if activity.id not in current:
+                    current[activity.id] = copy.copy(activity)
+                    records.append({'op': 'add', 'activity': activity.to_dict()})
+            self._append_records(wallet_address, records)
+
+    def remove_activities(self, wallet_address: str, activity_ids: List[str]):
+        with self._lock:
+            current = self._load_wallet(wallet_address)
+            removed = [activity_id for activity_id in activity_ids if current.pop(activity_id, None) is not None]
+            if removed:
+                self._append_records(wallet_address, [{'op': 'remove', 'ids': removed}])
+
+    def load_activities(self, wallet_address: str) -> List[UserActivity]:
+        with self._lock:
+            return [copy.copy(activity) for activity in self._load_wallet(wallet_address).values()]
+
+    def load_recent_activities(self, wallet_address: str, since: int) -> List[UserActivity]:
+        with self._lock:
+            return [
+                copy.copy(activity) for activity in self._load_wallet(wallet_address).values()
+                if activity.timestamp >= since
+            ]
+
+    def get_pending_trades(self, wallet_address: str) -> List[UserActivity]:
+        with self._lock:
+            return [
+                copy.copy(activity) for activity in self._load_wallet(wallet_address).values()
+                if (activity.type == 'TRADE' and
+                    not activity.bot_executed and
+                    activity.bot_executed_time < Config.RETRY_LIMIT)
+            ]
+
+    def mark_trade_executed(self, wallet_address: str, activity_id: str, success: bool = True):
+        with self._lock:
+            activity = self._load_wallet(wallet_address).get(activity_id)
+            if not activity:
+                return
+
+            activity.bot_executed = success
+            if not success:
+                activity.bot_executed_time += 1
+            self._append_records(wallet_address, [self._status_record(activity)])
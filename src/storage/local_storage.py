@@ -1,12 +1,16 @@
 import json
 import os
+import threading
 from typing import List, Dict, Any, Optional
+from config.env import Config
 from models.user_activity import UserActivity, UserPosition
 
 class LocalStorage:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
+        # Monitor and executor workers update the same files from different threads
+        self._lock = threading.RLock()
         
     def _get_activities_file(self, wallet_address: str) -> str:
         return os.path.join(self.data_dir, f"activities_{wallet_address}.json")
@@ -17,24 +21,43 @@ class LocalStorage:
     def save_activities(self, wallet_address: str, activities: List[UserActivity]):
         file_path = self._get_activities_file(wallet_address)
         data = [activity.to_dict() for activity in activities]
-        with open(file_path, 'w') as f:
+        with self._lock, open(file_path, 'w') as f:
             json.dump(data, f, indent=2)
     
+    def append_activities(self, wallet_address: str, activities: List[UserActivity]):
+        """Add new activities, skipping ids that are already stored"""
+        with self._lock:
+            existing = self.load_activities(wallet_address)
+            known_ids = {activity.id for activity in existing}
+            existing.extend(activity for activity in activities if activity.id not in known_ids)
+            self.save_activities(wallet_address, existing)
+    
     def load_activities(self, wallet_address: str) -> List[UserActivity]:
         file_path = self._get_activities_file(wallet_address)
         if not os.path.exists(file_path):
             return []
         
         try:
-            with open(file_path, 'r') as f:
+            with self._lock, open(file_path, 'r') as f:
                 data = json.load(f)
             return [UserActivity.from_dict(item) for item in data]
         except (json.JSONDecodeError, KeyError):
             return []
     
+    def load_recent_activities(self, wallet_address: str, since: int) -> List[UserActivity]:
+        """Activities with a timestamp at or after `since` (unix seconds)"""
+        return [activity for activity in self.load_activities(wallet_address) if activity.timestamp >= since]
+    
+    def remove_activities(self, wallet_address: str, activity_ids: List[str]):
+        """Drop activities by id, e.g. once they have been archived"""
+        removed = set(activity_ids)
+        with self._lock:
+            activities = self.load_activities(wallet_address)
+            self.save_activities(wallet_address, [activity for activity in activities if activity.id not in removed])
+    
     def save_positions(self, wallet_address: str, positions: List[UserPosition]):
         file_path = self._get_positions_file(wallet_address)
-        data = [pos.__dict__ for pos in positions]
+        data = [pos.to_dict() for pos in positions]
         with open(file_path, 'w') as f:
             json.dump(data, f, indent=2)
     
@@ -46,7 +69,7 @@ class LocalStorage:
         try:
             with open(file_path, 'r') as f:
                 data = json.load(f)
-            return [UserPosition(**item) for item in data]
+            return [UserPosition.from_dict(item) for item in data]
         except (json.JSONDecodeError, KeyError):
             return []
     
@@ -56,15 +79,16 @@ class LocalStorage:
             activity for activity in activities
             if (activity.type == 'TRADE' and 
                 not activity.bot_executed and 
-                activity.bot_executed_time < 3)  # Max 3 retries
+                activity.bot_executed_time < Config.RETRY_LIMIT)
         ]
     
     def mark_trade_executed(self, wallet_address: str, activity_id: str, success: bool = True):
-        activities = self.load_activities(wallet_address)
-        for activity in activities:
-            if activity.id == activity_id:
-                activity.bot_executed = success
-                if not success:
-                    activity.bot_executed_time += 1
-                break
-        self.save_activities(wallet_address, activities)
\ No newline at end of file
+        with self._lock:
+            activities = self.load_activities(wallet_address)
+            for activity in activities:
+                if activity.id == activity_id:
+                    activity.bot_executed = success
+                    if not success:
+                        activity.bot_executed_time += 1
+                    break
+            self.save_activities(wallet_address, activities)
\ No newline at end of file
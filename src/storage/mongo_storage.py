@@ -0,0 +1,119 @@
+from typing import List, Dict, Any, Optional
+from pymongo import MongoClient, ASCENDING, ReplaceOne
+from pymongo.errors import BulkWriteError
+from config.env import Config
+from models.user_activity import UserActivity, UserPosition
+from storage.local_storage import LocalStorage
+
+DUPLICATE_KEY_ERROR = 11000
+
+class MongoStorage(LocalStorage):
+    """LocalStorage implementation backed by MongoDB.
+
+    New activities go in as one unordered bulk insert, status changes are
+    targeted update_one calls and pending trades are served from a compound
+    index, so cost no longer grows with the amount of stored history.
+    """
+
+    def __init__(self, mongo_uri: str, database: str = "polymarket_copytrading",
+                 data_dir: str = "data", client: Optional[MongoClient] = None):
+        super().__init__(data_dir)
+        self.client = client or MongoClient(mongo_uri)
+        self.db = self.client.get_default_database(default=database)
+        self.activities = self.db['user_activities']
+        self.positions = self.db['user_positions']
+        self._ensure_indexes()
+
+    def _ensure_indexes(self):
+        self.activities.create_index([('wallet', ASCENDING), ('id', ASCENDING)], unique=True)
+        self.activities.create_index([
+            ('wallet', ASCENDING),
+            ('type', ASCENDING),
+            ('bot_executed', ASCENDING),
+            ('bot_executed_time', ASCENDING)
+        ])
+        self.activities.create_index([('wallet', ASCENDING), ('timestamp', ASCENDING)])
+        self.positions.create_index([('wallet', ASCENDING), ('asset', ASCENDING)], unique=True)
+
+    @staticmethod
+    def _activity_doc(wallet_address: str, activity: UserActivity) -> Dict[str, Any]:
+        doc = activity.to_dict()
+        doc['wallet'] = wallet_address
+        return doc
+
+    def save_activities(self, wallet_address: str, activities: List[UserActivity]):
+        ids = [activity.id for activity in activities]
+        if activities:
+            self.activities.bulk_write([
+                ReplaceOne({'wallet': wallet_address, 'id': activity.id},
+                           self._activity_doc(wallet_address, activity), upsert=True)
+                for activity in activities
+            ], ordered=False)
+        self.activities.delete_many({'wallet': wallet_address, 'id': {'$nin': ids}})
+
+    def append_activities(self, wallet_address: str, activities: List[UserActivity]):
+        if not activities:
+            return
+        try:
+            self.activities.insert_many(
+                [self._activity_doc(wallet_address, activity) for activity in activities],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            # Already-stored ids are expected; anything else is a real failure
+            errors = e.details.get('writeErrors', [])
+            if any(error.get('code') != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+
+    def load_activities(self, wallet_address: str) -> List[UserActivity]:
+        cursor = self.activities.find(
+            {'wallet': wallet_address},
+            {'_id': 0, 'wallet': 0}
+        ).sort('_id', ASCENDING)
+        return [UserActivity.from_dict(doc) for doc in cursor]
+
+    def load_recent_activities(self, wallet_address: str, since: int) -> List[UserActivity]:
+        cursor = self.activities.find(
+            {'wallet': wallet_address, 'timestamp': {'$gte': since}},
+            {'_id': 0, 'wallet': 0}
+        ).sort('_id', ASCENDING)
+        return [UserActivity.from_dict(doc) for doc in cursor]
+
+    def get_pending_trades(self, wallet_address: str) -> List[UserActivity]:
+        cursor = self.activities.find(
+            {
+                'wallet': wallet_address,
+                'type': 'TRADE',
+                'bot_executed': False,
+                'bot_executed_time': {'$lt': Config.RETRY_LIMIT}
+            },
+            {'_id': 0, 'wallet': 0}
+        ).sort('_id', ASCENDING)
+        return [UserActivity.from_dict(doc) for doc in cursor]
+
+    def remove_activities(self, wallet_address: str, activity_ids: List[str]):
+        if activity_ids:
+            self.activities.delete_many({'wallet': wallet_address, 'id': {'$in': list(activity_ids)}})
+
+    def mark_trade_executed(self, wallet_address: str, activity_id: str, success: bool = True):
+        self.activities.update_one(
+            {'wallet': wallet_address, 'id': activity_id},
+            {
+                '$set': {'bot_executed': success},
+                '$inc': {'bot_executed_time': 0 if success else 1}
+            }
+        )
+
+    def save_positions(self, wallet_address: str, positions: List[UserPosition]):
+        self.positions.delete_many({'wallet': wallet_address})
+        if positions:
+            docs = []
+            for pos in positions:
+                doc = pos.to_dict()
+                doc['wallet'] = wallet_address
+                docs.append(doc)
+            self.positions.insert_many(docs, ordered=False)
+
+    def load_positions(self, wallet_address: str) -> List[UserPosition]:
+        cursor = self.positions.find({'wallet': wallet_address}, {'_id': 0, 'wallet': 0})
+        return [UserPosition.from_dict(doc) for doc in cursor]
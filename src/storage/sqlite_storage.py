@@ -0,0 +1,158 @@
+import os
+import sqlite3
+import threading
+from dataclasses import fields
+from typing import List
+from config.env import Config
+from models.user_activity import UserActivity, UserPosition
+from storage.local_storage import LocalStorage
+
+ACTIVITY_FIELDS = [f.name for f in fields(UserActivity)]
+POSITION_FIELDS = [f.name for f in fields(UserPosition)]
+ACTIVITY_BOOL_FIELDS = [f.name for f in fields(UserActivity) if f.type in (bool, 'bool')]
+POSITION_BOOL_FIELDS = [f.name for f in fields(UserPosition) if f.type in (bool, 'bool')]
+ACTIVITY_COLUMNS = ', '.join(ACTIVITY_FIELDS)
+POSITION_COLUMNS = ', '.join(POSITION_FIELDS)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS activities (
+    wallet TEXT NOT NULL,
+    {', '.join(name for name in ACTIVITY_FIELDS)},
+    PRIMARY KEY (wallet, id)
+);
+CREATE INDEX IF NOT EXISTS ix_activities_status
+    ON activities (wallet, bot_executed, bot_executed_time);
+CREATE INDEX IF NOT EXISTS ix_activities_time
+    ON activities (wallet, timestamp);
+CREATE TABLE IF NOT EXISTS positions (
+    wallet TEXT NOT NULL,
+    {', '.join(name for name in POSITION_FIELDS)},
+    PRIMARY KEY (wallet, asset)
+);
+"""
+
+class SqliteStorage(LocalStorage):
+    """LocalStorage implementation on a single SQLite database in WAL mode.
+
+    Each thread gets its own connection, so the monitor and executor can
+    read and write concurrently. Status updates are single-row UPDATEs and
+    pending trades come from the (wallet, bot_executed, bot_executed_time)
+    index instead of a scan of the whole history.
+    """
+
+    def __init__(self, db_path: str = os.path.join("data", "copytrading.db")):
+        super().__init__(os.path.dirname(db_path) or ".")
+        self.db_path = db_path
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _activity_row(wallet_address: str, activity: UserActivity) -> tuple:
+        return (wallet_address, *(getattr(activity, name) for name in ACTIVITY_FIELDS))
+
+    @staticmethod
+    def _activity_from_row(row: sqlite3.Row) -> UserActivity:
+        # Rows are selected in field order, so they map straight onto the constructor
+        activity = UserActivity.from_row(tuple(row))
+        for name in ACTIVITY_BOOL_FIELDS:
+            setattr(activity, name, bool(getattr(activity, name)))
+        return activity
+
+    def _insert_activities(self, conn: sqlite3.Connection, wallet_address: str,
+                           activities: List[UserActivity], verb: str):
+        columns = ', '.join(['wallet'] + ACTIVITY_FIELDS)
+        placeholders = ', '.join('?' * (len(ACTIVITY_FIELDS) + 1))
+        conn.executemany(
+            f"{verb} INTO activities ({columns}) VALUES ({placeholders})",
+            [self._activity_row(wallet_address, activity) for activity in activities]
+        )
+
+    def save_activities(self, wallet_address: str, activities: List[UserActivity]):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM activities WHERE wallet = ?", (wallet_address,))
+            self._insert_activities(conn, wallet_address, activities, "INSERT OR REPLACE")
+
+    def append_activities(self, wallet_address: str, activities: List[UserActivity]):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._insert_activities(conn, wallet_address, activities, "INSERT OR IGNORE")
+
+    def load_activities(self, wallet_address: str) -> List[UserActivity]:
+        rows = self._conn().execute(
+            f"SELECT {ACTIVITY_COLUMNS} FROM activities WHERE wallet = ? ORDER BY rowid",
+            (wallet_address,)
+        )
+        return [self._activity_from_row(row) for row in rows]
+
+    def load_recent_activities(self, wallet_address: str, since: int) -> List[UserActivity]:
+        rows = self._conn().execute(
+            f"SELECT {ACTIVITY_COLUMNS} FROM activities WHERE wallet = ? AND timestamp >= ? ORDER BY rowid",
+            (wallet_address, since)
+        )
+        return [self._activity_from_row(row) for row in rows]
+
+    def get_pending_trades(self, wallet_address: str) -> List[UserActivity]:
+        rows = self._conn().execute(
+            f"""SELECT {ACTIVITY_COLUMNS} FROM activities
+               WHERE wallet = ? AND bot_executed = 0 AND bot_executed_time < ? AND type = 'TRADE'
+               ORDER BY rowid""",
+            (wallet_address, Config.RETRY_LIMIT)
+        )
+        return [self._activity_from_row(row) for row in rows]
+
+    def remove_activities(self, wallet_address: str, activity_ids: List[str]):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "DELETE FROM activities WHERE wallet = ? AND id = ?",
+                [(wallet_address, activity_id) for activity_id in activity_ids]
+            )
+
+    def mark_trade_executed(self, wallet_address: str, activity_id: str, success: bool = True):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                """UPDATE activities
+                   SET bot_executed = ?, bot_executed_time = bot_executed_time + ?
+                   WHERE wallet = ? AND id = ?""",
+                (int(success), 0 if success else 1, wallet_address, activity_id)
+            )
+
+    def save_positions(self, wallet_address: str, positions: List[UserPosition]):
+        columns = ', '.join(['wallet'] + POSITION_FIELDS)
+        placeholders = ', '.join('?' * (len(POSITION_FIELDS) + 1))
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM positions WHERE wallet = ?", (wallet_address,))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO positions ({columns}) VALUES ({placeholders})",
+                [(wallet_address, *(getattr(pos, name) for name in POSITION_FIELDS)) for pos in positions]
+            )
+
+    def load_positions(self, wallet_address: str) -> List[UserPosition]:
+        rows = self._conn().execute(
+            f"SELECT {POSITION_COLUMNS} FROM positions WHERE wallet = ? ORDER BY rowid",
+            (wallet_address,)
+        )
+        positions = []
+        for row in rows:
+            position = UserPosition.from_row(tuple(row))
+            for name in POSITION_BOOL_FIELDS:
+                setattr(position, name, bool(getattr(position, name)))
+            positions.append(position)
+        return positions
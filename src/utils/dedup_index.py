@@ -0,0 +1,166 @@
+import hashlib
+import math
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+from config.env import Config
+
+BLOOM_MAGIC = b'DDBF'
+BLOOM_HEADER = struct.Struct('<4sQQQ')  # magic, bits, hashes, count
+
+class BloomFilter:
+    """Fixed-size Bloom filter for ids that have aged out of the dedup window.
+
+    Sized from `capacity` and `error_rate` up front, so memory never grows.
+    Once `capacity` ids have been added the filter is cleared, since by then
+    its oldest entries are far outside any window we still care about.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001, path: Optional[str] = None):
+        self.capacity = capacity
+        self.path = path
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        if path:
+            self._load()
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        # Double hashing: k positions from two independent 64-bit hashes
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str):
+        if self.count >= self.capacity:
+            self.clear()
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def clear(self):
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            header = f.read(BLOOM_HEADER.size)
+            if len(header) < BLOOM_HEADER.size:
+                return
+            magic, num_bits, num_hashes, count = BLOOM_HEADER.unpack(header)
+            # A filter sized differently can't be reused; start empty instead
+            if magic != BLOOM_MAGIC or num_bits != self.num_bits or num_hashes != self.num_hashes:
+                return
+            bits = f.read()
+        if len(bits) == len(self._bits):
+            self._bits = bytearray(bits)
+            self.count = count
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_file = self.path + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.num_bits, self.num_hashes, self.count))
+            f.write(self._bits)
+        os.replace(tmp_file, self.path)
+
+class DedupIndex:
+    """Seen-activity ids for one leader, bounded by the too-old window.
+
+    Ids live in a ring of per-bucket sets keyed by the activity's own
+    timestamp (`bucket_seconds` wide), so a lookup only touches the bucket
+    the activity belongs to and its neighbours. Buckets older than `window`
+    are dropped as time moves on; if a Bloom filter is attached their ids
+    are moved into it first. Memory is bounded by the trades within the
+    window instead of the whole stored history.
+    """
+
+    def __init__(self, window: float = Config.TOO_OLD_TIMESTAMP,
+                 bucket_seconds: int = Config.DEDUP_BUCKET_SECONDS,
+                 bloom: Optional[BloomFilter] = None,
+                 clock: Callable[[], float] = time.time):
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self.bloom = bloom
+        self.clock = clock
+        self._buckets: Dict[int, Set[str]] = {}
+        self._size = 0
+        self._expired_before = 0  # buckets below this index have been dropped
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return self._size
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp) // self.bucket_seconds
+
+    def _expire(self):
+        cutoff = self._bucket(self.clock() - self.window)
+        if cutoff <= self._expired_before:
+            return
+        for bucket in [bucket for bucket in self._buckets if bucket < cutoff]:
+            ids = self._buckets.pop(bucket)
+            self._size -= len(ids)
+            if self.bloom is not None:
+                for activity_id in ids:
+                    self.bloom.add(activity_id)
+        self._expired_before = cutoff
+
+    def _seen(self, activity_id: str, bucket: int) -> bool:
+        # Neighbouring buckets absorb small timestamp differences between sources
+        for candidate in (bucket, bucket - 1, bucket + 1):
+            ids = self._buckets.get(candidate)
+            if ids is not None and activity_id in ids:
+                return True
+        return self.bloom is not None and bucket <= self._expired_before and activity_id in self.bloom
+
+    def seen(self, activity_id: str, timestamp: float) -> bool:
+        with self._lock:
+            self._expire()
+            return self._seen(activity_id, self._bucket(timestamp))
+
+    def add(self, activity_id: str, timestamp: float) -> bool:
+        """Record an id; returns False if it was already seen"""
+        with self._lock:
+            self._expire()
+            bucket = self._bucket(timestamp)
+            if self._seen(activity_id, bucket):
+                return False
+            if bucket < self._expired_before:
+                # Already outside the window; only the Bloom filter remembers it
+                if self.bloom is not None:
+                    self.bloom.add(activity_id)
+            else:
+                self._buckets.setdefault(bucket, set()).add(activity_id)
+                self._size += 1
+            return True
+
+    def discard(self, activity_id: str, timestamp: float) -> bool:
+        """Forget a claimed id so it can be added again; ids already in the Bloom filter stay"""
+        with self._lock:
+            ids = self._buckets.get(self._bucket(timestamp))
+            if ids is None or activity_id not in ids:
+                return False
+            ids.discard(activity_id)
+            self._size -= 1
+            return True
+
+    def update(self, items: Iterable[Tuple[str, float]]):
+        for activity_id, timestamp in items:
+            self.add(activity_id, timestamp)
+
+    def save(self):
+        if self.bloom is not None:
+            with self._lock:
+                self.bloom.save()
@@ -0,0 +1,378 @@
+import argparse
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from config.env import Config
+from models.user_activity import UserActivity
+from storage.local_storage import LocalStorage
+from colorama import Fore, Style
+
+# Activity types that move shares: REDEEM is treated as a sale at the payout price
+POSITION_TYPES = ('TRADE', 'REDEEM')
+COLUMNS = {
+    'timestamp': np.int64,
+    'wallet': np.int32,
+    'pair': np.int32,  # (wallet, asset) code
+    'side': np.int8,   # +1 buy, -1 sell
+    'size': np.float64,
+    'price': np.float64,
+}
+# Running sums per (wallet, asset)
+PAIR_SUMS = ('buy_shares', 'buy_cost', 'buy_time', 'sell_shares', 'sell_proceeds', 'sell_time', 'trades')
+SECONDS_PER_DAY = 86400
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, len(array) * 2), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+class LeaderAnalytics:
+    """Performance metrics for copied (or candidate) wallets over their full history.
+
+    Trades and redemptions are kept as NumPy columns and, per wallet and
+    asset, as running sums of bought/sold shares, cost, proceeds and
+    share-weighted times. Ingesting new activity only adds to those sums, so
+    all-time metrics stay current at the cost of the new rows. Windowed
+    metrics (`report(window=...)`) recompute the same sums from the columns
+    with a timestamp mask in one vectorized pass.
+
+    Realized PnL uses the average buy price of the asset: shares sold (up to
+    shares bought) times the gap between average sell and average buy price.
+    Sales of shares bought before the loaded history carry no known cost
+    and are left out. Holding time is the share-weighted gap between average
+    sell and buy times. Slippage compares our copies (`ingest_copies`) with
+    the latest leader trade on the same asset and side within `copy_window`.
+    """
+
+    def __init__(self, storage: Optional[LocalStorage] = None, archive: Optional[Any] = None,
+                 copy_window: float = Config.COPY_MATCH_WINDOW):
+        self.storage = storage
+        self.archive = archive
+        self.copy_window = copy_window
+        self._lock = threading.Lock()
+        self._wallets: Dict[str, int] = {}
+        self._pairs: Dict[Tuple[int, str], int] = {}
+        self._assets: Dict[str, int] = {}
+        self._pair_asset = np.zeros(0, dtype=np.int32)
+        self._pair_market: List[str] = []
+        self._pair_wallet = np.zeros(0, dtype=np.int32)
+        self._sums = {name: np.zeros(0, dtype=np.float64) for name in PAIR_SUMS}
+        self._rows = 0
+        self._columns = {name: np.zeros(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self._copies = {name: np.zeros(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self._copy_rows = 0
+        self._seen_ids = set()  # ids ingested from the archive or live store, to make re-ingesting safe
+
+    def load(self, wallet_addresses: Iterable[str]):
+        """Ingest archived and stored history for wallets"""
+        for wallet in wallet_addresses:
+            if self.archive is not None:
+                self._ingest_archive(wallet)
+            if self.storage is not None:
+                self.ingest(wallet, self.storage.load_activities(wallet))
+
+    def _ingest_archive(self, wallet_address: str):
+        # Archived columns are read memory-mapped, without building activity objects
+        # and string columns are handled as dictionary codes
+        for archive_day in self.archive.scan(wallet_address):
+            types = np.asarray(archive_day.dictionary('type'), dtype=object)[archive_day.column('type')]
+            keep = np.isin(types, POSITION_TYPES)
+            if not keep.any():
+                continue
+            types = types[keep]
+            size = np.asarray(archive_day.column('size'))[keep]
+            price = self._effective_price(types, size, np.asarray(archive_day.column('usdc_size'))[keep],
+                                          np.asarray(archive_day.column('price'))[keep])
+            sell_codes = [code for code, side in enumerate(archive_day.dictionary('side')) if side == 'SELL']
+            side = np.where(np.isin(archive_day.column('side')[keep], sell_codes) | (types == 'REDEEM'), -1, 1)
+
+            asset_codes = np.asarray(archive_day.column('asset'))[keep]
+            market_codes = np.asarray(archive_day.column('condition_id'))[keep]
+            timestamps = np.asarray(archive_day.column('timestamp'))[keep]
+            ids = archive_day.column('id')[keep].astype(str).tolist()
+            asset_names, market_names = archive_day.dictionary('asset'), archive_day.dictionary('condition_id')
+            with self._lock:
+                # Rows already ingested (a repeated load, or a row still in the live store
+                # after an interrupted rotation) are skipped like in `ingest`
+                fresh = np.fromiter((activity_id not in self._seen_ids for activity_id in ids),
+                                    dtype=bool, count=len(ids))
+                if not fresh.any():
+                    continue
+                self._seen_ids.update(activity_id for activity_id, new in zip(ids, fresh) if new)
+                asset_codes, market_codes, timestamps = asset_codes[fresh], market_codes[fresh], timestamps[fresh]
+                side, size, price = side[fresh], size[fresh], price[fresh]
+                assets, first = np.unique(asset_codes, return_index=True)
+                wallet = self._wallets.setdefault(wallet_address, len(self._wallets))
+                to_pair = np.zeros(len(asset_names), dtype=np.int32)
+                for asset, index in zip(assets.tolist(), first.tolist()):
+                    to_pair[asset] = self._pair_code(wallet, asset_names[asset], market_names[market_codes[index]])
+                self._append(wallet, timestamps, to_pair[asset_codes], side, size, price)
+
+    @staticmethod
+    def _effective_price(types: np.ndarray, size: np.ndarray, usdc_size: np.ndarray,
+                         price: np.ndarray) -> np.ndarray:
+        # Redemptions report the payout in usdc_size; the price field is not meaningful
+        redeem_price = np.divide(usdc_size, size, out=np.zeros_like(size), where=size > 0)
+        return np.where(types == 'REDEEM', redeem_price, price)
+
+    def ingest(self, wallet_address: str, activities: Iterable[UserActivity]):
+        """Add new activity for a wallet; ids already ingested are skipped"""
+        with self._lock:
+            new = [
+                activity for activity in activities
+                if activity.type in POSITION_TYPES and activity.id not in self._seen_ids
+            ]
+            if not new:
+                return
+            self._seen_ids.update(activity.id for activity in new)
+            types = np.array([activity.type for activity in new])
+            size = np.array([activity.size for activity in new], dtype=np.float64)
+            price = self._effective_price(types, size, np.array([activity.usdc_size for activity in new]),
+                                          np.array([activity.price for activity in new], dtype=np.float64))
+            side = np.array([-1 if activity.side == 'SELL' or activity.type == 'REDEEM' else 1 for activity in new])
+            wallet = self._wallets.setdefault(wallet_address, len(self._wallets))
+            pair = np.array([self._pair_code(wallet, activity.asset, activity.condition_id) for activity in new],
+                            dtype=np.int32)
+            self._append(wallet, np.array([activity.timestamp for activity in new]), pair, side, size, price)
+
+    def ingest_copies(self, activities: Iterable[UserActivity]):
+        """Add our own fills, used to measure slippage against the leaders they copied"""
+        trades = [activity for activity in activities if activity.type == 'TRADE']
+        if not trades:
+            return
+        with self._lock:
+            rows = {
+                'timestamp': np.array([trade.timestamp for trade in trades]),
+                'wallet': np.full(len(trades), -1),
+                'pair': np.array([self._asset_code(trade.asset) for trade in trades]),  # asset code for copies
+                'side': np.array([-1 if trade.side == 'SELL' else 1 for trade in trades]),
+                'size': np.array([trade.size for trade in trades]),
+                'price': np.array([trade.price for trade in trades]),
+            }
+            self._copies, self._copy_rows = self._extend(self._copies, self._copy_rows, rows)
+
+    def _asset_code(self, asset: str) -> int:
+        return self._assets.setdefault(asset, len(self._assets))
+
+    def _pair_code(self, wallet: int, asset: str, market: str) -> int:
+        key = (wallet, asset)
+        code = self._pairs.get(key)
+        if code is None:
+            code = self._pairs[key] = len(self._pairs)
+            self._pair_asset = _grow(self._pair_asset, code + 1)
+            self._pair_wallet = _grow(self._pair_wallet, code + 1)
+            self._pair_asset[code] = self._asset_code(asset)
+            self._pair_wallet[code] = wallet
+            self._pair_market.append(market)
+            for name in PAIR_SUMS:
+                self._sums[name] = _grow(self._sums[name], code + 1)
+        return code
+
+    @staticmethod
+    def _extend(columns: Dict[str, np.ndarray], used: int,
+                rows: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], int]:
+        count = len(rows['timestamp'])
+        for name in COLUMNS:
+            column = _grow(columns[name], used + count)
+            column[used:used + count] = rows[name]
+            columns[name] = column
+        return columns, used + count
+
+    def _append(self, wallet: int, timestamp: np.ndarray, pair: np.ndarray,
+                side: np.ndarray, size: np.ndarray, price: np.ndarray):
+        rows = {'timestamp': timestamp, 'wallet': np.full(len(pair), wallet), 'pair': pair,
+                'side': side, 'size': size, 'price': price}
+        self._columns, self._rows = self._extend(self._columns, self._rows, rows)
+
+        # Fold the new rows into the running sums
+        for name, values in self._pair_sums(pair, side, size, price, timestamp, len(self._pairs)).items():
+            self._sums[name][:len(values)] += values
+
+    @staticmethod
+    def _pair_sums(pair: np.ndarray, side: np.ndarray, size: np.ndarray, price: np.ndarray,
+                   timestamp: np.ndarray, pairs: int) -> Dict[str, np.ndarray]:
+        buy, sell = side > 0, side < 0
+        bincount = lambda mask, weights: np.bincount(pair[mask], weights=weights[mask], minlength=pairs)
+        return {
+            'buy_shares': bincount(buy, size),
+            'buy_cost': bincount(buy, size * price),
+            'buy_time': bincount(buy, size * timestamp),
+            'sell_shares': bincount(sell, size),
+            'sell_proceeds': bincount(sell, size * price),
+            'sell_time': bincount(sell, size * timestamp),
+            'trades': np.bincount(pair, minlength=pairs).astype(np.float64),
+        }
+
+    def _window_sums(self, since: int) -> Dict[str, np.ndarray]:
+        columns = {name: column[:self._rows] for name, column in self._columns.items()}
+        mask = columns['timestamp'] >= since
+        return self._pair_sums(columns['pair'][mask], columns['side'][mask], columns['size'][mask],
+                               columns['price'][mask], columns['timestamp'][mask].astype(np.float64),
+                               len(self._pairs))
+
+    def report(self, wallet_address: str, window: Optional[float] = None) -> Dict[str, Any]:
+        """Realized PnL, hit rate, holding time, trade frequency and copy slippage for one wallet"""
+        return self.leaderboard(window).get(wallet_address, self._empty_report())
+
+    @staticmethod
+    def _empty_report() -> Dict[str, Any]:
+        return {'realized_pnl': 0.0, 'hit_rate': 0.0, 'markets_closed': 0, 'avg_holding_hours': 0.0,
+                'trades': 0, 'trades_per_day': 0.0, 'volume': 0.0, 'slippage_bps': None, 'copies_matched': 0}
+
+    def leaderboard(self, window: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Reports for every wallet, computed in one pass; `window` limits them to the last N seconds"""
+        now = time.time()
+        with self._lock:
+            pairs = len(self._pairs)
+            if window is None:
+                sums = {name: values[:pairs] for name, values in self._sums.items()}
+                first = self._columns['timestamp'][:self._rows]
+                since = int(first.min()) if len(first) else int(now)
+            else:
+                since = int(now - window)
+                sums = self._window_sums(since)
+            pair_wallet = self._pair_wallet[:pairs]
+            wallets = dict(self._wallets)
+            slippage = self._slippage(since)
+
+        buy_shares, sell_shares = sums['buy_shares'], sums['sell_shares']
+        avg_buy = np.divide(sums['buy_cost'], buy_shares, out=np.zeros(pairs), where=buy_shares > 0)
+        avg_sell = np.divide(sums['sell_proceeds'], sell_shares, out=np.zeros(pairs), where=sell_shares > 0)
+        closed = np.minimum(buy_shares, sell_shares)
+        realized = (avg_sell - avg_buy) * closed
+
+        buy_time = np.divide(sums['buy_time'], buy_shares, out=np.zeros(pairs), where=buy_shares > 0)
+        sell_time = np.divide(sums['sell_time'], sell_shares, out=np.zeros(pairs), where=sell_shares > 0)
+        held = np.clip(sell_time - buy_time, 0, None) * closed
+
+        size = len(wallets)
+        by_wallet = lambda values: np.bincount(pair_wallet, weights=values, minlength=size)
+        has_closed = closed > 0
+        realized_pnl = by_wallet(realized)
+        markets_closed = by_wallet(has_closed.astype(np.float64))
+        wins = by_wallet((has_closed & (realized > 0)).astype(np.float64))
+        closed_shares = by_wallet(closed)
+        held_total = by_wallet(held)
+        trades = by_wallet(sums['trades'])
+        volume = by_wallet(sums['buy_cost'] + sums['sell_proceeds'])
+        days = max((now - since) / SECONDS_PER_DAY, 1.0)
+
+        reports = {}
+        for wallet_address, code in wallets.items():
+            matched, mean_bps = slippage.get(code, (0, None))
+            reports[wallet_address] = {
+                'realized_pnl': float(realized_pnl[code]),
+                'hit_rate': float(wins[code] / markets_closed[code]) if markets_closed[code] else 0.0,
+                'markets_closed': int(markets_closed[code]),
+                'avg_holding_hours': float(held_total[code] / closed_shares[code] / 3600) if closed_shares[code] else 0.0,
+                'trades': int(trades[code]),
+                'trades_per_day': float(trades[code] / days),
+                'volume': float(volume[code]),
+                'slippage_bps': mean_bps,
+                'copies_matched': matched
+            }
+        return reports
+
+    def market_pnl(self, wallet_address: str) -> Dict[str, float]:
+        """All-time realized PnL per market (condition_id) for one wallet"""
+        with self._lock:
+            wallet = self._wallets.get(wallet_address)
+            if wallet is None:
+                return {}
+            pairs = len(self._pairs)
+            sums = {name: values[:pairs] for name, values in self._sums.items()}
+            mine = np.flatnonzero(self._pair_wallet[:pairs] == wallet)
+            markets = [self._pair_market[pair] for pair in mine]
+
+        buy_shares, sell_shares = sums['buy_shares'][mine], sums['sell_shares'][mine]
+        avg_buy = np.divide(sums['buy_cost'][mine], buy_shares, out=np.zeros(len(mine)), where=buy_shares > 0)
+        avg_sell = np.divide(sums['sell_proceeds'][mine], sell_shares, out=np.zeros(len(mine)), where=sell_shares > 0)
+        realized = (avg_sell - avg_buy) * np.minimum(buy_shares, sell_shares)
+
+        result: Dict[str, float] = {}
+        for market, pnl in zip(markets, realized.tolist()):
+            result[market] = result.get(market, 0.0) + pnl
+        return result
+
+    def _slippage(self, since: int) -> Dict[int, Tuple[int, Optional[float]]]:
+        """Match each copy to the latest leader trade on its asset and side; mean bps per leader"""
+        if not self._copy_rows or not self._rows:
+            return {}
+        leader = {name: column[:self._rows] for name, column in self._columns.items()}
+        copies = {name: column[:self._copy_rows] for name, column in self._copies.items()}
+        copy_mask = copies['timestamp'] >= since
+
+        # One sortable int64 key per (asset, side, time): asset and side in the high bits
+        leader_asset = self._pair_asset[leader['pair']].astype(np.int64)
+        leader_key = ((leader_asset * 2 + (leader['side'] > 0)) << 33) | leader['timestamp']
+        copy_key = ((copies['pair'][copy_mask].astype(np.int64) * 2 + (copies['side'][copy_mask] > 0)) << 33) \
+            | copies['timestamp'][copy_mask]
+        order = np.argsort(leader_key, kind='stable')
+        sorted_keys = leader_key[order]
+
+        match = np.searchsorted(sorted_keys, copy_key, side='right') - 1
+        valid = match >= 0
+        match = np.where(valid, match, 0)
+        lag = copy_key - sorted_keys[match]
+        # Same asset and side leave the high bits equal, so the difference is the delay
+        valid &= (lag >= 0) & (lag <= self.copy_window)
+        if not valid.any():
+            return {}
+
+        matched_rows = order[match[valid]]
+        leader_price = leader['price'][matched_rows]
+        side = copies['side'][copy_mask][valid]
+        bps = np.divide((copies['price'][copy_mask][valid] - leader_price) * side, leader_price,
+                        out=np.zeros(len(leader_price)), where=leader_price > 0) * 10000
+        wallets = leader['wallet'][matched_rows]
+        counts = np.bincount(wallets)
+        totals = np.bincount(wallets, weights=bps)
+        return {
+            int(wallet): (int(counts[wallet]), float(totals[wallet] / counts[wallet]))
+            for wallet in np.flatnonzero(counts)
+        }
+
+    def print_leaderboard(self, window: Optional[float] = None):
+        """Print wallets ranked by realized PnL"""
+        reports = sorted(self.leaderboard(window).items(), key=lambda item: item[1]['realized_pnl'], reverse=True)
+        print(f"{Fore.BLUE}🏆 Leader performance{' (last %.0fh)' % (window / 3600) if window else ''}{Style.RESET_ALL}")
+        for wallet_address, report in reports:
+            pnl_color = Fore.GREEN if report['realized_pnl'] >= 0 else Fore.RED
+            slippage = f"{report['slippage_bps']:.0f}bps" if report['slippage_bps'] is not None else "n/a"
+            print(f"  {wallet_address[:8]}...{wallet_address[-8:]} "
+                  f"{pnl_color}${report['realized_pnl']:.2f}{Style.RESET_ALL} | "
+                  f"hit {report['hit_rate']:.0%} of {report['markets_closed']} | "
+                  f"hold {report['avg_holding_hours']:.1f}h | "
+                  f"{report['trades_per_day']:.1f} trades/day | slippage {slippage}")
+
+def main():
+    from services.data_fetcher import ActivityCursor, DataFetcher
+    from storage.activity_archive import ActivityArchive
+    from storage.factory import create_storage
+
+    parser = argparse.ArgumentParser(description="Rank leader wallets by realized performance")
+    parser.add_argument('wallets', nargs='*', default=Config.USER_ADDRESSES, help="Leader wallets to report on")
+    parser.add_argument('--window-hours', type=float, default=None, help="Only the last N hours")
+    parser.add_argument('--copy-days', type=float, default=7, help="Days of our own fills to match for slippage")
+    args = parser.parse_args()
+
+    storage = create_storage()
+    archive = ActivityArchive() if os.path.isdir(Config.ARCHIVE_DIR) else None
+    analytics = LeaderAnalytics(storage, archive)
+    analytics.load(args.wallets)
+
+    # Storage only keeps leader activity; our fills come from the data API
+    data_fetcher = DataFetcher(storage)
+    data_fetcher.commit_cursor(Config.PROXY_WALLET, ActivityCursor(int(time.time() - args.copy_days * SECONDS_PER_DAY)))
+    copies, _ = data_fetcher.fetch_new_activities(Config.PROXY_WALLET)
+    analytics.ingest_copies(copies)
+    print(f"📈 Loaded {analytics._rows} leader trades and {len(copies)} of our fills")
+
+    analytics.print_leaderboard(args.window_hours * 3600 if args.window_hours else None)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
-import requests
 from typing import Dict, Any, Optional
 from config.env import Config
+from helpers.http_client import get_http_client
+from services.order_book import LocalOrderBook, OrderBookManager
 
 class MarketAnalyzer:
     @staticmethod
@@ -8,7 +9,7 @@ class MarketAnalyzer:
         """Get detailed market information"""
         try:
             url = f"{Config.POLYMARKET_API_URL}/markets/{condition_id}"
-            response = requests.get(url, timeout=10)
+            response = get_http_client().get(url)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -16,21 +17,22 @@ class MarketAnalyzer:
             return None
     
     @staticmethod
-    def check_market_liquidity(token_id: str, clob_client) -> Dict[str, Any]:
+    def check_market_liquidity(token_id: str, clob_client,
+                               book_manager: Optional[OrderBookManager] = None) -> Dict[str, Any]:
         """Check market liquidity before trading"""
         try:
-            orderbook = clob_client.get_order_book(token_id)
+            if book_manager:
+                orderbook = book_manager.get_book(token_id)
+            else:
+                orderbook = LocalOrderBook.from_summary(token_id, clob_client.get_order_book(token_id))
             
             # Calculate total liquidity
-            bid_liquidity = sum(float(bid['size']) * float(bid['price']) 
-                              for bid in orderbook.bids) if orderbook.bids else 0
-            ask_liquidity = sum(float(ask['size']) * float(ask['price']) 
-                              for ask in orderbook.asks) if orderbook.asks else 0
+            bid_liquidity = orderbook.bids.notional()
+            ask_liquidity = orderbook.asks.notional()
             
             # Get spread
-            if orderbook.bids and orderbook.asks:
-                best_bid = max(float(bid['price']) for bid in orderbook.bids)
-                best_ask = min(float(ask['price']) for ask in orderbook.asks)
+            best_bid, best_ask = orderbook.best_bid(), orderbook.best_ask()
+            if best_bid is not None and best_ask is not None:
                 spread = best_ask - best_bid
                 spread_pct = spread / best_ask if best_ask > 0 else 1.0
             else:
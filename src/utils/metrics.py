@@ -0,0 +1,78 @@
+import threading
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional
+
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 30]  # seconds, upper bounds
+
+class ExecutionMetrics:
+    """Queue depth, concurrency and per-trade wall time for the trade executor"""
+
+    def __init__(self, queue_depth: Optional[Callable[[], int]] = None, window: int = 1000):
+        self._queue_depth = queue_depth
+        self._lock = threading.Lock()
+        self._wall_times = deque(maxlen=window)
+        self._window = window
+        self._latencies: Dict[str, deque] = {}
+        self.in_flight = 0
+        self.waiting = 0  # dispatched but queued behind an earlier trade on the same asset
+        self.succeeded = 0
+        self.failed = 0
+
+    def trade_waiting(self, delta: int):
+        with self._lock:
+            self.waiting += delta
+
+    def trade_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def trade_finished(self, wall_time: float, success: bool):
+        with self._lock:
+            self.in_flight -= 1
+            self._wall_times.append(wall_time)
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    def record_latency(self, name: str, seconds: float):
+        """Add a sample to a named latency series, e.g. detection to post"""
+        with self._lock:
+            self._latencies.setdefault(name, deque(maxlen=self._window)).append(seconds)
+
+    def latency_histogram(self, name: str) -> List[int]:
+        """Sample counts per LATENCY_BUCKETS bound, plus one overflow bucket"""
+        with self._lock:
+            samples = list(self._latencies.get(name, []))
+        counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        for seconds in samples:
+            counts[next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))] += 1
+        return counts
+
+    def format_histogram(self, name: str) -> str:
+        labels = [f"≤{bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return " | ".join(f"{label}: {count}" for label, count in zip(labels, self.latency_histogram(name)))
+
+    @staticmethod
+    def _percentile(samples, fraction: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            wall_times = sorted(self._wall_times)
+            latencies = {name: sorted(samples) for name, samples in self._latencies.items()}
+            snapshot = {
+                'queue_depth': (self._queue_depth() if self._queue_depth else 0) + self.waiting,
+                'in_flight': self.in_flight,
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'wall_time_p50': self._percentile(wall_times, 0.5),
+                'wall_time_p95': self._percentile(wall_times, 0.95),
+                'wall_time_max': wall_times[-1] if wall_times else 0.0
+            }
+            for name, samples in latencies.items():
+                snapshot[f'{name}_p50'] = self._percentile(samples, 0.5)
+                snapshot[f'{name}_p95'] = self._percentile(samples, 0.95)
+            return snapshot
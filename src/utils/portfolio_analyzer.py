@@ -1,38 +1,50 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from models.user_activity import UserPosition
+from utils.position_table import PositionTable
 from colorama import Fore, Style
 
 class PortfolioAnalyzer:
     @staticmethod
     def analyze_positions(positions: List[UserPosition]) -> Dict[str, Any]:
-        """Analyze a portfolio of positions"""
-        if not positions:
-            return {
-                'total_value': 0,
-                'total_pnl': 0,
-                'num_positions': 0,
-                'profitable_positions': 0,
-                'losing_positions': 0
-            }
-        
-        total_value = sum(pos.current_value for pos in positions)
-        total_pnl = sum(pos.cash_pnl for pos in positions)
-        profitable = sum(1 for pos in positions if pos.cash_pnl > 0)
-        losing = sum(1 for pos in positions if pos.cash_pnl < 0)
+        """Analyze a plain list of positions; building a PositionTable per call would cost more"""
+        total_value = total_pnl = realized_pnl = 0.0
+        profitable = losing = 0
+        for pos in positions:
+            total_value += pos.current_value
+            total_pnl += pos.cash_pnl
+            realized_pnl += pos.realized_pnl
+            if pos.cash_pnl > 0:
+                profitable += 1
+            elif pos.cash_pnl < 0:
+                losing += 1
         
         return {
+            'num_positions': len(positions),
             'total_value': total_value,
             'total_pnl': total_pnl,
-            'num_positions': len(positions),
             'profitable_positions': profitable,
             'losing_positions': losing,
+            'realized_pnl': realized_pnl,
             'win_rate': profitable / len(positions) if positions else 0
         }
     
     @staticmethod
-    def print_portfolio_summary(wallet_address: str, positions: List[UserPosition]):
-        """Print a formatted portfolio summary"""
-        analysis = PortfolioAnalyzer.analyze_positions(positions)
+    def analyze_wallet(table: PositionTable, wallet_address: str) -> Dict[str, Any]:
+        """Summary, concentration and per-market breakdown for a wallet kept in a PositionTable"""
+        analysis = table.summary(wallet_address)
+        analysis.update(table.concentration(wallet_address))
+        analysis['by_market'] = table.breakdown('market', wallet_address)
+        analysis['by_outcome'] = table.breakdown('outcome', wallet_address)
+        return analysis
+    
+    @staticmethod
+    def print_portfolio_summary(wallet_address: str, positions: Optional[List[UserPosition]] = None,
+                                table: Optional[PositionTable] = None):
+        """Print a formatted portfolio summary from a position list or a live PositionTable"""
+        if table is not None:
+            analysis = PortfolioAnalyzer.analyze_wallet(table, wallet_address)
+        else:
+            analysis = PortfolioAnalyzer.analyze_positions(positions or [])
         
         pnl_color = Fore.GREEN if analysis['total_pnl'] >= 0 else Fore.RED
         pnl_symbol = "+" if analysis['total_pnl'] >= 0 else ""
@@ -0,0 +1,241 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from models.user_activity import UserPosition
+
+# Float fields copied from UserPosition into columns
+VALUE_COLUMNS = ('size', 'avg_price', 'initial_value', 'current_value', 'cash_pnl', 'realized_pnl', 'cur_price')
+# Running per-wallet totals, one row per wallet code
+TOTALS = ('num_positions', 'total_value', 'total_pnl', 'profitable_positions', 'losing_positions', 'realized_pnl')
+GROUPS = ('wallet', 'market', 'outcome')
+
+class PositionTable:
+    """Columnar positions for many wallets, with running totals per wallet.
+
+    Each position is one row across NumPy columns; wallet, market
+    (condition_id), outcome and asset are int32 codes. Rows are updated in
+    place as positions change and freed rows are reused. Per-wallet totals
+    (value, PnL, win/loss counts) are adjusted by the change of each row,
+    so `summary` costs the same for ten positions or ten thousand.
+    Breakdowns by wallet, market or outcome and concentration figures are
+    single vectorized passes (`np.bincount`) cached until the next change.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self._lock = threading.RLock()
+        self._codes: Dict[str, Dict[str, int]] = {group: {} for group in GROUPS + ('asset',)}
+        self._names: Dict[str, List[str]] = {group: [] for group in GROUPS + ('asset',)}
+        self._rows: Dict[int, Dict[str, int]] = {}  # wallet code -> asset -> row
+        self._free: List[int] = []
+        self._used = 0  # rows below this index have been handed out
+        self.active = np.zeros(capacity, dtype=bool)
+        self.keys = {group: np.zeros(capacity, dtype=np.int32) for group in GROUPS + ('asset',)}
+        self.values = {name: np.zeros(capacity, dtype=np.float64) for name in VALUE_COLUMNS}
+        self._totals = np.zeros((0, len(TOTALS)), dtype=np.float64)
+        self.version = 0
+        self._cache: Dict[Tuple[Any, ...], Tuple[int, Any]] = {}
+
+    @classmethod
+    def from_positions(cls, wallet_address: str, positions: List[UserPosition]) -> 'PositionTable':
+        table = cls(capacity=max(len(positions), 1))
+        table.replace_wallet(wallet_address, positions)
+        return table
+
+    def __len__(self) -> int:
+        return int(self.active.sum())
+
+    def _code(self, group: str, name: Optional[str]) -> int:
+        name = name or ''
+        code = self._codes[group].get(name)
+        if code is None:
+            code = self._codes[group][name] = len(self._names[group])
+            self._names[group].append(name)
+            if group == 'wallet':
+                self._totals = np.vstack([self._totals, np.zeros((1, len(TOTALS)))])
+        return code
+
+    def _grow(self):
+        capacity = len(self.active) * 2
+        self.active = np.resize(self.active, capacity)
+        self.active[self._used:] = False
+        for columns in (self.keys, self.values):
+            for name, column in columns.items():
+                grown = np.zeros(capacity, dtype=column.dtype)
+                grown[:len(column)] = column
+                columns[name] = grown
+
+    def _row_for(self, wallet: int, asset: str) -> int:
+        rows = self._rows.setdefault(wallet, {})
+        row = rows.get(asset)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._used == len(self.active):
+                    self._grow()
+                row = self._used
+                self._used += 1
+            rows[asset] = row
+            self.active[row] = True
+            self.keys['wallet'][row] = wallet
+            self.keys['asset'][row] = self._code('asset', asset)
+        return row
+
+    def _contribution(self, row: int) -> np.ndarray:
+        pnl = self.values['cash_pnl'][row]
+        return np.array([1.0, self.values['current_value'][row], pnl,
+                         float(pnl > 0), float(pnl < 0), self.values['realized_pnl'][row]])
+
+    def _write(self, row: int, position: UserPosition):
+        self.keys['market'][row] = self._code('market', position.condition_id)
+        self.keys['outcome'][row] = self._code('outcome', position.outcome)
+        for name in VALUE_COLUMNS:
+            self.values[name][row] = getattr(position, name)
+
+    def upsert(self, wallet_address: str, position: UserPosition):
+        """Insert or update one position, adjusting the wallet's totals by the difference"""
+        with self._lock:
+            wallet = self._code('wallet', wallet_address)
+            existing = position.asset in self._rows.get(wallet, {})
+            row = self._row_for(wallet, position.asset)
+            if existing:
+                self._totals[wallet] -= self._contribution(row)
+            self._write(row, position)
+            self._totals[wallet] += self._contribution(row)
+            self.version += 1
+
+    def remove(self, wallet_address: str, asset: str):
+        with self._lock:
+            wallet = self._codes['wallet'].get(wallet_address)
+            row = self._rows.get(wallet, {}).pop(asset, None) if wallet is not None else None
+            if row is None:
+                return
+            self._totals[wallet] -= self._contribution(row)
+            self.active[row] = False
+            self._free.append(row)
+            self.version += 1
+
+    def replace_wallet(self, wallet_address: str, positions: Iterable[UserPosition]):
+        """Swap in a fresh snapshot of a wallet's positions in one bulk write"""
+        positions = list(positions)
+        with self._lock:
+            wallet = self._code('wallet', wallet_address)
+            keep = {position.asset for position in positions}
+            rows = self._rows.setdefault(wallet, {})
+            for asset in [asset for asset in rows if asset not in keep]:
+                row = rows.pop(asset)
+                self.active[row] = False
+                self._free.append(row)
+
+            if positions:
+                index = np.array([self._row_for(wallet, position.asset) for position in positions])
+                self.keys['market'][index] = [self._code('market', position.condition_id) for position in positions]
+                self.keys['outcome'][index] = [self._code('outcome', position.outcome) for position in positions]
+                for name in VALUE_COLUMNS:
+                    self.values[name][index] = [getattr(position, name) for position in positions]
+
+            # A full snapshot is a good point to recompute, which also clears float drift
+            self._recount(wallet)
+            self.version += 1
+
+    def mark_price(self, asset: str, price: float):
+        """Revalue every wallet's position in an asset at a new price"""
+        with self._lock:
+            code = self._codes['asset'].get(asset)
+            if code is None:
+                return
+            rows = np.flatnonzero(self.active[:self._used] & (self.keys['asset'][:self._used] == code))
+            if not len(rows):
+                return
+            wallets = self.keys['wallet'][rows]
+            for wallet in np.unique(wallets):
+                self._totals[wallet] -= self._contributions(rows[wallets == wallet])
+            self.values['cur_price'][rows] = price
+            self.values['current_value'][rows] = self.values['size'][rows] * price
+            self.values['cash_pnl'][rows] = self.values['current_value'][rows] - self.values['initial_value'][rows]
+            for wallet in np.unique(wallets):
+                self._totals[wallet] += self._contributions(rows[wallets == wallet])
+            self.version += 1
+
+    def _contributions(self, rows: np.ndarray) -> np.ndarray:
+        pnl = self.values['cash_pnl'][rows]
+        return np.array([len(rows), self.values['current_value'][rows].sum(), pnl.sum(),
+                         (pnl > 0).sum(), (pnl < 0).sum(), self.values['realized_pnl'][rows].sum()])
+
+    def _recount(self, wallet: int):
+        rows = np.flatnonzero(self.active[:self._used] & (self.keys['wallet'][:self._used] == wallet))
+        self._totals[wallet] = self._contributions(rows)
+
+    def summary(self, wallet_address: str) -> Dict[str, Any]:
+        """Value, PnL and win/loss counts for one wallet, from the running totals"""
+        with self._lock:
+            wallet = self._codes['wallet'].get(wallet_address)
+            totals = self._totals[wallet] if wallet is not None else np.zeros(len(TOTALS))
+        summary = dict(zip(TOTALS, totals.tolist()))
+        for name in ('num_positions', 'profitable_positions', 'losing_positions'):
+            summary[name] = int(round(summary[name]))
+        summary['win_rate'] = (summary['profitable_positions'] / summary['num_positions']
+                               if summary['num_positions'] else 0)
+        return summary
+
+    def _cached(self, key: Tuple[Any, ...], compute):
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == self.version:
+            return entry[1]
+        result = compute()
+        self._cache[key] = (self.version, result)
+        return result
+
+    def _mask(self, wallet_address: Optional[str]) -> np.ndarray:
+        mask = self.active[:self._used].copy()
+        if wallet_address is not None:
+            mask &= self.keys['wallet'][:self._used] == self._codes['wallet'].get(wallet_address, -1)
+        return mask
+
+    def breakdown(self, by: str, wallet_address: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Exposure, PnL and win rate per wallet, market or outcome, optionally for one wallet"""
+        if by not in GROUPS:
+            raise ValueError(f"Unknown breakdown: {by}")
+        with self._lock:
+            return self._cached(('breakdown', by, wallet_address), lambda: self._breakdown(by, wallet_address))
+
+    def _breakdown(self, by: str, wallet_address: Optional[str]) -> Dict[str, Dict[str, float]]:
+        mask = self._mask(wallet_address)
+        groups = self.keys[by][:self._used][mask]
+        value = self.values['current_value'][:self._used][mask]
+        pnl = self.values['cash_pnl'][:self._used][mask]
+        size = len(self._names[by])
+        count = np.bincount(groups, minlength=size)
+        value_sum = np.bincount(groups, weights=value, minlength=size)
+        pnl_sum = np.bincount(groups, weights=pnl, minlength=size)
+        wins = np.bincount(groups, weights=pnl > 0, minlength=size)
+        losses = np.bincount(groups, weights=pnl < 0, minlength=size)
+        total_value = value.sum()
+
+        return {
+            self._names[by][code]: {
+                'num_positions': int(count[code]),
+                'total_value': float(value_sum[code]),
+                'total_pnl': float(pnl_sum[code]),
+                'profitable_positions': int(wins[code]),
+                'losing_positions': int(losses[code]),
+                'win_rate': float(wins[code] / count[code]),
+                'exposure_share': float(value_sum[code] / total_value) if total_value else 0.0
+            }
+            for code in np.flatnonzero(count)
+        }
+
+    def concentration(self, wallet_address: str) -> Dict[str, float]:
+        """Largest market's share of a wallet's value and the Herfindahl index across markets"""
+        with self._lock:
+            return self._cached(('concentration', wallet_address), lambda: self._concentration(wallet_address))
+
+    def _concentration(self, wallet_address: str) -> Dict[str, float]:
+        mask = self._mask(wallet_address)
+        value = np.bincount(self.keys['market'][:self._used][mask],
+                            weights=self.values['current_value'][:self._used][mask])
+        total = value.sum()
+        if total <= 0:
+            return {'largest_share': 0.0, 'hhi': 0.0}
+        shares = value / total
+        return {'largest_share': float(shares.max()), 'hhi': float((shares ** 2).sum())}
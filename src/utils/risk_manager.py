@@ -1,12 +1,16 @@
 from typing import Dict, Any, Optional
 from config.env import Config
 from models.user_activity import UserActivity, UserPosition
+from utils.position_table import PositionTable
 
 class RiskManager:
-    def __init__(self, max_position_size: float = 100.0, max_daily_loss: float = 50.0):
+    def __init__(self, max_position_size: float = 100.0, max_daily_loss: float = 50.0,
+                 position_table: Optional[PositionTable] = None, wallet_address: str = Config.PROXY_WALLET):
         self.max_position_size = max_position_size
         self.max_daily_loss = max_daily_loss
         self.daily_loss = 0.0
+        self.position_table = position_table  # e.g. PositionBook.table, for what we already hold
+        self.wallet_address = wallet_address
         
     def check_trade_risk(self, trade: UserActivity, my_balance: float, 
                         my_position: Optional[UserPosition] = None) -> Dict[str, Any]:
@@ -37,6 +41,11 @@ class RiskManager:
         
         # Check position concentration (don't put more than 20% in one market)
         max_single_position = my_balance * 0.2
+        if self.position_table is not None:
+            # Count what is already held in the market against balance plus holdings
+            portfolio_value = my_balance + self.position_table.summary(self.wallet_address)['total_value']
+            held = self.position_table.breakdown('market', self.wallet_address).get(trade.condition_id, {})
+            max_single_position = max(0.0, portfolio_value * 0.2 - held.get('total_value', 0.0))
         if trade.usdc_size > max_single_position:
             risk_checks['suggested_size'] = max_single_position
         
@@ -0,0 +1,120 @@
+import os
+import sys
+import pytest
+
+# Config refuses to import without these; tests never sign or send anything
+os.environ.setdefault('USER_ADDRESS', '0x1111111111111111111111111111111111111111')
+os.environ.setdefault('PROXY_WALLET', '0x2222222222222222222222222222222222222222')
+os.environ.setdefault('PK', '0x' + '01' * 32)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from models.user_activity import UserActivity
+
+WALLET = os.environ['USER_ADDRESS']
+
+@pytest.fixture
+def make_activity():
+    """Build a UserActivity with sensible defaults; keyword arguments override fields"""
+    def make(index: int = 0, **fields) -> UserActivity:
+        values = dict(
+            proxy_wallet=WALLET,
+            timestamp=1_750_000_000 + index,
+            condition_id=f"0xcondition{index % 7}",
+            type='TRADE',
+            size=10.0,
+            usdc_size=5.0,
+            transaction_hash=f"0xhash{index}",
+            price=0.5,
+            asset=f"asset{index % 7}",
+            side='BUY',
+            outcome_index=0,
+            title='Will it rain?',
+            slug='will-it-rain',
+            outcome='Yes',
+            id=f"activity-{index}",
+        )
+        values.update(fields)
+        return UserActivity(**values)
+    return make
+
+class StubServer:
+    """Local HTTP server answering with `handler(method, path, body) -> (status, headers, body)`"""
+
+    def __init__(self, handler):
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                stub.requests.append((self.command, self.path, body))
+                status, headers, payload = handler(self.command, self.path, body)
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in {'Content-Type': 'application/json', **headers}.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _serve
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub_server():
+    """Start StubServers for a test: `stub_server(handler)` returns one with `.url` and `.requests`"""
+    servers = []
+
+    def start(handler) -> StubServer:
+        server = StubServer(handler)
+        servers.append(server)
+        return server
+    yield start
+    for server in servers:
+        server.close()
+
+class ActivityApi:
+    """Serves /activity like the data API: newest first, filtered by `start`, paged by limit/offset"""
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, timestamp: int, **fields) -> dict:
+        item = {
+            'proxyWallet': WALLET, 'timestamp': timestamp, 'conditionId': '0xcondition', 'type': 'TRADE',
+            'size': 10, 'usdcSize': 5, 'transactionHash': f"0xhash{len(self.items)}", 'price': 0.5,
+            'asset': 'asset0', 'side': 'BUY', 'outcomeIndex': 0, 'title': 'Will it rain?',
+            'slug': 'will-it-rain', 'outcome': 'Yes', 'id': f"api-{len(self.items)}",
+        }
+        item.update(fields)
+        self.items.append(item)
+        return item
+
+    def __call__(self, method, path, body):
+        from urllib.parse import parse_qs, urlparse
+        query = {name: values[0] for name, values in parse_qs(urlparse(path).query).items()}
+        start, limit, offset = int(query.get('start', 0)), int(query.get('limit', 100)), int(query.get('offset', 0))
+        matching = sorted((item for item in self.items if item['timestamp'] >= start),
+                          key=lambda item: item['timestamp'], reverse=True)
+        return 200, {}, matching[offset:offset + limit]
+
+@pytest.fixture
+def activity_api(stub_server):
+    """A stubbed data API with no activity yet, as (ActivityApi, base url)"""
+    api = ActivityApi()
+    return api, stub_server(api).url
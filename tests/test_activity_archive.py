@@ -0,0 +1,67 @@
+import os
+import numpy as np
+import pytest
+from storage.activity_archive import ActivityArchive
+
+WALLET = '0x1111111111111111111111111111111111111111'
+DAY = 86400
+
+@pytest.fixture
+def archive(tmp_path):
+    return ActivityArchive(root=str(tmp_path))
+
+@pytest.fixture
+def activities(make_activity):
+    """Six activities either side of a UTC midnight, with every field varied"""
+    midnight = 1_750_032_000  # 2025-06-16 00:00 UTC
+    return [
+        make_activity(i, timestamp=midnight - 3000 + 1000 * i, side='SELL' if i % 2 else 'BUY',
+                      type='REDEEM' if i == 5 else 'TRADE', size=10.0 + i, usdc_size=4.5 + i,
+                      price=0.25 + i / 100, outcome_index=i % 2, outcome='No' if i % 2 else 'Yes',
+                      bot_executed=i % 3 == 0, bot_executed_time=i)
+        for i in range(6)
+    ]
+
+def test_round_trip_across_days_keeps_every_field(archive, activities):
+    archive.append(WALLET, activities)
+
+    assert archive.days(WALLET) == ['2025-06-15', '2025-06-16']
+    assert [activity.to_dict() for activity in archive.load_activities(WALLET)] == \
+        [activity.to_dict() for activity in activities]
+
+def test_reappending_an_id_replaces_the_row(archive, activities):
+    archive.append(WALLET, activities)
+    updated = activities[1]
+    updated.bot_executed = True
+    archive.append(WALLET, [updated])
+
+    loaded = archive.load_activities(WALLET)
+    assert [activity.id for activity in loaded] == [activity.id for activity in activities]
+    assert loaded[1].bot_executed is True
+    assert archive.get_stats(WALLET) == {'days': 2, 'activities': 6}
+
+def test_column_is_limited_to_start_and_end(archive, activities):
+    archive.append(WALLET, activities)
+    timestamps = [activity.timestamp for activity in activities]
+
+    sizes = archive.column(WALLET, 'size', start=timestamps[2], end=timestamps[4])
+    assert sizes.tolist() == [12.0, 13.0, 14.0]
+    sides = archive.column(WALLET, 'side', start=timestamps[3])
+    assert sides.tolist() == ['SELL', 'BUY', 'SELL']
+    assert np.array_equal(archive.column(WALLET, 'timestamp'), timestamps)
+    assert len(archive.column(WALLET, 'price', start=timestamps[-1] + DAY)) == 0
+
+def test_interrupted_swap_is_recovered(archive, activities, make_activity):
+    archive.append(WALLET, activities)
+    # Crash after moving the day aside and before the new copy was renamed into place
+    day_dir = os.path.join(archive.root, WALLET, '2025-06-16')
+    os.rename(day_dir, day_dir + '.old')
+    assert archive.days(WALLET) == ['2025-06-15']
+
+    late = make_activity(9, timestamp=activities[-1].timestamp + 60)
+    archive.append(WALLET, [late])
+
+    assert archive.days(WALLET) == ['2025-06-15', '2025-06-16']
+    assert not os.path.exists(day_dir + '.old')
+    assert [activity.id for activity in archive.load_activities(WALLET)] == \
+        [activity.id for activity in activities] + [late.id]
@@ -0,0 +1,72 @@
+import json
+from services.balance_service import BalanceService
+
+MY_WALLET = '0x2222222222222222222222222222222222222222'
+LEADER = '0x1111111111111111111111111111111111111111'
+BALANCES = {MY_WALLET[2:].lower(): 125_500_000, LEADER[2:].lower(): 9_000_000_000}  # 6 decimals
+
+class JsonRpcStub:
+    """Answers eth_blockNumber and USDC balanceOf eth_calls, single or batched"""
+
+    def __init__(self):
+        self.block = 100
+        self.fail = False
+
+    def answer(self, call):
+        if call['method'] == 'eth_blockNumber':
+            result = hex(self.block)
+        elif call['method'] == 'eth_call':
+            owner = call['params'][0]['data'][-40:].lower()
+            result = '0x' + format(BALANCES.get(owner, 0), '064x')
+        elif call['method'] == 'eth_chainId':
+            result = hex(137)
+        else:
+            return {'jsonrpc': '2.0', 'id': call['id'], 'error': {'code': -32601, 'message': 'not found'}}
+        return {'jsonrpc': '2.0', 'id': call['id'], 'result': result}
+
+    def __call__(self, method, path, body):
+        if self.fail:
+            return 500, {}, {'error': 'down'}
+        payload = json.loads(body)
+        if isinstance(payload, list):
+            return 200, {}, [self.answer(call) for call in payload]
+        return 200, {}, self.answer(payload)
+
+def test_balances_come_from_one_batched_request(stub_server):
+    rpc = JsonRpcStub()
+    server = stub_server(rpc)
+    service = BalanceService(rpc_url=server.url, block_time=60)
+
+    balances = service.get_balances([MY_WALLET, LEADER])
+    assert balances == {MY_WALLET: 125.5, LEADER: 9000.0}
+    posts = [request for request in server.requests if request[0] == 'POST']
+    assert len(posts) == 1
+    assert len(json.loads(posts[0][2])) == 3  # block number plus two balanceOf calls
+
+def test_repeat_reads_within_a_block_are_cached(stub_server):
+    server = stub_server(JsonRpcStub())
+    service = BalanceService(rpc_url=server.url, block_time=60)
+    service.get_balances([MY_WALLET, LEADER])
+    requests_after_first = len(server.requests)
+
+    assert service.get_balance(LEADER) == 9000.0
+    assert service.get_balances([LEADER, MY_WALLET])[MY_WALLET] == 125.5
+    assert len(server.requests) == requests_after_first
+
+def test_expired_cache_is_refreshed(stub_server):
+    server = stub_server(JsonRpcStub())
+    service = BalanceService(rpc_url=server.url, block_time=0)
+    service.get_balances([MY_WALLET])
+    service.get_balances([MY_WALLET])
+    assert len(server.requests) == 2
+
+def test_rpc_errors_keep_last_known_balances(stub_server):
+    rpc = JsonRpcStub()
+    server = stub_server(rpc)
+    service = BalanceService(rpc_url=server.url, block_time=0)
+    service.get_balances([MY_WALLET])
+
+    rpc.fail = True
+    assert service.get_balances([MY_WALLET]) == {MY_WALLET: 125.5}
+    cached, age = service.get_cached_balances([MY_WALLET])
+    assert cached == {MY_WALLET: 125.5} and age >= 0
@@ -0,0 +1,44 @@
+import time
+import pytest
+from config.env import Config
+from helpers.http_client import HttpClient
+from services.data_fetcher import DataFetcher
+
+WALLET = '0xleader'
+
+@pytest.fixture
+def fetcher(activity_api, tmp_path, monkeypatch):
+    api, url = activity_api
+    monkeypatch.setattr(Config, 'POLYMARKET_API_URL', url)
+    monkeypatch.setattr(Config, 'ACTIVITY_PAGE_SIZE', 3)
+    fetcher = DataFetcher(storage=None, http_client=HttpClient(), balance_service=object())
+    return api, fetcher
+
+def test_pages_back_until_the_gap_is_covered(fetcher):
+    api, fetcher = fetcher
+    now = int(time.time())
+    for i in range(7):
+        api.add(now - 100 + i)
+
+    activities, cursor = fetcher.fetch_new_activities(WALLET)
+    assert [activity.timestamp for activity in activities] == [now - 100 + i for i in range(7)]
+    assert cursor.timestamp == now - 94 and cursor.ids == {'api-6'}
+
+def test_cursor_moves_only_when_committed(fetcher):
+    api, fetcher = fetcher
+    now = int(time.time())
+    api.add(now - 10)
+    api.add(now - 5)
+
+    first, cursor = fetcher.fetch_new_activities(WALLET)
+    # Not committed, e.g. storing failed: the same activities come back
+    again, _ = fetcher.fetch_new_activities(WALLET)
+    assert [activity.id for activity in again] == [activity.id for activity in first]
+
+    fetcher.commit_cursor(WALLET, cursor)
+    assert fetcher.fetch_new_activities(WALLET)[0] == []
+
+    api.add(now - 5)  # same second as the cursor, not returned before
+    api.add(now - 1)
+    activities, _ = fetcher.fetch_new_activities(WALLET)
+    assert [activity.id for activity in activities] == ['api-2', 'api-3']
@@ -0,0 +1,27 @@
+from utils.dedup_index import BloomFilter, DedupIndex
+
+NOW = 1_750_000_000
+
+def test_add_rejects_ids_seen_in_neighbouring_buckets():
+    index = DedupIndex(window=3600, bucket_seconds=60, clock=lambda: NOW)
+    assert index.add('a', NOW - 10)
+    assert not index.add('a', NOW - 10)
+    assert not index.add('a', NOW + 50)  # clock skew between sources
+    assert len(index) == 1
+
+def test_discard_releases_a_claim():
+    index = DedupIndex(window=3600, bucket_seconds=60, clock=lambda: NOW)
+    index.add('a', NOW - 10)
+    assert index.discard('a', NOW - 10)
+    assert not index.discard('a', NOW - 10)
+    assert len(index) == 0
+    assert index.add('a', NOW - 10)
+
+def test_expired_ids_move_into_bloom_filter():
+    now = [NOW]
+    index = DedupIndex(window=600, bucket_seconds=60, bloom=BloomFilter(capacity=1000), clock=lambda: now[0])
+    index.add('old', NOW - 30)
+    now[0] += 3600
+    assert len(index) == 0
+    assert index.seen('old', NOW - 30)
+    assert not index.add('old', NOW - 30)
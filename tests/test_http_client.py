@@ -0,0 +1,27 @@
+from helpers.http_client import HttpClient
+
+def test_rate_limit_is_returned_without_retrying(stub_server):
+    server = stub_server(lambda method, path, body: (429, {'Retry-After': '30'}, {'error': 'rate limited'}))
+    client = HttpClient(max_retries=3, backoff_factor=0)
+
+    response = client.get(f"{server.url}/activity")
+    assert response.status_code == 429
+    assert len(server.requests) == 1  # the poll scheduler decides how long to wait
+
+def test_server_errors_are_retried(stub_server):
+    statuses = iter([503, 502, 200])
+    server = stub_server(lambda method, path, body: (next(statuses), {}, {'ok': True}))
+    client = HttpClient(max_retries=3, backoff_factor=0)
+
+    response = client.get(f"{server.url}/positions")
+    assert response.status_code == 200
+    assert len(server.requests) == 3
+
+def test_connections_are_reused(stub_server):
+    server = stub_server(lambda method, path, body: (200, {}, []))
+    client = HttpClient()
+    for _ in range(5):
+        client.get(f"{server.url}/activity")
+    stats = client.get_stats()
+    assert stats['requests'] == 5
+    assert stats['connections'] == 1
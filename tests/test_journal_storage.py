@@ -0,0 +1,73 @@
+import os
+from config.env import Config
+from storage import factory
+from storage.journal_storage import JournalStorage
+from storage.local_storage import LocalStorage
+
+WALLET = '0xleader'
+
+def test_appends_survive_reload(tmp_path, make_activity):
+    storage = JournalStorage(str(tmp_path), fsync=False)
+    storage.append_activities(WALLET, [make_activity(i) for i in range(3)])
+    storage.append_activities(WALLET, [make_activity(2), make_activity(3)])  # duplicate id ignored
+
+    reloaded = JournalStorage(str(tmp_path), fsync=False)
+    assert sorted(activity.id for activity in reloaded.load_activities(WALLET)) == [f"activity-{i}" for i in range(4)]
+
+def test_status_changes_are_replayed(tmp_path, make_activity):
+    storage = JournalStorage(str(tmp_path), fsync=False)
+    storage.append_activities(WALLET, [make_activity(0), make_activity(1)])
+    storage.mark_trade_executed(WALLET, 'activity-0', True)
+    storage.mark_trade_executed(WALLET, 'activity-1', False)
+
+    reloaded = {activity.id: activity for activity in JournalStorage(str(tmp_path)).load_activities(WALLET)}
+    assert reloaded['activity-0'].bot_executed
+    assert not reloaded['activity-1'].bot_executed
+    assert reloaded['activity-1'].bot_executed_time == 1
+
+def test_torn_tail_is_truncated(tmp_path, make_activity):
+    storage = JournalStorage(str(tmp_path), fsync=False)
+    storage.append_activities(WALLET, [make_activity(0)])
+    journal_file = storage._get_journal_file(WALLET)
+    with open(journal_file, 'a') as f:
+        f.write('{"op":"add","activity":{"proxy')  # crash mid-append
+    size_before = os.path.getsize(journal_file)
+
+    reloaded = JournalStorage(str(tmp_path), fsync=False)
+    assert [activity.id for activity in reloaded.load_activities(WALLET)] == ['activity-0']
+    assert os.path.getsize(journal_file) < size_before
+    reloaded.append_activities(WALLET, [make_activity(1)])
+    assert len(JournalStorage(str(tmp_path)).load_activities(WALLET)) == 2
+
+def test_compaction_empties_journal(tmp_path, make_activity):
+    storage = JournalStorage(str(tmp_path), compact_every=5, fsync=False)
+    storage.append_activities(WALLET, [make_activity(i) for i in range(5)])
+    assert os.path.getsize(storage._get_journal_file(WALLET)) == 0
+    storage.remove_activities(WALLET, ['activity-0'])
+    assert len(JournalStorage(str(tmp_path)).load_activities(WALLET)) == 4
+
+def test_legacy_json_is_initial_snapshot(tmp_path, make_activity):
+    LocalStorage(str(tmp_path)).save_activities(WALLET, [make_activity(0)])
+    storage = JournalStorage(str(tmp_path), fsync=False)
+    storage.append_activities(WALLET, [make_activity(1)])
+    assert len(storage.load_activities(WALLET)) == 2
+
+def test_pending_trades_respect_retry_limit(tmp_path, make_activity, monkeypatch):
+    storage = JournalStorage(str(tmp_path), fsync=False)
+    storage.append_activities(WALLET, [
+        make_activity(0),
+        make_activity(1, bot_executed_time=1),
+        make_activity(2, type='MERGE'),
+        make_activity(3, bot_executed=True),
+    ])
+    monkeypatch.setattr(Config, 'RETRY_LIMIT', 1)
+    assert [activity.id for activity in storage.get_pending_trades(WALLET)] == ['activity-0']
+    monkeypatch.setattr(Config, 'RETRY_LIMIT', 5)
+    assert len(storage.get_pending_trades(WALLET)) == 2
+
+def test_factory_passes_fsync_setting(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'STORAGE_BACKEND', 'journal')
+    monkeypatch.setattr(Config, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'JOURNAL_FSYNC', False)
+    storage = factory.create_storage()
+    assert isinstance(storage, JournalStorage) and storage.fsync is False
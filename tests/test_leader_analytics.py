@@ -0,0 +1,80 @@
+import time
+import pytest
+from services.trade_executor import TradeExecutor
+from services.trade_monitor import TradeMonitor
+from storage.activity_archive import ActivityArchive
+from utils.leader_analytics import LeaderAnalytics
+
+LEADER = '0x1111111111111111111111111111111111111111'
+
+class ActivityStore:
+    def __init__(self, activities):
+        self.activities = list(activities)
+
+    def load_activities(self, wallet_address):
+        return [activity for activity in self.activities if activity.proxy_wallet == wallet_address]
+
+    def load_recent_activities(self, wallet_address, since):
+        return []
+
+    def append_activities(self, wallet_address, activities):
+        self.activities.extend(activities)
+
+class FillBook:
+    def __init__(self):
+        self.fills = []
+
+    def apply_fill(self, wallet_address, trade, side, shares, price):
+        self.fills.append((wallet_address, trade.asset, side, shares, price))
+
+@pytest.fixture
+def round_trip(make_activity):
+    """A leader buying 100 shares at 0.40 and selling them at 0.60 on one asset"""
+    return [
+        make_activity(0, proxy_wallet=LEADER, asset='rain-yes', size=100.0, usdc_size=40.0, price=0.40),
+        make_activity(1, proxy_wallet=LEADER, asset='rain-yes', side='SELL', size=100.0, usdc_size=60.0,
+                      price=0.60, timestamp=1_750_003_600),
+    ]
+
+def test_repeated_load_counts_each_row_once(tmp_path, round_trip):
+    archive = ActivityArchive(root=str(tmp_path))
+    archive.append(LEADER, round_trip)
+    # The sale is still in the live store as well, as after an interrupted rotation
+    analytics = LeaderAnalytics(ActivityStore(round_trip[1:]), archive)
+
+    analytics.load([LEADER])
+    first = analytics.report(LEADER)
+    analytics.load([LEADER])
+
+    assert first['trades'] == 2
+    assert first['realized_pnl'] == pytest.approx(20.0)
+    again = analytics.report(LEADER)
+    assert (again['trades'], again['realized_pnl'], again['volume']) == \
+        (first['trades'], first['realized_pnl'], first['volume'])
+
+def test_monitored_trades_reach_analytics(make_activity):
+    analytics = LeaderAnalytics()
+    trade_monitor = TradeMonitor(ActivityStore([]), data_fetcher=None, enable_stream=False,
+                                 enable_chain_detector=False, analytics=analytics)
+    wallet = trade_monitor.target_wallets[0]
+    activities = [make_activity(i, proxy_wallet=wallet, timestamp=int(time.time()) - i) for i in range(3)]
+
+    trade_monitor._record_new_activities(wallet, activities)
+    trade_monitor._record_new_activities(wallet, activities)
+
+    assert analytics.report(wallet)['trades'] == 3
+
+def test_executor_fills_measure_slippage(make_activity):
+    analytics = LeaderAnalytics()
+    leader_trade = make_activity(proxy_wallet=LEADER, asset='rain-yes', price=0.50, timestamp=int(time.time()))
+    analytics.ingest(LEADER, [leader_trade])
+    position_book = FillBook()
+    trade_executor = TradeExecutor(None, ActivityStore([]), data_fetcher=None, balance_service=object(),
+                                   position_book=position_book, book_manager=object(), analytics=analytics)
+
+    trade_executor._record_fill(leader_trade, 'BUY', 20.0, 0.51)
+
+    assert position_book.fills == [(trade_executor.my_wallet, 'rain-yes', 'BUY', 20.0, 0.51)]
+    report = analytics.report(LEADER)
+    assert report['copies_matched'] == 1
+    assert report['slippage_bps'] == pytest.approx(200.0)
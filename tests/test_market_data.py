@@ -0,0 +1,50 @@
+import time
+from py_clob_client.clob_types import OrderBookSummary, OrderSummary
+from services.market_data import MarketDataService
+from services.order_book import OrderBookManager
+
+class BulkClob:
+    """CLOB client recording the multi-token requests it answers"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_last_trades_prices(self, params):
+        self.requests.append(('prices', sorted(param.token_id for param in params)))
+        return [{'token_id': param.token_id, 'price': '0.5'} for param in params]
+
+    def get_order_books(self, params):
+        self.requests.append(('books', sorted(param.token_id for param in params)))
+        return [OrderBookSummary(asset_id=param.token_id, bids=[OrderSummary('0.49', '100')],
+                                 asks=[OrderSummary('0.51', '100')]) for param in params]
+
+def market_data(tick):
+    clob = BulkClob()
+    return MarketDataService(clob, OrderBookManager(clob, enable_stream=False), tick=tick), clob
+
+def test_batch_is_fetched_in_one_request_per_kind(make_activity):
+    service, clob = market_data(tick=5.0)
+    batch = [make_activity(0, asset='rain-yes'), make_activity(1, asset='snow-yes', side='SELL'),
+             make_activity(2, asset='rain-yes')]
+
+    service.prefetch(batch)
+    assert sorted(clob.requests) == [('books', ['rain-yes', 'snow-yes']), ('prices', ['rain-yes'])]
+
+    # Every trade of the batch reads from the cache
+    assert service.get_last_trade_price('rain-yes') == 0.5
+    assert service.get_book('snow-yes').best_bid() is not None
+    assert service.get_book('rain-yes').best_ask() is not None
+    assert service.get_stats() == {'bulk_requests': 2, 'single_requests': 0, 'cache_hits': 3}
+
+def test_cache_is_reused_within_the_tick_and_refetched_after(make_activity):
+    service, clob = market_data(tick=0.1)
+    batch = [make_activity(0, asset='rain-yes')]
+
+    service.prefetch(batch)
+    service.prefetch(batch)
+    assert len(clob.requests) == 2  # one prices and one books request, not repeated
+
+    time.sleep(0.15)
+    service.prefetch(batch)
+    assert len(clob.requests) == 4
+    assert service.get_stats()['single_requests'] == 0
@@ -0,0 +1,58 @@
+import pytest
+from config.env import Config
+
+mongomock = pytest.importorskip('mongomock')
+from storage.mongo_storage import MongoStorage
+from models.user_activity import UserPosition
+
+WALLET = '0xleader'
+
+@pytest.fixture
+def storage(tmp_path):
+    client = mongomock.MongoClient()
+    return MongoStorage('mongodb://localhost/test', data_dir=str(tmp_path), client=client)
+
+def test_append_ignores_duplicate_ids(storage, make_activity):
+    storage.append_activities(WALLET, [make_activity(0), make_activity(1)])
+    storage.append_activities(WALLET, [make_activity(1), make_activity(2)])
+    assert [activity.id for activity in storage.load_activities(WALLET)] == ['activity-0', 'activity-1', 'activity-2']
+
+def test_wallets_are_separate(storage, make_activity):
+    storage.append_activities(WALLET, [make_activity(0)])
+    storage.append_activities('0xother', [make_activity(0), make_activity(1)])
+    assert len(storage.load_activities(WALLET)) == 1
+    assert len(storage.load_activities('0xother')) == 2
+
+def test_status_updates_and_pending(storage, make_activity, monkeypatch):
+    storage.append_activities(WALLET, [make_activity(i) for i in range(3)] + [make_activity(3, type='REDEEM')])
+    storage.mark_trade_executed(WALLET, 'activity-0', True)
+    storage.mark_trade_executed(WALLET, 'activity-1', False)
+
+    activities = {activity.id: activity for activity in storage.load_activities(WALLET)}
+    assert activities['activity-0'].bot_executed
+    assert activities['activity-1'].bot_executed_time == 1
+    assert [activity.id for activity in storage.get_pending_trades(WALLET)] == ['activity-1', 'activity-2']
+    monkeypatch.setattr(Config, 'RETRY_LIMIT', 1)
+    assert [activity.id for activity in storage.get_pending_trades(WALLET)] == ['activity-2']
+
+def test_save_replaces_history(storage, make_activity):
+    storage.append_activities(WALLET, [make_activity(i) for i in range(3)])
+    storage.save_activities(WALLET, [make_activity(1, size=42.0)])
+    activities = storage.load_activities(WALLET)
+    assert [(activity.id, activity.size) for activity in activities] == [('activity-1', 42.0)]
+
+def test_recent_and_remove(storage, make_activity):
+    storage.append_activities(WALLET, [make_activity(i) for i in range(5)])
+    assert [activity.id for activity in storage.load_recent_activities(WALLET, 1_750_000_003)] == ['activity-3', 'activity-4']
+    storage.remove_activities(WALLET, ['activity-3'])
+    assert len(storage.load_activities(WALLET)) == 4
+
+def test_positions_round_trip(storage):
+    position = UserPosition(
+        proxy_wallet=WALLET, asset='asset0', condition_id='0xc', size=5.0, avg_price=0.4,
+        initial_value=2.0, current_value=2.5, cash_pnl=0.5, percent_pnl=25.0, total_bought=5.0,
+        realized_pnl=0.0, cur_price=0.5, redeemable=False, title='t', outcome='Yes',
+        outcome_index=0, end_date='', negative_risk=False
+    )
+    storage.save_positions(WALLET, [position])
+    assert storage.load_positions(WALLET) == [position]
@@ -0,0 +1,60 @@
+import os
+import time
+import pytest
+from helpers.ws_replay_server import ReplayServer, load_recording
+from services.order_book import LocalOrderBook, OrderBookManager
+
+RECORDING = os.path.join(os.path.dirname(__file__), 'fixtures', 'market_channel.jsonl')
+ASSET_A = '71321045679252212594626385532706912750332728571942532289631379312455583992563'
+ASSET_B = '52114319501245915516055106046884209969926127482827954674443846427813813222426'
+
+class NoRestClient:
+    def get_order_book(self, asset_id):
+        raise AssertionError('streamed book should have been used')
+
+@pytest.fixture
+def replayed_books():
+    """An OrderBookManager that has consumed the whole recorded market channel"""
+    server = ReplayServer(load_recording(RECORDING), speed=100).start()
+    manager = OrderBookManager(NoRestClient(), url=server.url, enable_stream=True, max_age=60)
+    manager.start()
+    manager.watch([ASSET_A, ASSET_B])
+    deadline = time.monotonic() + 5
+    while server.sent < len(server.messages) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)  # let the feed thread apply the last message
+    yield manager
+    manager.stop()
+    server.stop()
+
+def test_snapshots_and_both_delta_shapes_are_applied(replayed_books):
+    book_a = replayed_books.get_book(ASSET_A)
+    assert book_a.bids.levels() == [(0.49, 25.0), (0.47, 100.0)]
+    assert book_a.asks.levels() == [(0.53, 200.0)]
+    assert book_a.hash == 'h6'
+    assert replayed_books.get_last_trade_price(ASSET_A) == 0.52
+
+    # Legacy single-asset `changes` message
+    book_b = replayed_books.get_book(ASSET_B)
+    assert (book_b.best_bid(), book_b.best_ask()) == (0.50, 0.55)
+    assert replayed_books.get_stats()['stream_hits'] == 2
+
+def test_get_book_returns_a_copy_the_feed_cannot_change(replayed_books):
+    book = replayed_books.get_book(ASSET_A)
+    replayed_books._handle_message({'event_type': 'price_change', 'price_changes': [
+        {'asset_id': ASSET_A, 'price': '0.50', 'size': '10', 'side': 'BUY'}
+    ]})
+    assert book.best_bid() == 0.49
+    assert replayed_books.get_book(ASSET_A).best_bid() == 0.50
+
+    book.bids.set_level(0.51, 1)
+    assert replayed_books.get_book(ASSET_A).best_bid() == 0.50
+
+def test_ladder_keeps_best_price_through_updates():
+    book = LocalOrderBook('asset')
+    book.apply_snapshot([(0.40, 10), (0.45, 5)], [(0.55, 7), (0.60, 3)])
+    book.apply_change('BUY', 0.45, 0)
+    book.apply_change('SELL', 0.50, 2)
+    assert (book.best_bid(), book.best_ask()) == (0.40, 0.50)
+    assert book.asks.size_at_or_better(0.55) == 9
+    assert book.market_buy_price(2.0) == 0.55
@@ -0,0 +1,73 @@
+import json
+import os
+import time
+import pytest
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import ApiCreds, OrderArgs, OrderType
+from py_clob_client.order_builder.constants import BUY
+from services.order_submitter import OrderSubmitter
+
+TOKEN = str(10 ** 70)
+
+def clob(method, path, body):
+    if path.startswith('/tick-size'):
+        return 200, {}, {'minimum_tick_size': 0.01}
+    if path.startswith('/neg-risk'):
+        return 200, {}, {'neg_risk': False}
+    orders = json.loads(body)
+    if isinstance(orders, list):
+        # Echo each order's amount so responses can be matched to their orders
+        return 200, {}, [{'success': True, 'orderID': order['order']['makerAmount']} for order in orders]
+    return 200, {}, {'success': True, 'orderID': 'single'}
+
+@pytest.fixture
+def submitter(stub_server):
+    server = stub_server(clob)
+    client = ClobClient(server.url, key=os.environ['PK'], chain_id=137,
+                        creds=ApiCreds('key', 'c2VjcmV0', 'passphrase'))
+    made = []
+
+    def make(**kwargs):
+        order_submitter = OrderSubmitter(client, **kwargs)
+        made.append(order_submitter)
+        return order_submitter
+    yield make, server
+    for order_submitter in made:
+        order_submitter.stop()
+
+def order_posts(server):
+    return [json.loads(body) for method, path, body in server.requests if method == 'POST']
+
+def test_ready_orders_share_one_request_and_get_their_own_responses(submitter):
+    make, server = submitter
+    order_submitter = make(max_batch=15, max_in_flight=1)
+    results = [order_submitter.submit(OrderArgs(token_id=TOKEN, price=0.5, size=size, side=BUY), OrderType.FOK)
+               for size in range(10, 15)]
+    deadline = time.monotonic() + 5
+    while order_submitter._ready.qsize() < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    order_submitter.start()  # everything is signed, so one request carries all of it
+
+    assert [result.result(timeout=5)['orderID'] for result in results] == [str(size * 500_000) for size in range(10, 15)]
+    assert [len(body) for body in order_posts(server)] == [5]
+    assert order_submitter.get_stats()['orders_per_request'] == 5
+
+def test_cancelled_orders_are_never_posted(submitter):
+    make, server = submitter
+    order_submitter = make()
+    dropped = order_submitter.submit(OrderArgs(token_id=TOKEN, price=0.5, size=10, side=BUY), OrderType.FOK)
+    assert dropped.cancel()
+    kept = order_submitter.submit(OrderArgs(token_id=TOKEN, price=0.5, size=20, side=BUY), OrderType.FOK)
+    order_submitter.start()
+
+    assert kept.result(timeout=5)['orderID'] == 'single'
+    assert len(order_posts(server)) == 1
+
+def test_signing_errors_reach_the_caller(submitter):
+    make, server = submitter
+    order_submitter = make()
+    order_submitter.start()
+    result = order_submitter.submit(OrderArgs(token_id=TOKEN, price=1.5, size=10, side=BUY), OrderType.FOK)
+    with pytest.raises(Exception, match='price'):
+        result.result(timeout=5)
+    assert order_posts(server) == []
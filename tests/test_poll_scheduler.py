@@ -0,0 +1,59 @@
+import random
+from services.poll_scheduler import AdaptivePollScheduler
+
+def make_scheduler(clock=None, **kwargs) -> AdaptivePollScheduler:
+    options = dict(min_interval=1, max_interval=15, initial_interval=5, decay=1.5, max_backoff=120,
+                   rng=random.Random(0), clock=clock or (lambda: 0.0))
+    options.update(kwargs)
+    return AdaptivePollScheduler(**options)
+
+def test_trade_drops_interval_and_quiet_polls_decay_to_max():
+    scheduler = make_scheduler()
+    assert scheduler.record_poll(2) == 1
+    delays = [scheduler.record_poll(0) for _ in range(10)]
+    assert delays[:3] == [1.5, 2.25, 3.375]
+    assert delays[-1] == 15
+    assert all(a <= b for a, b in zip(delays, delays[1:]))
+
+def test_errors_back_off_exponentially_with_equal_jitter():
+    scheduler = make_scheduler()
+    for errors in range(1, 8):
+        backoff = min(120, 5 * 2 ** errors)
+        delay = scheduler.record_error()
+        assert backoff / 2 <= delay <= backoff
+    assert scheduler.consecutive_errors == 7
+    scheduler.record_poll(0)
+    assert scheduler.consecutive_errors == 0
+
+def test_rate_limit_waits_at_least_retry_after():
+    scheduler = make_scheduler()
+    assert scheduler.record_error(rate_limited=True, retry_after=90) == 90
+    assert scheduler.record_error(rate_limited=True, retry_after=None) <= 20
+
+def test_request_rate_uses_rolling_window():
+    now = [0.0]
+    scheduler = make_scheduler(clock=lambda: now[0], rate_window=60)
+    for _ in range(30):
+        scheduler.record_poll(0)
+        now[0] += 1
+    assert scheduler.request_rate() == 0.5
+    now[0] += 120
+    assert scheduler.request_rate() == 0
+
+def test_simulated_bursts_poll_less_than_fixed_interval_and_stay_responsive():
+    # One hour: a burst of five fills every ten minutes, 5s apart
+    trades = [burst * 600 + 100 + fill * 5 for burst in range(6) for fill in range(5)]
+    now = [0.0]
+    scheduler = make_scheduler(clock=lambda: now[0])
+    last_poll, requests, latencies = -1.0, 0, []
+    while now[0] < 3600:
+        requests += 1
+        found = [trade for trade in trades if last_poll < trade <= now[0]]
+        latencies += [now[0] - trade for trade in found]
+        last_poll = now[0]
+        now[0] += scheduler.record_poll(len(found))
+
+    assert len(latencies) == len(trades)
+    assert requests < 3600 / 5 / 2  # well under half of fixed 5s polling
+    assert max(latencies) < 15
+    assert sum(latencies) / len(latencies) < 5
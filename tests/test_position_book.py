@@ -0,0 +1,62 @@
+import pytest
+from models.user_activity import UserPosition
+from services.order_book import OrderBookManager
+from services.position_book import PositionBook
+from utils.portfolio_analyzer import PortfolioAnalyzer
+from utils.risk_manager import RiskManager
+
+ME = '0x2222222222222222222222222222222222222222'
+LEADER = '0x1111111111111111111111111111111111111111'
+
+class SnapshotStorage:
+    def __init__(self, positions):
+        self.positions = positions
+
+    def load_positions(self, wallet_address):
+        return [position for position in self.positions if position.proxy_wallet == wallet_address]
+
+    def save_positions(self, wallet_address, positions):
+        pass
+
+def position(wallet, asset, condition_id, size, avg_price, cur_price):
+    initial, current = size * avg_price, size * cur_price
+    return UserPosition(wallet, asset, condition_id, size, avg_price, initial, current, current - initial, 0.0,
+                        size, 0.0, cur_price, False, 'Will it rain?', 'Yes', 0, '', False)
+
+@pytest.fixture
+def book():
+    return PositionBook(None, SnapshotStorage([
+        position(ME, 'rain-yes', 'rain', 100, 0.40, 0.50),
+        position(ME, 'snow-yes', 'snow', 50, 0.60, 0.55),
+        position(LEADER, 'rain-yes', 'rain', 1000, 0.30, 0.50),
+    ]), [ME, LEADER])
+
+def test_streamed_prices_revalue_positions_and_table(book):
+    manager = OrderBookManager(None, enable_stream=False, on_price=book.mark_price)
+    manager._handle_message({'event_type': 'last_trade_price', 'asset_id': 'rain-yes', 'price': '0.70'})
+
+    mine = book.get_position(ME, 'rain-yes', refresh=False)
+    assert (mine.cur_price, mine.current_value) == (0.70, pytest.approx(70.0))
+    assert mine.cash_pnl == pytest.approx(30.0)
+    assert book.get_position(LEADER, 'rain-yes', refresh=False).current_value == pytest.approx(700.0)
+
+    # The table and a pass over the same positions agree
+    from_list = PortfolioAnalyzer.analyze_positions(book.get_positions(ME))
+    from_table = book.table.summary(ME)
+    for key in ('num_positions', 'total_value', 'total_pnl', 'profitable_positions', 'losing_positions', 'win_rate'):
+        assert from_table[key] == pytest.approx(from_list[key])
+
+def test_fills_are_mirrored_into_the_table(book, make_activity):
+    trade = make_activity(asset='wind-yes', condition_id='wind')
+    book.apply_fill(ME, trade, 'BUY', 20, 0.25)
+    assert book.table.summary(ME)['num_positions'] == 3
+    book.apply_fill(ME, trade, 'SELL', 20, 0.30)
+    assert book.table.summary(ME)['num_positions'] == 2
+    assert book.table.summary(ME)['total_value'] == pytest.approx(50 + 27.5)
+
+def test_concentration_check_counts_what_is_already_held(book, make_activity):
+    risk = RiskManager(max_position_size=1000, position_table=book.table, wallet_address=ME)
+    trade = make_activity(condition_id='rain', usdc_size=40.0)
+    # Balance 200 plus 77.5 held: 20% is 55.5, of which 50 is already in the market
+    assert risk.check_trade_risk(trade, my_balance=200)['suggested_size'] == pytest.approx(5.5)
+    assert RiskManager(max_position_size=1000).check_trade_risk(trade, my_balance=200)['suggested_size'] == 40.0
@@ -0,0 +1,38 @@
+import pytest
+from services.replay_engine import ReplayEngine, ReplayExecutor, ReplayParams, SimulatedClob
+
+@pytest.fixture
+def engine(make_activity):
+    """Leader buys and later sells on a few assets, with prices drifting; books are synthesized"""
+    activities = []
+    for i in range(60):
+        side = 'SELL' if i % 5 == 4 else 'BUY'
+        price = round(0.30 + 0.01 * (i % 9), 2)
+        size = 20.0 + 15 * (i % 4)
+        activities.append(make_activity(i, timestamp=1_750_000_000 + 30 * i, asset=f"asset{i % 3}",
+                                        condition_id=f"0xcondition{i % 3}", side=side, price=price,
+                                        size=size, usdc_size=round(size * price, 2)))
+    return ReplayEngine(activities, book_dir=None)
+
+def test_replay_executor_is_built_by_the_real_constructor():
+    params = ReplayParams(max_price_drift=0.07, min_copy_amount=3.0)
+    executor = ReplayExecutor(SimulatedClob(100.0), params)
+
+    assert executor.metrics is not None and executor.warmup is not None
+    assert (executor.max_price_drift, executor.min_copy_amount) == (0.07, 3.0)
+    assert executor.context_loader.my_wallet == executor.my_wallet == 'replay'
+
+def test_sweep_matches_run(engine):
+    grid = {'max_price_drift': [0.0, 0.05], 'min_copy_amount': [0.5, 2.0], 'copy_delay': [2.0, 100.0]}
+    swept = engine.sweep(grid, workers=1)
+
+    assert len(swept) == 8
+    for result in swept:
+        expected = engine.run(result.params)
+        assert (result.fills, result.skipped, result.failed) == \
+            (expected.fills, expected.skipped, expected.failed)
+        assert result.notional == pytest.approx(expected.notional)
+        assert result.slippage_bps == pytest.approx(expected.slippage_bps, abs=1e-6)
+        assert result.final_cash == pytest.approx(expected.final_cash)
+        assert result.pnl == pytest.approx(expected.pnl, abs=1e-6)
+    assert len({result.fills for result in swept}) > 2
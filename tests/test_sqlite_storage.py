@@ -0,0 +1,43 @@
+from config.env import Config
+from storage.sqlite_storage import SqliteStorage
+
+WALLET = '0xleader'
+
+def test_append_ignores_known_ids(tmp_path, make_activity):
+    storage = SqliteStorage(str(tmp_path / 'test.db'))
+    storage.append_activities(WALLET, [make_activity(0), make_activity(1)])
+    storage.append_activities(WALLET, [make_activity(1, size=99.0), make_activity(2)])
+
+    activities = storage.load_activities(WALLET)
+    assert [activity.id for activity in activities] == ['activity-0', 'activity-1', 'activity-2']
+    assert activities[1].size == 10.0
+    assert activities[0].bot_executed is False
+
+def test_pending_trades_follow_status(tmp_path, make_activity, monkeypatch):
+    storage = SqliteStorage(str(tmp_path / 'test.db'))
+    storage.append_activities(WALLET, [make_activity(i) for i in range(3)] + [make_activity(3, type='MERGE')])
+    storage.mark_trade_executed(WALLET, 'activity-0', True)
+    storage.mark_trade_executed(WALLET, 'activity-1', False)
+
+    assert [activity.id for activity in storage.get_pending_trades(WALLET)] == ['activity-1', 'activity-2']
+    monkeypatch.setattr(Config, 'RETRY_LIMIT', 1)
+    assert [activity.id for activity in storage.get_pending_trades(WALLET)] == ['activity-2']
+
+def test_recent_activities_and_removal(tmp_path, make_activity):
+    storage = SqliteStorage(str(tmp_path / 'test.db'))
+    storage.append_activities(WALLET, [make_activity(i) for i in range(5)])
+    assert len(storage.load_recent_activities(WALLET, 1_750_000_003)) == 2
+    storage.remove_activities(WALLET, ['activity-0', 'activity-4', 'missing'])
+    assert [activity.id for activity in storage.load_activities(WALLET)] == ['activity-1', 'activity-2', 'activity-3']
+
+def test_removal_is_one_transaction(tmp_path, make_activity):
+    storage = SqliteStorage(str(tmp_path / 'test.db'))
+    storage.append_activities(WALLET, [make_activity(i) for i in range(5)])
+    statements = []
+    storage._conn().set_trace_callback(statements.append)
+    storage.remove_activities(WALLET, ['activity-1', 'activity-2', 'activity-3'])
+
+    assert statements[0] == 'BEGIN IMMEDIATE'
+    assert statements[-1] == 'COMMIT'
+    assert sum(statement.startswith('DELETE') for statement in statements) == 3
+    assert 'BEGIN IMMEDIATE' not in statements[1:]
@@ -0,0 +1,51 @@
+import pytest
+from services.trade_coalescer import coalesce_trades
+
+def fill(make_activity, index, side, size, price, asset='rain-yes', condition_id='0xrain', **fields):
+    return make_activity(index, asset=asset, condition_id=condition_id, side=side, size=size,
+                         price=price, usdc_size=size * price, **fields)
+
+def batch(activities):
+    return [(activity.proxy_wallet, activity) for activity in activities]
+
+def test_same_side_fills_merge_into_one_order_at_the_vwap(make_activity):
+    fills = [fill(make_activity, 0, 'BUY', 10.0, 0.40), fill(make_activity, 1, 'BUY', 30.0, 0.50),
+             fill(make_activity, 2, 'BUY', 10.0, 0.60)]
+
+    [order] = coalesce_trades(batch(fills))
+    assert order.members == fills
+    assert (order.trade.side, order.trade.size) == ('BUY', 50.0)
+    assert order.trade.price == pytest.approx((4.0 + 15.0 + 6.0) / 50.0)
+    assert order.trade.usdc_size == pytest.approx(25.0)
+    assert order.trade.id == fills[-1].id
+
+def test_buy_then_sell_nets_to_the_residual(make_activity):
+    fills = [fill(make_activity, 0, 'BUY', 40.0, 0.50), fill(make_activity, 1, 'SELL', 15.0, 0.55)]
+
+    [order] = coalesce_trades(batch(fills))
+    assert (order.trade.side, order.trade.size, order.trade.price) == ('BUY', 25.0, 0.50)
+    assert order.members == fills
+
+def test_buy_then_equal_sell_nets_to_nothing(make_activity):
+    fills = [fill(make_activity, 0, 'BUY', 20.0, 0.50), fill(make_activity, 1, 'SELL', 20.0, 0.52)]
+
+    [order] = coalesce_trades(batch(fills))
+    assert order.trade is None
+    assert order.members == fills
+
+def test_assets_net_separately_in_arrival_order(make_activity):
+    fills = [fill(make_activity, 0, 'BUY', 10.0, 0.50),
+             fill(make_activity, 1, 'BUY', 5.0, 0.30, asset='snow-yes', condition_id='0xsnow'),
+             fill(make_activity, 2, 'BUY', 10.0, 0.50)]
+
+    orders = coalesce_trades(batch(fills))
+    assert [order.trade.asset for order in orders] == ['rain-yes', 'snow-yes']
+    assert [order.trade.size for order in orders] == [20.0, 5.0]
+
+def test_merge_ends_the_runs_of_its_market(make_activity):
+    before = fill(make_activity, 0, 'BUY', 10.0, 0.50)
+    merge = make_activity(1, asset='', condition_id='0xrain', type='MERGE', side='')
+    after = fill(make_activity, 2, 'BUY', 10.0, 0.50)
+
+    orders = coalesce_trades(batch([before, merge, after]))
+    assert [order.members for order in orders] == [[before], [merge], [after]]
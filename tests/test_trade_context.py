@@ -0,0 +1,56 @@
+import pytest
+from models.user_activity import UserPosition
+from services.trade_context import TradeContextLoader
+
+ME = '0x2222222222222222222222222222222222222222'
+LEADER = '0x1111111111111111111111111111111111111111'
+
+class Balances:
+    def get_balances(self, wallet_addresses):
+        return {wallet: 100.0 for wallet in wallet_addresses}
+
+class FailingPositions:
+    """Live position reads raise; the in-memory book still holds what was loaded `age` seconds ago"""
+
+    def __init__(self, age):
+        self.age = age
+        self.held = UserPosition(ME, 'asset0', '0xcondition0', 20.0, 0.5, 10.0, 10.0, 0.0, 0.0,
+                                 20.0, 0.0, 0.5, False, 'Will it rain?', 'Yes', 0, '', False)
+
+    def get_position(self, wallet_address, asset=None, condition_id=None, refresh=True):
+        if refresh:
+            raise ConnectionError('data API unavailable')
+        return self.held if wallet_address == ME else None
+
+    def get_age(self, wallet_address):
+        return self.age
+
+class MarketData:
+    def get_book(self, asset):
+        return None
+
+@pytest.fixture
+def loader():
+    made = []
+
+    def make(age):
+        context_loader = TradeContextLoader(None, Balances(), FailingPositions(age), ME, market_data=MarketData(),
+                                            deadline=1.0, max_staleness=30.0)
+        made.append(context_loader)
+        return context_loader
+    yield make
+    for context_loader in made:
+        context_loader.shutdown()
+
+def test_failed_position_read_uses_recent_cache(loader, make_activity):
+    trade = make_activity(side='SELL')
+    context = loader(age=5.0).load(trade, LEADER, 'sell')
+
+    assert context is not None
+    assert {'my_position', 'target_position'} <= set(context.stale)
+    assert context.my_position.size == 20.0
+
+def test_failed_position_read_without_cache_defers_trade(loader, make_activity):
+    trade = make_activity(side='SELL')
+
+    assert loader(age=float('inf')).load(trade, LEADER, 'sell') is None
@@ -0,0 +1,240 @@
+import threading
+import time
+from concurrent.futures import Future
+import pytest
+from models.user_activity import UserPosition
+from services.order_book import LocalOrderBook
+from services.position_book import PositionBook
+from services.trade_coalescer import CoalescedTrade, coalesce_trades
+from services.trade_context import TradeContext
+from services.trade_executor import TradeExecutor
+
+class RecordingStorage:
+    def __init__(self, fail_marks: int = 0):
+        self.fail_marks = fail_marks
+        self.marked = []
+
+    def mark_trade_executed(self, wallet_address, activity_id, success):
+        if self.fail_marks:
+            self.fail_marks -= 1
+            raise OSError('disk full')
+        self.marked.append((activity_id, success))
+
+class StubBooks:
+    def watch(self, assets):
+        list(assets)
+
+@pytest.fixture
+def executor():
+    """A TradeExecutor whose orders are run by `execute(trade) -> bool`; no CLOB or network"""
+    made = []
+
+    def make(execute, storage=None, max_workers=4):
+        trade_executor = TradeExecutor(None, storage or RecordingStorage(), data_fetcher=None,
+                                       balance_service=object(), position_book=object(),
+                                       book_manager=StubBooks(), max_workers=max_workers)
+        trade_executor._execute_trade = lambda trade, wallet_address: execute(trade)
+        trade_executor.retry_delay = 0.05
+        trade_executor.running = True
+        made.append(trade_executor)
+        return trade_executor
+    yield make
+    for trade_executor in made:
+        trade_executor.running = False
+        trade_executor._workers.shutdown(wait=True)
+
+def wait_idle(trade_executor, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with trade_executor._lanes_lock:
+            idle = not trade_executor._lanes
+        if idle and trade_executor.metrics.in_flight == 0:
+            return
+        time.sleep(0.01)
+    raise AssertionError('lanes did not drain')
+
+def dispatch(trade_executor, wallet, activities):
+    for activity in activities:
+        trade_executor._dispatch(CoalescedTrade(wallet, activity, [activity]))
+
+def test_same_asset_runs_in_order_and_assets_run_in_parallel(executor, make_activity):
+    release = threading.Event()
+    executed = []
+
+    def execute(trade):
+        if trade.asset == 'slow':
+            release.wait(5)
+        executed.append(trade.id)
+        return True
+
+    trade_executor = executor(execute)
+    slow = [make_activity(i, asset='slow', condition_id='0xslow') for i in range(2)]
+    fast = [make_activity(i, asset='asset1', condition_id='0xfast') for i in range(2, 5)]
+    dispatch(trade_executor, slow[0].proxy_wallet, slow + fast)
+    time.sleep(0.2)
+    assert executed == [activity.id for activity in fast]  # not stuck behind the slow market
+
+    release.set()
+    wait_idle(trade_executor)
+    assert executed[3:] == [activity.id for activity in slow]
+
+def test_retry_runs_before_later_orders_on_the_same_asset(executor, make_activity):
+    executed = []
+    attempts = {}
+
+    def execute(trade):
+        executed.append(trade.id)
+        attempts[trade.id] = attempts.get(trade.id, 0) + 1
+        return trade.id != 'activity-0' or attempts[trade.id] > 1
+
+    trade_executor = executor(execute)
+    activities = [make_activity(i, asset='asset0', condition_id='0xcondition0') for i in range(3)]
+    dispatch(trade_executor, activities[0].proxy_wallet, activities)
+    wait_idle(trade_executor)
+
+    assert executed == ['activity-0', 'activity-0', 'activity-1', 'activity-2']
+    snapshot = trade_executor.get_metrics()
+    assert (snapshot['succeeded'], snapshot['failed'], snapshot['in_flight']) == (3, 1, 0)
+    assert trade_executor.metrics.waiting == 0
+
+def test_unexpected_error_finalizes_metrics_and_keeps_draining(executor, make_activity):
+    storage = RecordingStorage(fail_marks=1)
+    trade_executor = executor(lambda trade: True, storage=storage)
+    activities = [make_activity(i, asset='asset0', condition_id='0xcondition0') for i in range(3)]
+    dispatch(trade_executor, activities[0].proxy_wallet, activities)
+    wait_idle(trade_executor)
+
+    assert storage.marked == [('activity-1', True), ('activity-2', True)]
+    assert trade_executor.metrics.in_flight == 0
+    assert trade_executor.metrics.failed == 1
+    assert not trade_executor._lanes
+
+    # The lane is gone, so new orders on the asset start a fresh worker
+    dispatch(trade_executor, activities[0].proxy_wallet, [make_activity(3, asset='asset0', condition_id='0xcondition0')])
+    wait_idle(trade_executor)
+    assert storage.marked[-1] == ('activity-3', True)
+
+def test_merge_waits_behind_a_sell_on_the_same_market(executor, make_activity):
+    release = threading.Event()
+    executed = []
+
+    def execute(trade):
+        if trade.side == 'SELL':
+            release.wait(5)
+        executed.append(trade.id)
+        return True
+
+    trade_executor = executor(execute)
+    sell = make_activity(0, asset='rain-yes', condition_id='0xrain', side='SELL')
+    merge = make_activity(1, asset='', condition_id='0xrain', type='MERGE', side='')
+    other = make_activity(2, asset='snow-yes', condition_id='0xsnow')
+    dispatch(trade_executor, sell.proxy_wallet, [sell, merge, other])
+    time.sleep(0.2)
+    assert executed == [other.id]  # the merge is held behind the sell of its shares
+
+    release.set()
+    wait_idle(trade_executor)
+    assert executed == [other.id, sell.id, merge.id]
+
+def test_netted_members_are_marked_and_retried_as_a_group(executor, make_activity):
+    storage = RecordingStorage()
+    executed = []
+    trade_executor = executor(lambda trade: executed.append(trade.size) or len(executed) > 1, storage=storage)
+    fills = [make_activity(i, asset='asset0', side=side, size=size)
+             for i, (side, size) in enumerate([('BUY', 30.0), ('BUY', 10.0), ('SELL', 15.0)])]
+    [order] = coalesce_trades([(fill.proxy_wallet, fill) for fill in fills])
+
+    success, retries = trade_executor._process_trade(order)
+    assert (success, executed) == (False, [25.0])
+    assert storage.marked == [(fill.id, False) for fill in fills]
+    # The failed fills come back as one order, netted again
+    assert [retry.members for retry in retries] == [fills]
+
+    success, retries = trade_executor._process_trade(retries[0])
+    assert (success, retries, executed) == (True, [], [25.0, 25.0])
+    assert storage.marked[3:] == [(fill.id, True) for fill in fills]
+
+def test_netted_out_order_is_marked_without_trading(executor, make_activity):
+    storage = RecordingStorage()
+    executed = []
+    trade_executor = executor(lambda trade: executed.append(trade) or True, storage=storage)
+    fills = [make_activity(0, asset='asset0', side='BUY'), make_activity(1, asset='asset0', side='SELL')]
+    [order] = coalesce_trades([(fill.proxy_wallet, fill) for fill in fills])
+
+    assert trade_executor._process_trade(order) == (True, [])
+    assert executed == []
+    assert storage.marked == [(fill.id, True) for fill in fills]
+
+def held_position(asset: str, size: float) -> UserPosition:
+    return UserPosition('0x2222222222222222222222222222222222222222', asset, '0xcondition0', size, 0.5,
+                        size * 0.5, size * 0.5, 0, 0, size * 0.5, 0, 0.5, False, 'Will it rain?', 'Yes', 0, '', False)
+
+class PositionRecorder:
+    def __init__(self):
+        self.fills = []
+
+    def apply_fill(self, wallet_address, trade, side, shares, price):
+        self.fills.append((side, shares, price))
+
+def test_sell_without_order_book_fails_for_retry_instead_of_guessing_a_price(executor, make_activity):
+    trade_executor = executor(lambda trade: True)
+    posted = []
+    trade_executor._post_order = lambda trade, order_args: posted.append(order_args) or {'success': True}
+    trade = make_activity(side='SELL', asset='asset0', size=10.0, price=0.5)
+    context = TradeContext(my_position=held_position('asset0', 20.0), order_book=None)
+
+    assert trade_executor._execute_sell_strategy(trade, context) is False
+    assert posted == []
+
+def test_sell_posts_at_the_best_bid(executor, make_activity):
+    trade_executor = executor(lambda trade: True)
+    trade_executor.position_book = PositionRecorder()
+    posted = []
+    trade_executor._post_order = lambda trade, order_args: posted.append(order_args) or {'success': True}
+    book = LocalOrderBook('asset0')
+    book.apply_snapshot([('0.47', '100'), ('0.48', '50')], [('0.52', '80')])
+    trade = make_activity(side='SELL', asset='asset0', size=10.0, price=0.5)
+
+    assert trade_executor._execute_sell_strategy(trade, TradeContext(my_position=held_position('asset0', 20.0), order_book=book))
+    assert (posted[0].price, posted[0].size, posted[0].side) == (0.48, 9.99, 'SELL')
+    assert trade_executor.position_book.fills == [('SELL', 9.99, 0.48)]
+
+def test_order_without_response_fails_and_is_withdrawn(executor, make_activity):
+    class SilentSubmitter:
+        def submit(self, order_args, order_type):
+            self.result = Future()
+            return self.result
+
+    trade_executor = executor(lambda trade: True)
+    trade_executor.order_submitter = submitter = SilentSubmitter()
+    trade_executor.order_timeout = 0.05
+
+    response = trade_executor._post_order(make_activity(), order_args=None)
+    assert response['success'] is False
+    assert 'no response' in response['error']
+    assert submitter.result.cancelled()
+
+def test_warmed_sell_sees_the_buy_filled_ahead_of_it_on_its_lane(executor, make_activity):
+    trade_executor = executor(lambda trade: True)
+    del trade_executor._execute_trade  # run the real context handling
+    trade_executor.position_book = PositionBook(None, None, [])
+    trade_executor._refresh_price = lambda trade, strategy, context: None
+    buy = make_activity(0, asset='asset0', side='BUY')
+    sell = make_activity(1, asset='asset0', side='SELL')
+    wallet = buy.proxy_wallet
+
+    # Both trades were warmed at detection, before our buy filled
+    for activity in (buy, sell):
+        warmed = Future()
+        warmed.set_result((time.monotonic(), TradeContext(my_balance=100.0, target_balance=1000.0)))
+        trade_executor.warmup._prepared[(wallet, activity.id)] = warmed
+    positions_seen = []
+    trade_executor._execute_buy_strategy = \
+        lambda trade, context: trade_executor._record_fill(trade, 'BUY', 20.0, 0.5) or True
+    trade_executor._execute_sell_strategy = lambda trade, context: positions_seen.append(context.my_position) or True
+
+    dispatch(trade_executor, wallet, [buy, sell])
+    wait_idle(trade_executor)
+
+    assert trade_executor.warmup.hits == 2
+    assert positions_seen[0] is not None and positions_seen[0].size == 20.0
@@ -0,0 +1,51 @@
+import time
+import pytest
+from services.trade_monitor import TradeMonitor
+from services.trade_queue import PendingTradeQueue
+
+class FlakyStorage:
+    """Storage whose first `failures` appends raise"""
+
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.stored = []
+
+    def load_recent_activities(self, wallet_address, since):
+        return []
+
+    def append_activities(self, wallet_address, activities):
+        if self.failures:
+            self.failures -= 1
+            raise OSError('disk full')
+        self.stored.extend(activities)
+
+@pytest.fixture
+def monitor():
+    def make(storage, trade_queue=None):
+        return TradeMonitor(storage, data_fetcher=None, trade_queue=trade_queue,
+                            enable_stream=False, enable_chain_detector=False)
+    return make
+
+def test_failed_persist_releases_claims_for_the_next_poll(monitor, make_activity):
+    storage = FlakyStorage(failures=1)
+    trade_monitor = monitor(storage)
+    wallet = trade_monitor.target_wallets[0]
+    activities = [make_activity(i, timestamp=int(time.time()) - i) for i in range(3)]
+
+    with pytest.raises(OSError):
+        trade_monitor._store_new_activities(wallet, activities)
+    assert trade_monitor._store_new_activities(wallet, activities) == 3
+    assert [activity.id for activity in storage.stored] == [activity.id for activity in activities]
+    assert trade_monitor._store_new_activities(wallet, activities) == 0
+
+def test_failed_queue_put_releases_claims(monitor, make_activity):
+    class BrokenQueue(PendingTradeQueue):
+        def put_many(self, wallet_address, activities, delay=0.0):
+            raise RuntimeError('queue closed')
+
+    trade_monitor = monitor(FlakyStorage(failures=0), trade_queue=BrokenQueue())
+    wallet = trade_monitor.target_wallets[0]
+    activity = make_activity(timestamp=int(time.time()))
+
+    assert trade_monitor._record_new_activities(wallet, [activity]) == 0
+    assert not trade_monitor.known_activities[wallet].seen(activity.id, activity.timestamp)
@@ -0,0 +1,78 @@
+import threading
+import time
+from services.trade_executor import TradeExecutor
+from services.trade_queue import PendingTradeQueue
+from storage.local_storage import LocalStorage
+
+class NoPositions:
+    def get_positions(self, wallet_address):
+        return []
+
+class StubBooks:
+    def watch(self, assets):
+        list(assets)
+
+def ids(batch):
+    return [activity.id for _, activity in batch]
+
+def test_delayed_trade_is_not_released_early(make_activity):
+    trade_queue = PendingTradeQueue()
+    trade = make_activity()
+    trade_queue.put(trade.proxy_wallet, trade, delay=0.2)
+
+    assert trade_queue.get_batch(timeout=0.05) == []
+    started = time.monotonic()
+    assert ids(trade_queue.get_batch(timeout=1.0)) == [trade.id]
+    assert time.monotonic() - started < 0.5
+
+def test_release_follows_due_time_then_arrival(make_activity):
+    trade_queue = PendingTradeQueue()
+    retried, first, second = (make_activity(i) for i in range(3))
+    trade_queue.put(retried.proxy_wallet, retried, delay=0.1)
+    trade_queue.put_many(first.proxy_wallet, [first, second])
+
+    assert ids(trade_queue.get_batch(timeout=0)) == [first.id, second.id]
+    time.sleep(0.15)
+    assert ids(trade_queue.get_batch(timeout=0)) == [retried.id]
+
+def test_queued_id_is_not_queued_twice(make_activity):
+    trade_queue = PendingTradeQueue()
+    trade = make_activity()
+
+    assert trade_queue.put(trade.proxy_wallet, trade)
+    assert not trade_queue.put(trade.proxy_wallet, trade)
+    assert trade_queue.put_many(trade.proxy_wallet, [trade, make_activity(1)]) == 1
+    assert len(trade_queue) == 2
+
+    # Once handed out, the same id can be queued again (e.g. for a retry)
+    trade_queue.get_batch(timeout=0)
+    assert trade_queue.put(trade.proxy_wallet, trade)
+
+def test_get_batch_wakes_on_put(make_activity):
+    trade_queue = PendingTradeQueue()
+    trade = make_activity()
+    timer = threading.Timer(0.1, trade_queue.put, (trade.proxy_wallet, trade))
+    timer.start()
+
+    started = time.monotonic()
+    assert ids(trade_queue.get_batch(timeout=5.0)) == [trade.id]
+    # Woken by the put, not by the timeout or a polling interval
+    assert time.monotonic() - started < 0.5
+
+def test_queue_is_rebuilt_from_storage_on_restart(make_activity, tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    done, pending, failed = (make_activity(i) for i in range(3))
+    done.bot_executed = True
+    failed.bot_executed_time = 1
+    wallet = done.proxy_wallet
+    storage.save_activities(wallet, [done, pending, failed])
+
+    trade_executor = TradeExecutor(None, storage, data_fetcher=None, balance_service=object(),
+                                   position_book=NoPositions(), book_manager=StubBooks())
+    trade_executor.target_wallets = [wallet]
+    trade_executor._execution_loop = lambda: None
+    trade_executor.start_executing()
+    try:
+        assert ids(trade_executor.trade_queue.get_batch(timeout=0)) == [pending.id, failed.id]
+    finally:
+        trade_executor.stop_executing()
@@ -0,0 +1,68 @@
+import os
+import time
+import pytest
+from helpers.ws_replay_server import ReplayServer, load_recording
+from services.trade_monitor import TradeMonitor
+from services.trade_queue import PendingTradeQueue
+from services.trade_stream import TradeStream
+
+RECORDING = os.path.join(os.path.dirname(__file__), 'fixtures', 'activity_trades.jsonl')
+
+class MemoryStorage:
+    def __init__(self):
+        self.stored = []
+
+    def load_recent_activities(self, wallet_address, since):
+        return []
+
+    def append_activities(self, wallet_address, activities):
+        self.stored.extend(activities)
+
+@pytest.fixture
+def replayed_stream(make_activity):
+    """A monitor that polled `stream-2` first, then received the recorded activity feed"""
+    server = ReplayServer(load_recording(RECORDING), speed=100).start()
+    storage, trade_queue = MemoryStorage(), PendingTradeQueue()
+    trade_monitor = TradeMonitor(storage, data_fetcher=None, trade_queue=trade_queue,
+                                 enable_stream=False, enable_chain_detector=False)
+    wallet = trade_monitor.target_wallets[0]
+    trade_monitor._record_new_activities(wallet, [make_activity(id='stream-2', timestamp=int(time.time()))])
+
+    trade_stream = TradeStream(trade_monitor.target_wallets, trade_monitor._record_new_activities, url=server.url)
+    trade_stream.start()
+    trade_stream.watch_markets(['will-it-rain'])
+    deadline = time.monotonic() + 5
+    while server.sent < len(server.messages) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)  # let the feed thread handle the last message
+    yield trade_stream, storage, trade_queue
+    trade_stream.stop()
+    server.stop()
+
+def test_leader_trades_become_activities(replayed_stream):
+    _, storage, _ = replayed_stream
+    streamed = {activity.id: activity for activity in storage.stored}
+
+    # The other wallet and the other topic are ignored
+    assert sorted(streamed) == ['stream-0', 'stream-2', 'stream-3']
+    buy = streamed['stream-0']
+    assert (buy.type, buy.side, buy.asset, buy.condition_id) == ('TRADE', 'BUY', 'rain-yes', '0xrain')
+    assert (buy.size, buy.price) == (40.0, 0.52)
+    assert buy.usdc_size == pytest.approx(20.8)
+    assert (buy.transaction_hash, buy.slug) == ('0xhash0', 'will-it-rain')
+    assert abs(buy.timestamp - time.time()) < 5
+
+def test_already_polled_trades_are_not_queued_again(replayed_stream):
+    _, storage, trade_queue = replayed_stream
+
+    assert [activity.id for activity in storage.stored].count('stream-2') == 1
+    assert sorted(activity.id for _, activity in trade_queue.get_batch(timeout=0)) == \
+        ['stream-0', 'stream-2', 'stream-3']
+
+def test_detection_latency_is_recorded(replayed_stream):
+    trade_stream, _, _ = replayed_stream
+    stats = trade_stream.get_latency_stats()
+
+    # One sample per leader message, including the duplicate
+    assert stats['count'] == 3
+    assert 0 <= stats['p50'] <= stats['p95'] <= stats['max'] < 1.0
@@ -0,0 +1,97 @@
+import threading
+import time
+import pytest
+from services.trade_context import TradeContext
+from services.trade_executor import TradeExecutor
+from services.trade_warmup import TradeWarmup
+
+class StubMarketData:
+    def __init__(self):
+        self.prefetched = []
+
+    def prefetch(self, activities):
+        self.prefetched.append([activity.id for activity in activities])
+
+    def warm_order_options(self, asset_id):
+        pass
+
+class StubLoader:
+    """Context loader that counts loads and can be held until `release` is set"""
+
+    def __init__(self, blocked: bool = False):
+        self.loads = []
+        self.release = threading.Event()
+        if not blocked:
+            self.release.set()
+
+    def load(self, trade, target_wallet, strategy):
+        self.loads.append(trade.id)
+        self.release.wait(5)
+        return TradeContext(my_balance=100.0, target_balance=1000.0)
+
+@pytest.fixture
+def warmup():
+    made = []
+
+    def make(loader, max_age=5.0, deadline=1.0):
+        trade_warmup = TradeWarmup(StubMarketData(), loader, lambda trade: 'buy',
+                                   max_age=max_age, deadline=deadline, max_workers=2)
+        made.append(trade_warmup)
+        return trade_warmup
+    yield make
+    for trade_warmup in made:
+        trade_warmup.shutdown()
+
+def test_take_returns_the_prepared_context(warmup, make_activity):
+    loader = StubLoader()
+    trade_warmup = warmup(loader)
+    trade = make_activity()
+    trade_warmup.warm(trade.proxy_wallet, [trade])
+
+    context = trade_warmup.take(trade.proxy_wallet, trade)
+    assert context is not None and context.my_balance == 100.0
+    assert (trade_warmup.hits, trade_warmup.misses) == (1, 0)
+    assert trade_warmup.market_data.prefetched == [[trade.id]]
+    # Taken contexts are handed over once
+    assert trade_warmup.take(trade.proxy_wallet, trade) is None
+
+def test_expired_context_falls_back_to_a_fresh_load(warmup, make_activity):
+    loader = StubLoader()
+    trade_executor = TradeExecutor(None, storage=None, data_fetcher=None, balance_service=object(),
+                                   position_book=object(), book_manager=object(), max_workers=1)
+    trade_executor.context_loader = loader
+    trade_executor.warmup = trade_warmup = warmup(loader, max_age=0.05)
+    trade_executor._execute_buy_strategy = lambda trade, context: True
+    trade = make_activity()
+    trade_warmup.warm(trade.proxy_wallet, [trade])
+    while not loader.loads:
+        time.sleep(0.01)
+    time.sleep(0.1)
+
+    assert trade_executor._execute_trade(trade, trade.proxy_wallet)
+    assert (trade_warmup.hits, trade_warmup.misses) == (0, 1)
+    assert loader.loads == [trade.id, trade.id]
+
+def test_take_gives_up_on_a_warm_up_still_in_flight(warmup, make_activity):
+    loader = StubLoader(blocked=True)
+    trade_warmup = warmup(loader, deadline=0.1)
+    trade = make_activity()
+    trade_warmup.warm(trade.proxy_wallet, [trade])
+
+    started = time.monotonic()
+    assert trade_warmup.take(trade.proxy_wallet, trade) is None
+    assert time.monotonic() - started < 1.0
+    assert trade_warmup.misses == 1
+    loader.release.set()
+
+def test_forget_drops_finished_trades(warmup, make_activity):
+    trade_warmup = warmup(StubLoader())
+    trade = make_activity()
+    trade_warmup.warm(trade.proxy_wallet, [trade])
+    assert trade_warmup.is_warming(trade.proxy_wallet, trade)
+    assert trade_warmup.detected_at(trade.id) is not None
+
+    trade_warmup.forget(trade.proxy_wallet, [trade])
+    assert not trade_warmup.is_warming(trade.proxy_wallet, trade)
+    assert trade_warmup.detected_at(trade.id) is None
+    assert trade_warmup.take(trade.proxy_wallet, trade) is None